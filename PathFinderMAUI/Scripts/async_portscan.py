@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Async Port Scan Module - Moteur de scan TCP connect asynchrone (asyncio)
+Une boucle d'événements partagée garde des centaines/milliers de connexions
+non bloquantes en vol, tous hôtes et ports confondus, sous une limite globale.
+"""
+
+import asyncio
+import errno
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from resource_governor import RESOURCE_EXHAUSTION_ERRNOS
+except ImportError:
+    RESOURCE_EXHAUSTION_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.EADDRNOTAVAIL, errno.ENOBUFS}
+
+# Manque de sockets côté scanner : nouvelle tentative après une attente croissante (plafonnée).
+# Les connexions en vol se terminent au plus tard à leur timeout : le manque est passager.
+EXHAUSTION_BACKOFF = 0.05
+EXHAUSTION_BACKOFF_MAX = 1.0
+
+class AsyncPortScanner:
+    def __init__(self, max_in_flight: int = 512, banner_timeout: float = 1.0, on_rtt=None,
+                 on_connect=None, governor=None):
+        """
+        Moteur de scan partagé entre les threads d'analyse.
+
+        Args:
+            max_in_flight: Nombre maximal de connexions simultanées (tous hôtes)
+            banner_timeout: Attente de la bannière après connexion (0 = pas de lecture,
+                            bannières collectées par banner_grabber)
+            on_rtt: Rappel on_rtt(ip, rtt) pour chaque connexion aboutie ou refusée
+            on_connect: Rappel on_connect(ip, sock, rtt) pour une connexion aboutie, socket
+                        encore ouverte (relevé TCP_INFO) ; remplace on_rtt pour elle
+            governor: ResourceGovernor partagé (permis de l'étage "portscan")
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.governor = governor
+        self.banner_timeout = banner_timeout
+        self.on_rtt = on_rtt
+        self.on_connect = on_connect
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+
+    def start(self):
+        """Démarre la boucle asyncio dans un thread dédié."""
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._init(), self._loop).result()
+
+    async def _init(self):
+        # Le sémaphore doit être créé dans la boucle qui l'utilise
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    def close(self):
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def scan_host(self, ip: str, ports: List[int], timeout: float) -> List[Tuple[int, bool, str]]:
+        """Scanne tous les ports d'un hôte ; appel bloquant, sûr depuis n'importe quel thread."""
+        future = asyncio.run_coroutine_threadsafe(self.scan_ports(ip, ports, timeout), self._loop)
+        return future.result()
+
+    def run(self, coro):
+        """Exécute une coroutine dans la boucle partagée ; appel bloquant."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def scan_many(self, targets: Dict[str, List[int]],
+                  timeout: float) -> Dict[str, List[Tuple[int, bool, str]]]:
+        """Scanne {ip: [ports]} en une passe ; appel bloquant."""
+        async def run_all():
+            jobs = [(ip, port) for ip in targets for port in targets[ip]]
+            results = iter(await self._run_pool(jobs, timeout))
+            return {ip: [next(results) for _ in targets[ip]] for ip in targets}
+        return asyncio.run_coroutine_threadsafe(run_all(), self._loop).result()
+
+    async def scan_ports(self, ip: str, ports: List[int], timeout: float) -> List[Tuple[int, bool, str]]:
+        """Retourne [(port, open, banner)] dans l'ordre des ports."""
+        return await self._run_pool([(ip, port) for port in ports], timeout)
+
+    async def _run_pool(self, jobs: List[Tuple[str, int]], timeout: float) -> List[Tuple[int, bool, str]]:
+        """Sonde [(ip, port)] avec au plus max_in_flight coroutines par appel (et non une
+        tâche par port) ; résultats dans l'ordre des sondes."""
+        results: List[Optional[Tuple[int, bool, str]]] = [None] * len(jobs)
+        pending = iter(enumerate(jobs))
+
+        async def worker():
+            for index, (ip, port) in pending:
+                results[index] = await self._probe(ip, port, timeout)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_in_flight, len(jobs)))))
+        return results
+
+    async def _probe(self, ip: str, port: int, timeout: float) -> Tuple[int, bool, str]:
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                if self.governor is not None:
+                    await self.governor.acquire_async("portscan")
+                try:
+                    result = await self._connect(ip, port, timeout)
+                finally:
+                    if self.governor is not None:
+                        self.governor.release("portscan")
+                if result is not None:
+                    return result
+                # Jamais rapporté fermé : on attend que des sockets se libèrent
+                if self.governor is not None:
+                    self.governor.note_exhaustion("portscan")
+                attempt += 1
+                await asyncio.sleep(min(EXHAUSTION_BACKOFF * attempt, EXHAUSTION_BACKOFF_MAX))
+
+    async def _connect(self, ip: str, port: int, timeout: float) -> Optional[Tuple[int, bool, str]]:
+        """Une tentative de connexion ; None si le système manque de sockets."""
+        loop = asyncio.get_event_loop()
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        except OSError as e:
+            if e.errno in RESOURCE_EXHAUSTION_ERRNOS:
+                return None
+            return (port, False, "")
+        sock.setblocking(False)
+        try:
+            started = loop.time()
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+            except ConnectionRefusedError:
+                self._observe(ip, loop.time() - started)
+                return (port, False, "")
+            except asyncio.TimeoutError:
+                return (port, False, "")
+            except OSError as e:
+                if e.errno in RESOURCE_EXHAUSTION_ERRNOS:
+                    return None
+                return (port, False, "")
+            if self.on_connect is not None:
+                self.on_connect(ip, sock, loop.time() - started)
+            else:
+                self._observe(ip, loop.time() - started)
+            if self.banner_timeout <= 0:
+                return (port, True, "")
+
+            # Port vraiment ouvert - essayer de lire la bannière
+            try:
+                data = await asyncio.wait_for(loop.sock_recv(sock, 1024), self.banner_timeout)
+                banner = data.decode('utf-8', errors='ignore').strip()
+            except (asyncio.TimeoutError, OSError):
+                banner = ""
+            return (port, True, banner)
+        finally:
+            sock.close()
+
+    def _observe(self, ip: str, rtt: float):
+        if self.on_rtt is not None:
+            self.on_rtt(ip, rtt)
+
+def scan_targets(targets: Dict[str, List[int]], timeout: float = 0.8,
+                 max_in_flight: int = 512) -> Dict[str, List[Tuple[int, bool, str]]]:
+    """Scanne {ip: [ports]} en une passe et retourne {ip: [(port, open, banner)]}."""
+    with AsyncPortScanner(max_in_flight=max_in_flight) as scanner:
+        return scanner.scan_many(targets, timeout)
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    if len(sys.argv) < 3:
+        print("Usage: python3 async_portscan.py <ip> <port,port,...>")
+        sys.exit(1)
+
+    ports = [int(p) for p in sys.argv[2].split(",") if p.strip()]
+    results = scan_targets({sys.argv[1]: ports})
+    for port, is_open, banner in results[sys.argv[1]]:
+        if is_open:
+            print(f"  {port}/tcp ouvert {banner[:60]}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Banner Analysis Module - Lecture unique des bannières de service
+Un automate Aho-Corasick (tous les mots-clés produits et indices d'appareils)
+et des regex de version précompilées sont construits à l'import. Chaque
+bannière est parcourue une seule fois et donne un enregistrement
+(vendor, product, version, hints) lu par la classification et la détection CVE.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Mot-clé produit -> (éditeur, produit, regex de version) ; clés de CVE_DATABASE incluses.
+# L'ordre est la priorité quand une bannière nomme plusieurs produits (ordre de cve_scanner)
+PRODUCTS = {
+    "mysql": ("Oracle", "mysql", r"MySQL[\/\s]+(\d+\.\d+\.\d+)"),
+    "mariadb": ("MariaDB", "mariadb", r"MariaDB[\/\s]+(\d+\.\d+\.\d+)"),
+    "apache": ("Apache", "apache", r"Apache[\/\s]+(\d+\.\d+\.\d+)"),
+    "nginx": ("F5", "nginx", r"nginx[\/\s]+(\d+\.\d+\.\d+)"),
+    "openssh": ("OpenBSD", "openssh", r"OpenSSH[_\/\s]+(\d+\.\d+)"),
+    "microsoft-iis": ("Microsoft", "microsoft-iis", r"Microsoft-IIS[\/\s]+(\d+\.\d+)"),
+    "mongodb": ("MongoDB", "mongodb", r"MongoDB[\/\s]+(\d+\.\d+\.\d+)"),
+    "redis": ("Redis", "redis", r"Redis[\/\s]+(\d+\.\d+\.\d+)"),
+    "postgresql": ("PostgreSQL", "postgresql", r"PostgreSQL[\/\s]+(\d+\.\d+)"),
+    "wordpress": ("WordPress", "wordpress", None),
+    "routeros": ("MikroTik", "routeros", r"RouterOS\s+v?(\d+\.\d+(?:\.\d+)?)"),
+    "vsftpd": ("vsftpd", "vsftpd", r"vsFTPd\s+(\d+\.\d+\.\d+)"),
+    "proftpd": ("ProFTPD", "proftpd", r"ProFTPD\s+(\d+\.\d+\.\d+)"),
+    "lighttpd": ("lighttpd", "lighttpd", r"lighttpd[\/\s]+(\d+\.\d+\.\d+)"),
+    "dropbear": ("Dropbear", "dropbear", r"dropbear[_\/\s]+(\d+\.\d+)"),
+}
+
+# Indices d'appareil / d'OS cherchés dans la même passe (empreintes de classification)
+HINT_KEYWORDS = (
+    "mikrotik", "routeros", "cisco", "router", "gateway", "printer", "jetdirect", "camera", "ipcam",
+    "nas", "synology", "qnap", "raspberry", "raspbian", "arduino", "esp8266", "esp32",
+    "ubuntu", "debian", "centos", "redhat", "red hat", "iis",
+    # Constructeurs du registre OUI (adresse MAC), lus par la même passe
+    "apple", "samsung", "xiaomi", "huawei", "oneplus", "motorola", "google", "amazon", "roku", "sonos",
+    "philips lighting", "signify", "espressif", "ubiquiti", "routerboard", "tp-link", "netgear",
+    "avm gmbh", "audiovisuelles", "freebox", "hikvision", "dahua", "axis communications",
+    "hewlett packard", "hp inc", "brother", "canon", "seiko epson", "xerox", "lexmark", "kyocera", "ricoh",
+    "vmware", "pcs systemtechnik", "intel corporate", "dell", "lenovo", "asustek",
+)
+
+GENERIC_VERSION_RE = re.compile(r"(\d+\.\d+(?:\.\d+)?)")
+# Bannières distinctes mémorisées (les mêmes reviennent d'un hôte à l'autre)
+BANNER_CACHE_SIZE = 65536
+
+class BannerInfo(NamedTuple):
+    vendor: str
+    product: str
+    version: str
+    hints: frozenset
+
+EMPTY_INFO = BannerInfo("", "", "", frozenset())
+
+class KeywordAutomaton:
+    def __init__(self, keywords: Iterable[str]):
+        """Automate Aho-Corasick (transitions complètes) sur des mots-clés en minuscules."""
+        self.keywords = frozenset(keyword.lower() for keyword in keywords if keyword)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, int]]] = [[]]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((keyword, len(keyword)))
+
+        # Parcours en largeur : liens d'échec, puis transitions complètes (pas de retour arrière)
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = list(goto[0].values())
+        for state in queue:
+            fail[state] = 0
+        index = 0
+        while index < len(queue):
+            state = queue[index]
+            index += 1
+            outputs[state] = outputs[state] + outputs[fail[state]] if fail[state] else outputs[state]
+            transitions = dict(delta[fail[state]]) if state else {}
+            transitions.update(goto[state])
+            delta[state] = transitions
+            for char, nxt in goto[state].items():
+                if state:
+                    fail[nxt] = delta[fail[state]].get(char, 0)
+                queue.append(nxt)
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """[(position de début, mot-clé)] de toutes les occurrences, en une passe."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        found = []
+        for position, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                for keyword, length in outputs[state]:
+                    found.append((position - length + 1, keyword))
+        return found
+
+class BannerAnalyzer:
+    def __init__(self, products: Dict = None, hints: Iterable[str] = HINT_KEYWORDS,
+                 extra_keywords: Iterable[str] = ()):
+        """
+        Args:
+            products: {mot-clé: (éditeur, produit, regex de version ou None)}
+            hints / extra_keywords: Mots-clés supplémentaires rapportés dans hints
+        """
+        self.products = PRODUCTS if products is None else products
+        self.version_res = {keyword: re.compile(pattern, re.IGNORECASE)
+                            for keyword, (_, _, pattern) in self.products.items() if pattern}
+        self.automaton = KeywordAutomaton(list(self.products) + list(hints) + list(extra_keywords))
+        self.keywords = self.automaton.keywords
+
+    def analyze(self, banner: str) -> BannerInfo:
+        if not banner:
+            return EMPTY_INFO
+        hints = frozenset(keyword for _, keyword in self.automaton.find(banner.lower()))
+        products = [keyword for keyword in self.products if keyword in hints] if hints else []
+        vendor = product = version = ""
+        if products:
+            vendor, product, _ = self.products[products[0]]
+        for keyword in products:
+            version_re = self.version_res.get(keyword)
+            match = version_re.search(banner) if version_re else None
+            if match:
+                version = match.group(1)
+                break
+        # Produit reconnu sans version lisible : pas de regex générique (elle lirait
+        # "1.1" dans "HTTP/1.1" ou la version d'un autre composant)
+        if not version and not any(keyword in self.version_res for keyword in products):
+            match = GENERIC_VERSION_RE.search(banner)
+            version = match.group(1) if match else ""
+        return BannerInfo(vendor, product, version, hints)
+
+BANNER_ANALYZER = BannerAnalyzer()
+
+@lru_cache(maxsize=BANNER_CACHE_SIZE)
+def analyze_banner(banner: str) -> BannerInfo:
+    """Enregistrement de la bannière par l'analyseur partagé (mémorisé)."""
+    return BANNER_ANALYZER.analyze(banner)
+
+def analyze_banners(banners: Dict) -> Dict[int, BannerInfo]:
+    """{port: BannerInfo} pour un dictionnaire de bannières d'hôte."""
+    return {int(port): analyze_banner(banner) for port, banner in (banners or {}).items()}
+
+def iter_stored_banners(path: str) -> Iterable[str]:
+    """Bannières d'un fichier texte (une par ligne) ou d'un rapport / historique JSON."""
+    if path.endswith(".json"):
+        import json
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        hosts = data.get("results", []) if isinstance(data, dict) else data
+        for host in hosts:
+            yield from (host.get("banners") or {}).values()
+        return
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            yield line.rstrip("\n").replace("\\r\\n", "\r\n")
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+    import time
+    from collections import Counter
+
+    if len(sys.argv) < 2:
+        for sample in ("SSH-2.0-OpenSSH_7.4", "Apache/2.4.49 (Unix)", "MySQL 5.7.25",
+                       "HTTP/1.1 200 OK\r\nServer: Microsoft-IIS/10.0", "MikroTik RouterOS 6.48"):
+            print(f"  {sample!r:<50} {analyze_banner(sample)}")
+        print("Usage: python3 banner_analysis.py <bannieres.txt|scan.json> [...]")
+        sys.exit(0)
+
+    started = time.monotonic()
+    products = Counter()
+    count = 0
+    for path in sys.argv[1:]:
+        for banner in iter_stored_banners(path):
+            info = analyze_banner(banner)
+            products[f"{info.product or '?'} {info.version}".strip()] += 1
+            count += 1
+    elapsed = time.monotonic() - started
+    print(f"🔍 {count} bannière(s) en {elapsed:.2f}s ({count / max(elapsed, 1e-9):.0f}/s), "
+          f"cache {analyze_banner.cache_info().hits} hit(s)")
+    for label, total in products.most_common(15):
+        print(f"  {total:>8}  {label}")
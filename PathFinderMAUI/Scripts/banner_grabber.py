@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Banner Grabber Module - Collecte de bannières par protocole, sur ports ouverts
+Étape séparée du scan de ports : chaque port confirmé ouvert reçoit une petite
+sonde adaptée au service (HEAD HTTP, PING Redis, ClientHello TLS, buildinfo
+MongoDB...) avec un délai de lecture court, tous les ports d'un hôte en parallèle.
+"""
+
+import asyncio
+import re
+import ssl
+import struct
+from typing import Dict, Iterable, Optional
+
+# Délai de lecture par défaut (l'ancien recv() attendait 1 s par port)
+DEFAULT_READ_TIMEOUT = 0.5
+MAX_BANNER_BYTES = 1024
+
+HTTP_PORTS = {80, 81, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8888, 9000, 9090, 9200}
+TLS_HTTP_PORTS = {443, 4443, 8443, 9443}
+TLS_PORTS = {465, 636, 993, 995}
+
+# Port -> sonde ; les ports absents sont d'abord écoutés (le serveur parle en premier)
+PORT_PROBES: Dict[int, str] = {
+    **{port: "http" for port in HTTP_PORTS},
+    **{port: "tls-http" for port in TLS_HTTP_PORTS},
+    **{port: "tls" for port in TLS_PORTS},
+    6379: "redis",
+    11211: "memcached",
+    27017: "mongodb",
+    27018: "mongodb",
+}
+
+REDIS_PING = b"PING\r\n"
+MEMCACHED_VERSION = b"version\r\n"
+
+def http_head_request(host: str) -> bytes:
+    return (f"HEAD / HTTP/1.0\r\nHost: {host}\r\n"
+            f"User-Agent: PathFinder/1.0\r\n\r\n").encode("ascii")
+
+def _bson_cstring(value: str) -> bytes:
+    return value.encode("ascii") + b"\x00"
+
+def mongodb_buildinfo_request(request_id: int = 1) -> bytes:
+    """OP_MSG {buildinfo: 1, $db: "admin"} (MongoDB 3.6+, sans authentification)."""
+    elements = (b"\x10" + _bson_cstring("buildinfo") + struct.pack("<i", 1) +
+                b"\x02" + _bson_cstring("$db") + struct.pack("<i", 6) + _bson_cstring("admin"))
+    document = struct.pack("<i", len(elements) + 5) + elements + b"\x00"
+    body = struct.pack("<I", 0) + b"\x00" + document
+    return struct.pack("<iiii", 16 + len(body), request_id, 0, 2013) + body
+
+def parse_mongodb_version(data: bytes) -> str:
+    """Extrait le champ "version" d'une réponse buildinfo."""
+    marker = data.find(b"\x02version\x00")
+    if marker < 0:
+        return ""
+    start = marker + len(b"\x02version\x00")
+    if len(data) < start + 4:
+        return ""
+    length = struct.unpack("<i", data[start:start + 4])[0]
+    return data[start + 4:start + 3 + length].decode("ascii", errors="ignore")
+
+def _decode(data: bytes) -> str:
+    return data[:MAX_BANNER_BYTES].decode("utf-8", errors="ignore").strip()
+
+def http_response_headers(data: bytes) -> str:
+    """En-têtes d'une réponse HTTP sans la ligne de statut ("HTTP/1.1 200 OK" n'est
+    pas une version de produit) ; "" si ce n'est pas une réponse HTTP."""
+    if not re.match(rb"HTTP/\d", data):
+        return ""
+    head = data[:MAX_BANNER_BYTES].split(b"\r\n\r\n", 1)[0]
+    parts = head.split(b"\n", 1)
+    return _decode(parts[1]) if len(parts) > 1 else ""
+
+_TLS_CONTEXT: Optional[ssl.SSLContext] = None
+
+def _tls_context() -> ssl.SSLContext:
+    """Contexte TLS sans vérification, créé une fois (chargement des CA coûteux)."""
+    global _TLS_CONTEXT
+    if _TLS_CONTEXT is None:
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+        _TLS_CONTEXT = ctx
+    return _TLS_CONTEXT
+
+class BannerGrabber:
+    def __init__(self, connect_timeout: float = 1.0, read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 probes: Dict[int, str] = None, governor=None):
+        """
+        Args:
+            connect_timeout: Délai de connexion (le port est déjà connu ouvert)
+            read_timeout: Délai de lecture de la réponse à la sonde
+            probes: Table port -> sonde (défaut: PORT_PROBES)
+            governor: ResourceGovernor partagé (permis de l'étage "banner")
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.probes = PORT_PROBES if probes is None else probes
+        self.governor = governor
+        self._tls = _tls_context()
+
+    async def grab_all(self, ip: str, ports: Iterable[int]) -> Dict[int, str]:
+        """{port: bannière} pour les ports qui ont répondu (même forme que scan_port)."""
+        ports = list(ports)
+        banners = await asyncio.gather(*(self.grab(ip, port) for port in ports))
+        return {port: banner for port, banner in zip(ports, banners) if banner}
+
+    async def grab(self, ip: str, port: int) -> str:
+        if self.governor is None:
+            return await self._grab(ip, port)
+        await self.governor.acquire_async("banner")
+        try:
+            return await self._grab(ip, port)
+        finally:
+            self.governor.release("banner")
+
+    async def _grab(self, ip: str, port: int) -> str:
+        probe = self.probes.get(port, "null")
+        try:
+            if probe == "http":
+                return await self._request(ip, port, http_head_request(ip), http=True)
+            if probe == "tls-http":
+                return await self._request(ip, port, http_head_request(ip), use_tls=True, http=True)
+            if probe == "tls":
+                return await self._request(ip, port, None, use_tls=True)
+            if probe == "redis":
+                return await self._request(ip, port, REDIS_PING)
+            if probe == "memcached":
+                return await self._request(ip, port, MEMCACHED_VERSION)
+            if probe == "mongodb":
+                return await self._mongodb(ip, port)
+            return await self._null_probe(ip, port)
+        except (asyncio.TimeoutError, OSError, ssl.SSLError):
+            return ""
+
+    async def _open(self, ip: str, port: int, use_tls: bool = False):
+        return await asyncio.wait_for(
+            asyncio.open_connection(ip, port, ssl=self._tls if use_tls else None,
+                                    server_hostname="" if use_tls else None),
+            self.connect_timeout)
+
+    async def _read(self, reader) -> bytes:
+        try:
+            return await asyncio.wait_for(reader.read(MAX_BANNER_BYTES), self.read_timeout)
+        except asyncio.TimeoutError:
+            return b""
+
+    async def _request(self, ip: str, port: int, payload: Optional[bytes], use_tls: bool = False,
+                       http: bool = False) -> str:
+        reader, writer = await self._open(ip, port, use_tls)
+        try:
+            if payload:
+                writer.write(payload)
+                await writer.drain()
+            data = await self._read(reader)
+            # Réponse HTTP : en-têtes seuls ; autre service sur un port HTTP : tel quel
+            banner = http_response_headers(data) if http and data.startswith(b"HTTP/") else _decode(data)
+            if use_tls and not banner:
+                # Service TLS muet : la poignée de main suffit à l'identifier
+                banner = f"TLS {writer.get_extra_info('ssl_object').version()}"
+            return banner
+        finally:
+            writer.close()
+
+    async def _null_probe(self, ip: str, port: int) -> str:
+        """Écoute d'abord (SSH, FTP, SMTP, MySQL...), puis tente HTTP si silence."""
+        reader, writer = await self._open(ip, port)
+        try:
+            data = await self._read(reader)
+            if data:
+                return _decode(data)
+            writer.write(http_head_request(ip))
+            await writer.drain()
+            return http_response_headers(await self._read(reader))
+        finally:
+            writer.close()
+
+    async def _mongodb(self, ip: str, port: int) -> str:
+        reader, writer = await self._open(ip, port)
+        try:
+            writer.write(mongodb_buildinfo_request())
+            await writer.drain()
+            version = parse_mongodb_version(await self._read(reader))
+            return f"MongoDB {version}" if version else ""
+        finally:
+            writer.close()
+
+def grab_banners(ip: str, ports: Iterable[int], read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 connect_timeout: float = 1.0, governor=None) -> Dict[int, str]:
+    """Collecte les bannières d'un hôte dans une boucle asyncio éphémère."""
+    grabber = BannerGrabber(connect_timeout=connect_timeout, read_timeout=read_timeout,
+                            governor=governor)
+    return asyncio.run(grabber.grab_all(ip, ports))
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+    import time
+
+    if len(sys.argv) < 3:
+        print("Usage: python3 banner_grabber.py <ip> <port,port,...>")
+        sys.exit(1)
+
+    ports = [int(p) for p in sys.argv[2].split(",") if p.strip()]
+    started = time.monotonic()
+    banners = grab_banners(sys.argv[1], ports)
+    print(f"🏷️  {len(banners)}/{len(ports)} bannière(s) en {time.monotonic() - started:.2f}s")
+    for port, banner in banners.items():
+        print(f"  {port}/tcp {banner[:80]!r}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Coût de classification par hôte selon la taille de la base d'empreintes
+La base intégrée est complétée par des règles synthétiques : une part (--hit-ratio)
+porte sur les ports et mots-clés des hôtes de l'échantillon et se déclenche, le reste
+sur des ports rares et des mots inventés. Le script mesure le coût par hôte du moteur
+indexé, celui d'une évaluation de toutes les règles, celui des anciennes chaînes de if,
+et le nombre de règles candidates évaluées par hôte.
+
+Usage:
+  python3 benchmark_fingerprints.py --hosts 2000 --sizes 0,1000,5000,20000 --hit-ratio 0.25
+"""
+
+import argparse
+import gc
+import random
+import string
+import time
+from typing import Dict, List, Tuple
+
+from fingerprint_engine import FINGERPRINT_DATABASE, FingerprintEngine
+from network_scanner import detect_device_type_from_ports, detect_os_advanced
+
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 135, 139, 143, 443, 445, 554, 631, 3306, 3389,
+                5353, 5432, 5900, 6379, 7000, 8008, 8009, 8080, 9100, 62078]
+SAMPLE_BANNERS = ["SSH-2.0-OpenSSH_8.9p1 Ubuntu-3ubuntu0.1", "SSH-2.0-OpenSSH_7.4", "220 ProFTPD Server",
+                  "HP JetDirect", "MikroTik RouterOS", "Synology DiskStation", "220 mail ESMTP Postfix", ""]
+SAMPLE_SERVERS = ["", "Apache/2.4.52 (Ubuntu)", "nginx/1.18.0", "Microsoft-IIS/10.0", "lighttpd/1.4"]
+# Mots-clés présents dans les bannières / en-têtes Server de l'échantillon
+SAMPLE_KEYWORDS = ["openssh", "ubuntu", "proftpd", "jetdirect", "mikrotik", "synology", "postfix",
+                   "apache", "nginx", "microsoft-iis", "lighttpd"]
+
+def synthetic_rules(count: int, rng: random.Random, hit_ratio: float = 0.25) -> List[Dict]:
+    """Règles aléatoires, comme une base qui grossit : une part hit_ratio vise les ports
+    courants et les mots-clés de l'échantillon (elles se déclenchent), le reste des ports
+    rares et des mots inventés."""
+    rules = []
+    rare_ports = sorted(set(range(1024, 65536)) - set(COMMON_PORTS))
+    for index in range(count):
+        rule = {"kind": rng.choice(["os", "device"]), "label": f"Synthétique {index}",
+                "weight": round(rng.uniform(0.1, 0.9), 2)}
+        if rng.random() < hit_ratio:
+            if index % 2:
+                rule["ports_any" if index % 4 == 1 else "ports_all"] = rng.sample(COMMON_PORTS, rng.randint(1, 2))
+            else:
+                rule["banner" if index % 4 == 0 else "server"] = [rng.choice(SAMPLE_KEYWORDS)]
+        elif index % 2:
+            rule["ports_any" if index % 4 == 1 else "ports_all"] = rng.sample(rare_ports, rng.randint(1, 3))
+        else:
+            word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+            rule["banner" if index % 4 == 0 else "server"] = [word]
+        rules.append(rule)
+    return rules
+
+def sample_hosts(count: int, rng: random.Random) -> List[Tuple]:
+    hosts = []
+    for index in range(count):
+        ports = sorted(rng.sample(COMMON_PORTS, rng.randint(1, 6)))
+        banners = {port: rng.choice(SAMPLE_BANNERS) for port in ports}
+        hosts.append((f"10.0.{index // 254}.{index % 254 + 1}", rng.choice([64, 128, 255, 54]),
+                      ports, banners, rng.choice(SAMPLE_SERVERS)))
+    return hosts
+
+def per_host_us(func, hosts: List[Tuple]) -> float:
+    # Premier passage (allocations, cache des bannières, ramasse-miettes) hors mesure
+    func(hosts)
+    started = time.perf_counter()
+    func(hosts)
+    return (time.perf_counter() - started) / len(hosts) * 1e6
+
+def evaluate_all(engine: FingerprintEngine, hosts: List[Tuple]):
+    """Référence : chaque règle de la base évaluée pour chaque hôte (sans index ni classement)."""
+    for host in hosts:
+        view = engine.host_view(*host)
+        [rule for rule in engine.rules if rule.matches(view)]
+
+def legacy_chains(hosts: List[Tuple]):
+    for ip, ttl, ports, banners, server in hosts:
+        detect_os_advanced(ttl, ports, banners, {"server": server})
+        detect_device_type_from_ports(ip, ports, banners, {"server": server})
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fingerprint engine vs rule count")
+    parser.add_argument("--hosts", type=int, default=2000)
+    parser.add_argument("--sizes", type=str, default="0,1000,5000,20000",
+                        help="Nombres de règles synthétiques ajoutées à la base intégrée")
+    parser.add_argument("--hit-ratio", type=float, default=0.25,
+                        help="Part des règles synthétiques qui visent les ports / mots-clés de l'échantillon")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    hosts = sample_hosts(args.hosts, rng)
+    print(f"⏱️  {len(hosts)} hôte(s), base intégrée de {len(FINGERPRINT_DATABASE)} empreinte(s)")
+    legacy_us = per_host_us(legacy_chains, hosts)
+    print(f"  Chaînes de if historiques : {legacy_us:7.1f} µs/hôte")
+    print(f"  {'règles':>8} {'compilation':>12} {'indexé':>12} {'/ if':>6} {'candidates':>11} "
+          f"{'toutes règles':>15} {'verdicts changés':>17}")
+
+    reference = None
+    for extra in (int(size) for size in args.sizes.split(",")):
+        database = FINGERPRINT_DATABASE + synthetic_rules(extra, random.Random(args.seed + extra), args.hit_ratio)
+        started = time.perf_counter()
+        engine = FingerprintEngine(database)
+        compile_ms = (time.perf_counter() - started) * 1000
+        # Base compilée une fois pour toute la vie du processus : hors du ramasse-miettes
+        gc.collect()
+        gc.freeze()
+        indexed = per_host_us(engine.classify_many, hosts)
+        brute = per_host_us(lambda batch: evaluate_all(engine, batch), hosts)
+        candidates = sum(len(engine.candidates(engine.host_view(*host))) for host in hosts) / len(hosts)
+        gc.unfreeze()
+
+        # Règles synthétiques qui se déclenchent : une partie des verdicts change
+        labels = [(guess["os"]["label"], guess["device"]["label"]) for guess in engine.classify_many(hosts)]
+        if reference is None:
+            reference = labels
+        changed = sum(1 for label, ref in zip(labels, reference) if label != ref) / len(hosts)
+        print(f"  {len(database):>8} {compile_ms:>9.1f} ms {indexed:>9.1f} µs {indexed / legacy_us:>5.1f}x "
+              f"{candidates:>11.1f} {brute:>12.1f} µs {changed:>16.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Scan de ports threadé (scan_port) vs moteur asynchrone
+Les deux moteurs scannent le même ensemble de cibles ; le script compare la
+durée et vérifie que les ports ouverts trouvés sont identiques.
+
+Usage:
+  python3 benchmark_portscan.py 192.168.1.0/28 --ports 22,80,443 --workers 200
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
+
+from network_scanner import DEFAULT_PORTS, load_ports, load_targets, scan_port
+from async_portscan import scan_targets
+
+def threaded_scan(ips: List[str], ports: List[int], timeout: float, workers: int) -> Dict[str, Set[int]]:
+    """Chemin historique : un thread par hôte, ports scannés l'un après l'autre."""
+    def scan_host(ip):
+        return ip, {port for port, is_open, _ in (scan_port(ip, p, timeout) for p in ports) if is_open}
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return dict(ex.map(scan_host, ips))
+
+def async_scan(ips: List[str], ports: List[int], timeout: float, max_in_flight: int) -> Dict[str, Set[int]]:
+    results = scan_targets({ip: ports for ip in ips}, timeout=timeout, max_in_flight=max_in_flight)
+    return {ip: {port for port, is_open, _ in scans if is_open} for ip, scans in results.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark threaded vs async port scan")
+    parser.add_argument("target", help="CIDR or range")
+    parser.add_argument("--ports", type=str, default=",".join(map(str, DEFAULT_PORTS)))
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument("--max-in-flight", type=int, default=512)
+    parser.add_argument("--timeout", type=float, default=0.8)
+    args = parser.parse_args()
+
+    ips = list(load_targets(args.target))
+    ports = list(load_ports(args.ports))
+    print(f"⏱️  {len(ips)} hôte(s) × {len(ports)} port(s), timeout {args.timeout}s")
+
+    started = time.monotonic()
+    threaded = threaded_scan(ips, ports, args.timeout, args.workers)
+    threaded_time = time.monotonic() - started
+    print(f"  Threadé ({args.workers} workers) : {threaded_time:.2f}s")
+
+    started = time.monotonic()
+    async_results = async_scan(ips, ports, args.timeout, args.max_in_flight)
+    async_time = time.monotonic() - started
+    print(f"  Async ({args.max_in_flight} en vol) : {async_time:.2f}s")
+
+    if async_time > 0:
+        print(f"  Accélération : x{threaded_time / async_time:.1f}")
+
+    mismatches = [ip for ip in ips if threaded.get(ip) != async_results.get(ip)]
+    if mismatches:
+        print(f"⚠️  Résultats différents pour {len(mismatches)} hôte(s): {mismatches[:5]}")
+    else:
+        print(f"✅ Mêmes ports ouverts ({sum(len(p) for p in threaded.values())} au total)")
+
+if __name__ == "__main__":
+    main()
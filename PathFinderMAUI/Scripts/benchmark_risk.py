@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Règles de risque et score de priorité sur un grand jeu de résultats
+Des hôtes synthétiques (ports, panneaux d'admin, certificats, CVE déjà ajoutées)
+sont évalués par le moteur de règles en lot (NumPy si disponible, Python sinon)
+et par l'analyse historique hôte par hôte ; les résultats doivent être identiques.
+
+Usage:
+  python3 benchmark_risk.py --hosts 1000000 --check 100000
+"""
+
+import argparse
+import copy
+import gc
+import random
+import time
+from typing import Dict, List
+
+import risk_engine
+from network_scanner import CRITICAL_PORTS, analyze_security_risks
+from risk_engine import RiskEngine
+
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 135, 139, 143, 443, 445, 554, 631, 1433, 3306, 3389,
+                5353, 5432, 5900, 6379, 8080, 8443, 9100, 9200, 27017, 62078]
+
+def sample_hosts(count: int, rng: random.Random, profiles: int = 0) -> List[Dict]:
+    """Hôtes synthétiques ; profiles > 0 : ports tirés parmi autant de profils d'appareils
+    (un réseau réel répète quelques combinaisons), 0 : combinaisons toutes aléatoires."""
+    pool = [sorted(rng.sample(COMMON_PORTS, rng.randint(0, 6))) for _ in range(profiles)]
+    hosts = []
+    for index in range(count):
+        host = {"ip": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}", "alive": rng.random() < 0.9,
+                "open_ports": [], "security_risks": {}}
+        if host["alive"]:
+            ports = list(rng.choice(pool)) if pool else sorted(rng.sample(COMMON_PORTS, rng.randint(0, 6)))
+            host["open_ports"] = ports
+            host["critical_services"] = [port for port in ports if port in CRITICAL_PORTS]
+            if 443 in ports and rng.random() < 0.5:
+                host["http_https"] = {"server": rng.choice(["", "nginx"]),
+                                      "admin_panels": ["/admin"] * rng.randint(0, 2)}
+                host["tls"] = {"expires_in_days": rng.choice([None, -3, 12, 200])}
+            host["security_risks"] = {"critical": [], "high": [], "medium": [], "low": [], "info": []}
+            if rng.random() < 0.05:
+                host["security_risks"]["critical"].append({"type": "CVE-2021-41773", "description": "Path traversal"})
+        hosts.append(host)
+    return hosts
+
+def legacy(hosts: List[Dict]):
+    """Référence : analyse et score historiques de network_scanner, hôte par hôte."""
+    for r in hosts:
+        r["priority_score"] = 0
+        r["risk_level"] = "INFO"
+        if not r["alive"]:
+            continue
+        extras = r["security_risks"]
+        r["security_risks"] = analyze_security_risks(r)
+        for severity, items in extras.items():
+            r["security_risks"][severity].extend(items)
+        security_risks = r["security_risks"]
+        critical_count = len(security_risks["critical"])
+        high_count = len(security_risks["high"])
+        medium_count = len(security_risks["medium"])
+        r["priority_score"] += (1 + len(r["open_ports"]) + len(r.get("critical_services", [])) * 5
+                                + critical_count * 10 + high_count * 5 + medium_count * 2)
+        if critical_count > 0:
+            r["risk_level"] = "CRITIQUE"
+        elif high_count > 0:
+            r["risk_level"] = "ÉLEVÉ"
+        elif medium_count > 0:
+            r["risk_level"] = "MOYEN"
+        elif r["open_ports"]:
+            r["risk_level"] = "FAIBLE"
+        tls = r.get("tls", {})
+        if tls.get("expires_in_days") is not None:
+            if tls["expires_in_days"] < 0:
+                r["priority_score"] += 8
+                if r["risk_level"] == "FAIBLE":
+                    r["risk_level"] = "MOYEN"
+            elif tls["expires_in_days"] < 30:
+                r["priority_score"] += 3
+        http = r.get("http") or r.get("http_https") or {}
+        if http.get("server"):
+            r["priority_score"] += 1
+
+def strip_rule_ids(hosts: List[Dict]) -> List[Dict]:
+    return [{severity: [{key: value for key, value in item.items() if key != "rule"} for item in items]
+             for severity, items in host["security_risks"].items()} for host in hosts]
+
+def timed(label: str, func, hosts: List[Dict]) -> float:
+    # Ramasse-miettes hors mesure : des millions d'objets vivants faussent les comparaisons
+    gc.collect()
+    gc.disable()
+    started = time.perf_counter()
+    func(hosts)
+    elapsed = time.perf_counter() - started
+    gc.enable()
+    print(f"  {label:<34} {elapsed:7.2f} s  {elapsed / len(hosts) * 1e6:6.2f} µs/hôte")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark risk rule engine")
+    parser.add_argument("--hosts", type=int, default=1000000)
+    parser.add_argument("--check", type=int, default=100000,
+                        help="Hôtes comparés à l'analyse historique (0 : pas de comparaison)")
+    parser.add_argument("--profiles", type=int, default=500,
+                        help="Combinaisons de ports distinctes (0 : toutes aléatoires)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    hosts = sample_hosts(args.hosts, random.Random(args.seed), args.profiles)
+    engine = RiskEngine()
+    backends = ["python"] + (["numpy"] if risk_engine.NUMPY_AVAILABLE else [])
+    print(f"⏱️  {len(hosts)} hôte(s), {len(engine.rules)} règle(s), {len(engine.port_bits)} port(s) en masque")
+
+    for backend in backends:
+        engine.backend = backend
+        batch = copy.deepcopy(hosts)
+        timed(f"moteur {backend}, score seul", lambda b: engine.apply(b, findings=False), batch)
+        timed(f"moteur {backend}, score + constats", engine.apply, batch)
+
+    if args.check:
+        sample = hosts[:args.check]
+        reference = copy.deepcopy(sample)
+        timed("analyse historique", legacy, reference)
+        for backend in backends:
+            engine.backend = backend
+            batch = copy.deepcopy(sample)
+            engine.apply(batch)
+            same = ([(h["priority_score"], h["risk_level"]) for h in batch]
+                    == [(h["priority_score"], h["risk_level"]) for h in reference]
+                    and strip_rule_ids([h for h in batch if h["alive"]])
+                    == [h["security_risks"] for h in reference if h["alive"]])
+            print(f"  {backend}: {'résultats identiques' if same else '⚠️  résultats différents'} "
+                  f"sur {len(sample)} hôte(s)")
+            # Recalcul d'un scan déjà évalué : les constats des règles sont remplacés, pas dupliqués
+            engine.apply(batch)
+            if strip_rule_ids([h for h in batch if h["alive"]]) != [h["security_risks"] for h in reference if h["alive"]]:
+                print(f"  ⚠️  {backend}: recalcul non idempotent")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,12 @@ import re
 import json
 from typing import Dict, List, Tuple
 
+try:
+    from banner_analysis import analyze_banner
+    BANNER_ANALYSIS_AVAILABLE = True
+except ImportError:
+    BANNER_ANALYSIS_AVAILABLE = False
+
 # Base de données CVE simplifiée (principales vulnérabilités connues)
 CVE_DATABASE = {
     # MySQL
@@ -83,19 +89,28 @@ VERSION_PATTERNS = {
     "mongodb": r"MongoDB[\/\s]+(\d+\.\d+\.\d+)",
     "postgresql": r"PostgreSQL[\/\s]+(\d+\.\d+)",
 }
+VERSION_RES = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in VERSION_PATTERNS.items()}
+GENERIC_VERSION_RE = re.compile(r"(\d+\.\d+(?:\.\d+)?)")
 
 def extract_version(banner: str, service: str) -> str:
     """Extrait la version du service depuis la bannière."""
     banner_lower = banner.lower()
     
-    for service_name, pattern in VERSION_PATTERNS.items():
+    named = False
+    for service_name, version_re in VERSION_RES.items():
         if service_name in service.lower() or service_name in banner_lower:
-            match = re.search(pattern, banner, re.IGNORECASE)
+            match = version_re.search(banner)
             if match:
                 return match.group(1)
+            named = named or service_name in banner_lower
+    
+    # Produit nommé dans la bannière mais sans version : la tentative générique
+    # prendrait un autre nombre (ex. "1.1" de "HTTP/1.1")
+    if named:
+        return ""
     
     # Tentative générique
-    version_match = re.search(r"(\d+\.\d+(?:\.\d+)?)", banner)
+    version_match = GENERIC_VERSION_RE.search(banner)
     if version_match:
         return version_match.group(1)
     
@@ -120,7 +135,6 @@ def scan_cve_for_banner(banner: str, service_name: str, port: int) -> List[Dict]
     cves_found = []
     
     # Détecter le service
-    banner_lower = banner.lower()
     detected_service = None
     
     # Mapping port -> service par défaut
@@ -135,11 +149,16 @@ def scan_cve_for_banner(banner: str, service_name: str, port: int) -> List[Dict]
         27017: "mongodb",
     }
     
-    # Détection du service depuis la bannière
-    for service_key in CVE_DATABASE.keys():
-        if service_key in banner_lower or service_key in service_name.lower():
-            detected_service = service_key
-            break
+    # Détection du service depuis la bannière (analyse partagée : une passe par bannière)
+    info = analyze_banner(banner) if BANNER_ANALYSIS_AVAILABLE else None
+    if info is not None and info.product in CVE_DATABASE:
+        detected_service = info.product
+    else:
+        for service_key in CVE_DATABASE.keys():
+            found = service_key in info.hints if info is not None else service_key in banner.lower()
+            if found or service_key in service_name.lower():
+                detected_service = service_key
+                break
     
     # Fallback sur le port si pas détecté
     if not detected_service and port in port_service_map:
@@ -149,7 +168,10 @@ def scan_cve_for_banner(banner: str, service_name: str, port: int) -> List[Dict]
         return cves_found
     
     # Extraire la version
-    version = extract_version(banner, detected_service)
+    if info is not None and info.product == detected_service:
+        version = info.version
+    else:
+        version = extract_version(banner, detected_service)
     
     if not version:
         # Si pas de version, retourner des CVE potentielles sans garantie
@@ -9,6 +9,27 @@ import ssl
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Tuple
 
+try:
+    from http_client import HttpClient
+    HTTP_CLIENT_AVAILABLE = True
+except ImportError:
+    HTTP_CLIENT_AVAILABLE = False
+
+try:
+    from soft404 import probe_baseline
+    SOFT404_AVAILABLE = True
+except ImportError:
+    SOFT404_AVAILABLE = False
+
+try:
+    from resource_governor import socket_permit
+except ImportError:
+    from contextlib import contextmanager
+
+    @contextmanager
+    def socket_permit(stage: str, count: int = 1):
+        yield
+
 # Wordlists intégrés par niveau
 WORDLIST_QUICK = [
     # Admin panels
@@ -95,20 +116,59 @@ SENSITIVE_FILES = {
     "phpinfo.php": "⚠️  PHP info page",
 }
 
-def dir_buster_check(url: str, path: str, ssl_context, timeout: float = 2.0) -> Tuple[str, int, int, str]:
-    """Vérifie si un chemin existe sur le serveur."""
+# Octets lus au plus par réponse (seuls le statut et les en-têtes sont utilisés)
+DIRBUST_MAX_BODY = 16 * 1024
+# Début du corps gardé pour la comparaison avec les réponses "soft-404"
+DIRBUST_BODY_PREFIX = 512
+
+def get_wordlist(wordlist_level: str = "quick") -> List[str]:
+    """Chemins testés pour un niveau ('quick' ou 'medium')."""
+    return WORDLIST_QUICK if wordlist_level == "quick" else WORDLIST_MEDIUM
+
+def content_length(headers) -> int:
+    """Content-Length d'une réponse ; 0 s'il est absent ou invalide. Un en-tête
+    dupliqué fusionné ("123, 123") donne sa première valeur."""
+    value = (headers.get('Content-Length') or '').split(',')[0].strip()
+    return int(value) if value.isdigit() else 0
+
+def dir_buster_result(path: str, status: int, headers) -> Tuple[str, int, int, str]:
+    """(chemin, statut, taille, type) à partir d'une réponse déjà reçue."""
+    if status >= 400:
+        # 401/403 signifie que la ressource existe mais est protégée
+        return (path, status, 0, "protected" if status in [401, 403] else "")
+    return (path, status, content_length(headers), headers.get('Content-Type', ''))
+
+def dir_buster_check(url: str, path: str, ssl_context, timeout: float = 2.0,
+                     client=None, baseline=None) -> Tuple[str, int, int, str]:
+    """Vérifie si un chemin existe sur le serveur.
+    Avec `baseline` (soft404.WildcardBaseline), une réponse identique à celle d'un
+    chemin inexistant est rapportée comme 404."""
     full_url = f"{url.rstrip('/')}/{path.lstrip('/')}"
     
+    if client is not None:
+        try:
+            # HEAD d'abord ; GET limité (Range) si refusé ou si le contenu doit être comparé
+            response = client.probe(full_url, DIRBUST_BODY_PREFIX, timeout=timeout,
+                                    max_body=DIRBUST_MAX_BODY, stage="dirbust")
+            if baseline is not None and baseline.needs_content(response.status):
+                response = client.probe(full_url, DIRBUST_BODY_PREFIX, head=False, timeout=timeout,
+                                        max_body=DIRBUST_MAX_BODY, stage="dirbust")
+        except Exception:
+            return (path, 0, 0, "")
+        if baseline is not None and baseline.is_soft404(f"/{path.lstrip('/')}", response.status,
+                                                        response.headers, response.body):
+            return (path, 404, 0, "soft404")
+        return dir_buster_result(path, response.status, response.headers)
+    
     try:
         req = urllib.request.Request(full_url)
         req.add_header('User-Agent', 'PathFinder/1.0')
         
-        with urllib.request.urlopen(req, timeout=timeout, context=ssl_context) as response:
+        with socket_permit("dirbust"), urllib.request.urlopen(req, timeout=timeout, context=ssl_context) as response:
             status_code = response.status
-            content_length = int(response.headers.get('Content-Length', 0))
             content_type = response.headers.get('Content-Type', '')
             
-            return (path, status_code, content_length, content_type)
+            return (path, status_code, content_length(response.headers), content_type)
             
     except urllib.error.HTTPError as e:
         # 401/403 signifie que la ressource existe mais est protégée
@@ -118,8 +178,59 @@ def dir_buster_check(url: str, path: str, ssl_context, timeout: float = 2.0) ->
     except Exception:
         return (path, 0, 0, "")
 
+def _record_check(results: Dict, base_url: str, check: Tuple[str, int, int, str]):
+    """Classe le résultat d'un chemin testé dans le rapport."""
+    path, status, size, content_type = check
+    
+    if status == 200:
+        results["statistics"]["200"] += 1
+        entry = {
+            "path": path,
+            "url": f"{base_url}/{path}",
+            "status": status,
+            "size": size,
+            "type": content_type
+        }
+        
+        # Vérifier si c'est un fichier sensible
+        if path in SENSITIVE_FILES:
+            entry["risk"] = SENSITIVE_FILES[path]
+            results["sensitive"].append(entry)
+        else:
+            results["found"].append(entry)
+            
+    elif status in [301, 302]:
+        results["statistics"]["301"] += 1
+        results["found"].append({
+            "path": path,
+            "url": f"{base_url}/{path}",
+            "status": status,
+            "type": "redirect"
+        })
+        
+    elif status in [401, 403]:
+        results["statistics"][str(status)] += 1
+        results["protected"].append({
+            "path": path,
+            "url": f"{base_url}/{path}",
+            "status": status,
+            "note": "Protected - Exists but requires authentication"
+        })
+
+def _baseline_fetch(client, url: str) -> Tuple[int, Dict, bytes]:
+    response = client.probe(url, DIRBUST_BODY_PREFIX, head=False, timeout=2.0,
+                            max_body=DIRBUST_MAX_BODY, stage="dirbust")
+    return response.status, response.headers, response.body
+
+def _wildcard_results(results: Dict) -> Dict:
+    """Serveur qui répond à n'importe quel chemin : wordlist non testée."""
+    results["wildcard"] = True
+    results["total_tested"] = 0
+    return results
+
 def directory_bust(ip: str, port: int = 80, use_https: bool = False, 
-                   wordlist_level: str = "quick", max_workers: int = 20) -> Dict:
+                   wordlist_level: str = "quick", max_workers: int = 20, client=None,
+                   planner=None) -> Dict:
     """
     Effectue un directory busting sur un hôte.
     
@@ -129,12 +240,15 @@ def directory_bust(ip: str, port: int = 80, use_https: bool = False,
         use_https: Utiliser HTTPS
         wordlist_level: 'quick' (rapide) ou 'medium' (complet)
         max_workers: Nombre de threads parallèles
+        client: HttpClient keep-alive partagé (défaut: pool propre à ce scan)
+        planner: WebProbePlanner de l'hôte ; les chemins déjà demandés par
+                 d'autres sondes (panneaux d'admin...) ne sont pas redemandés
     """
     proto = "https" if use_https else "http"
     base_url = f"{proto}://{ip}:{port}" if port not in [80, 443] else f"{proto}://{ip}"
     
     # Choisir la wordlist
-    wordlist = WORDLIST_QUICK if wordlist_level == "quick" else WORDLIST_MEDIUM
+    wordlist = get_wordlist(wordlist_level)
     
     # Créer contexte SSL
     ssl_context = ssl.create_default_context()
@@ -143,6 +257,7 @@ def directory_bust(ip: str, port: int = 80, use_https: bool = False,
     
     results = {
         "url": base_url,
+        "wildcard": False,
         "total_tested": len(wordlist),
         "found": [],
         "protected": [],
@@ -157,55 +272,52 @@ def directory_bust(ip: str, port: int = 80, use_https: bool = False,
         }
     }
     
+    if planner is not None:
+        # Réponses partagées avec les autres sondes web de l'hôte
+        planner.establish_baseline(base_url)
+        if planner.is_wildcard(base_url):
+            return _wildcard_results(results)
+        responses = planner.get_many([(f"{base_url}/{path}", ()) for path in wordlist])
+        for path, response in zip(wordlist, responses):
+            if response.error or response.soft404:
+                continue
+            # Une réponse inexploitable ne fait perdre que son chemin (comme le scan threadé)
+            try:
+                _record_check(results, base_url, dir_buster_result(path, response.status, response.headers))
+            except Exception:
+                pass
+        return results
+    
+    # Connexions keep-alive réutilisées entre les chemins testés
+    own_client = client is None and HTTP_CLIENT_AVAILABLE
+    if own_client:
+        client = HttpClient(ssl_context=ssl_context, max_idle_per_host=max_workers, stage="dirbust")
+    
+    # Référence "chemin inexistant" : un serveur qui répond à tout n'est pas énuméré
+    baseline = None
+    if client is not None and SOFT404_AVAILABLE:
+        baseline = probe_baseline(base_url, lambda u: _baseline_fetch(client, u))
+        if baseline.wildcard:
+            if own_client:
+                client.close()
+            return _wildcard_results(results)
+    
     # Scan parallèle
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
-            executor.submit(dir_buster_check, base_url, path, ssl_context): path 
+            executor.submit(dir_buster_check, base_url, path, ssl_context, 2.0, client, baseline): path 
             for path in wordlist
         }
         
         for future in as_completed(futures):
             try:
-                path, status, size, content_type = future.result()
-                
-                if status == 200:
-                    results["statistics"]["200"] += 1
-                    entry = {
-                        "path": path,
-                        "url": f"{base_url}/{path}",
-                        "status": status,
-                        "size": size,
-                        "type": content_type
-                    }
-                    
-                    # Vérifier si c'est un fichier sensible
-                    if path in SENSITIVE_FILES:
-                        entry["risk"] = SENSITIVE_FILES[path]
-                        results["sensitive"].append(entry)
-                    else:
-                        results["found"].append(entry)
-                        
-                elif status in [301, 302]:
-                    results["statistics"]["301"] += 1
-                    results["found"].append({
-                        "path": path,
-                        "url": f"{base_url}/{path}",
-                        "status": status,
-                        "type": "redirect"
-                    })
-                    
-                elif status in [401, 403]:
-                    results["statistics"][str(status)] += 1
-                    results["protected"].append({
-                        "path": path,
-                        "url": f"{base_url}/{path}",
-                        "status": status,
-                        "note": "Protected - Exists but requires authentication"
-                    })
-                    
+                _record_check(results, base_url, future.result())
             except Exception as e:
                 pass
     
+    if own_client:
+        client.close()
+    
     return results
 
 def quick_scan_web_vulnerabilities(ip: str, ports: List[int]) -> List[Dict]:
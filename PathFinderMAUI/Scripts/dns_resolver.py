@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+DNS Resolver Module - Résolution inverse (PTR) en UDP, sans fork ni appel bloquant
+Les requêtes PTR de tous les hôtes actifs partent en parallèle sur quelques
+sockets UDP vers les serveurs de /etc/resolv.conf ; un thread d'E/S unique
+gère réponses, retransmissions et délais. Les réponses (y compris négatives)
+sont mises en cache.
+"""
+
+import collections
+import ipaddress
+import random
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DNS_PORT = 53
+TYPE_PTR = 12
+CLASS_IN = 1
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+# Cache des réponses négatives (NXDOMAIN, NOERROR sans PTR)
+NEGATIVE_TTL = 300
+# Échecs (pas de réponse, SERVFAIL / REFUSED) : gardés le temps d'un scan, pas plus ;
+# une panne DNS passagère ne doit pas masquer les noms des scans suivants
+FAILURE_TTL = 30
+# Durée minimale de cache d'une réponse positive (TTL 0 chez certains serveurs)
+MIN_POSITIVE_TTL = 60
+
+def read_resolv_conf(path: str = "/etc/resolv.conf") -> List[str]:
+    """Serveurs "nameserver" IPv4 du fichier (liste vide si absent, ex. Windows)."""
+    servers = []
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == "nameserver":
+                    try:
+                        if ipaddress.ip_address(fields[1]).version == 4:
+                            servers.append(fields[1])
+                    except ValueError:
+                        continue
+    except OSError:
+        pass
+    return servers
+
+def read_hosts_file(path: str = "/etc/hosts") -> Dict[str, str]:
+    """{ip: premier nom} de /etc/hosts (consulté avant toute requête)."""
+    names = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split("#", 1)[0].split()
+                if len(fields) >= 2 and fields[0] not in names:
+                    names[fields[0]] = fields[1]
+    except OSError:
+        pass
+    return names
+
+def build_ptr_query(qid: int, qname: str) -> bytes:
+    """Requête DNS PTR (récursion demandée) pour un nom in-addr.arpa / ip6.arpa."""
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)
+    labels = b"".join(bytes([len(label)]) + label.encode("ascii") for label in qname.split(".") if label)
+    return header + labels + b"\x00" + struct.pack("!HH", TYPE_PTR, CLASS_IN)
+
+def read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Nom DNS (avec pointeurs de compression) ; retourne (nom, offset après le nom)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Nom DNS tronqué")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data) or jumps > 32:
+                raise ValueError("Pointeur DNS invalide")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            continue
+        if length == 0:
+            return ".".join(labels), (end if end is not None else offset + 1)
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", errors="replace"))
+        offset += 1 + length
+
+def parse_ptr_response(data: bytes) -> Tuple[int, str, int, str, int]:
+    """Réponse DNS -> (qid, nom demandé, rcode, nom PTR ou "", TTL).
+    Lève ValueError si le message est mal formé."""
+    if len(data) < 12:
+        raise ValueError("Message DNS trop court")
+    qid, flags, qdcount, ancount = struct.unpack("!HHHH", data[:8])
+    if not flags & 0x8000 or qdcount != 1:
+        raise ValueError("Pas une réponse DNS")
+    qname, offset = read_name(data, 12)
+    offset += 4
+    for _ in range(ancount):
+        _, offset = read_name(data, offset)
+        if offset + 10 > len(data):
+            raise ValueError("Réponse DNS tronquée")
+        rtype, _, ttl, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        if rtype == TYPE_PTR:
+            name, _ = read_name(data, offset)
+            return qid, qname, flags & 0x000F, name.rstrip("."), ttl
+        offset += rdlength
+    return qid, qname, flags & 0x000F, "", 0
+
+class _Query:
+    __slots__ = ("ip", "qname", "attempts", "deadline", "server")
+
+    def __init__(self, ip: str, qname: str):
+        self.ip = ip
+        self.qname = qname
+        self.attempts = 0
+        self.deadline = 0.0
+        self.server = 0
+
+class PtrResolver:
+    def __init__(self, nameservers: List[str] = None, timeout: float = 1.0, retries: int = 2,
+                 sockets: int = 4, negative_ttl: float = NEGATIVE_TTL, port: int = DNS_PORT):
+        """
+        Args:
+            nameservers: Serveurs DNS (défaut: /etc/resolv.conf)
+            timeout: Attente d'une réponse avant retransmission
+            retries: Retransmissions par requête (en alternant les serveurs)
+            sockets: Sockets UDP sur lesquels les requêtes sont réparties
+            negative_ttl: Durée de cache d'une absence de nom
+        """
+        self.nameservers = read_resolv_conf() if nameservers is None else list(nameservers)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.socket_count = max(1, sockets)
+        self.negative_ttl = negative_ttl
+        self.port = port
+        self._hosts = read_hosts_file()
+        self._lock = threading.Lock()
+        # ip -> (nom, "" si aucun ; instant d'expiration)
+        self._cache: Dict[str, Tuple[str, float]] = {}
+        # IPs dont la dernière résolution a échoué (timeout, SERVFAIL) plutôt qu'abouti à "aucun nom"
+        self._failed = set()
+        self._waiting: Dict[str, threading.Event] = {}
+        self._outbox = collections.deque()
+        self._in_flight: Dict[int, _Query] = {}
+        self._sockets: List[socket.socket] = []
+        self._selector = None
+        self._wake_r = self._wake_w = None
+        self._thread = None
+        self._stopping = False
+        self._next_socket = 0
+        self.stats = {"queries": 0, "answered": 0, "negative": 0, "timeouts": 0,
+                      "failures": 0, "retransmits": 0, "cache_hits": 0}
+
+    @property
+    def available(self) -> bool:
+        return bool(self.nameservers)
+
+    def start(self):
+        """Ouvre les sockets et démarre le thread d'E/S (appelé à la première requête)."""
+        with self._lock:
+            if self._thread is not None or not self.available:
+                return
+            self._selector = selectors.DefaultSelector()
+            for _ in range(self.socket_count):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sock.setblocking(False)
+                self._sockets.append(sock)
+                self._selector.register(sock, selectors.EVENT_READ)
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._selector.register(self._wake_r, selectors.EVENT_READ)
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is None:
+            return
+        self._wake()
+        thread.join()
+        self._selector.close()
+        for sock in self._sockets + [self._wake_r, self._wake_w]:
+            sock.close()
+        self._sockets = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def prefetch(self, ip: str):
+        """Lance la résolution de `ip` sans attendre (ex. dès que l'hôte est découvert)."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(ip)
+            if cached is not None and cached[1] > now:
+                self.stats["cache_hits"] += 1
+                return
+            if ip in self._waiting:
+                return
+            if ip in self._hosts:
+                self._cache[ip] = (self._hosts[ip], float("inf"))
+                return
+            self._waiting[ip] = threading.Event()
+            self._outbox.append(ip)
+        if self._thread is None:
+            self.start()
+        self._wake()
+
+    def resolve(self, ip: str, wait: float = None) -> str:
+        """Nom PTR de `ip` ("" si aucun) ; attend au plus la durée de toutes les tentatives."""
+        return self.resolve_many([ip], wait)[ip]
+
+    def failed(self, ip: str) -> bool:
+        """Vrai si aucun nom n'a été obtenu faute de réponse fiable (timeout, SERVFAIL, attente
+        écoulée) : à ne pas mémoriser comme une absence de nom."""
+        with self._lock:
+            cached = self._cache.get(ip)
+            return cached is None or ip in self._failed
+
+    def resolve_many(self, ips: Iterable[str], wait: float = None) -> Dict[str, str]:
+        """{ip: nom} ; toutes les requêtes partent ensemble."""
+        ips = list(dict.fromkeys(ips))
+        if not self.available:
+            return {ip: self._hosts.get(ip, "") for ip in ips}
+        for ip in ips:
+            self.prefetch(ip)
+        deadline = time.monotonic() + (self.timeout * (self.retries + 1) + 0.5 if wait is None else wait)
+        names = {}
+        for ip in ips:
+            with self._lock:
+                event = self._waiting.get(ip)
+            if event is not None:
+                event.wait(max(0.0, deadline - time.monotonic()))
+            with self._lock:
+                cached = self._cache.get(ip)
+            names[ip] = cached[0] if cached is not None else ""
+        return names
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\x00")
+        except (OSError, AttributeError):
+            pass
+
+    def _loop(self):
+        while not self._stopping:
+            with self._lock:
+                deadlines = [query.deadline for query in self._in_flight.values()]
+            wait = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for key, _ in self._selector.select(wait):
+                if key.fileobj is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                else:
+                    self._receive(key.fileobj)
+            self._send_new()
+            self._expire()
+
+    def _send_new(self):
+        while True:
+            with self._lock:
+                if not self._outbox:
+                    return
+                ip = self._outbox.popleft()
+                qid = random.getrandbits(16)
+                while qid in self._in_flight:
+                    qid = random.getrandbits(16)
+                query = _Query(ip, ipaddress.ip_address(ip).reverse_pointer)
+                self._in_flight[qid] = query
+                self.stats["queries"] += 1
+            self._transmit(qid, query)
+
+    def _transmit(self, qid: int, query: _Query):
+        server = self.nameservers[query.server % len(self.nameservers)]
+        sock = self._sockets[self._next_socket % len(self._sockets)]
+        self._next_socket += 1
+        query.attempts += 1
+        query.deadline = time.monotonic() + self.timeout
+        try:
+            sock.sendto(build_ptr_query(qid, query.qname), (server, self.port))
+        except OSError:
+            # Réseau injoignable : la requête expirera et sera retentée
+            pass
+
+    def _receive(self, sock: socket.socket):
+        while True:
+            try:
+                data, addr = sock.recvfrom(4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            if addr[0] not in self.nameservers:
+                continue
+            try:
+                qid, qname, rcode, name, ttl = parse_ptr_response(data)
+            except ValueError:
+                continue
+            with self._lock:
+                query = self._in_flight.get(qid)
+                # Identifiant ET nom demandé doivent correspondre (réponses usurpées)
+                if query is None or qname.lower() != query.qname.lower():
+                    continue
+                if rcode not in (RCODE_NOERROR, RCODE_NXDOMAIN) and query.attempts <= self.retries:
+                    # SERVFAIL / REFUSED : essayer le serveur suivant
+                    query.server += 1
+                    retry = True
+                else:
+                    del self._in_flight[qid]
+                    retry = False
+                    if rcode not in (RCODE_NOERROR, RCODE_NXDOMAIN):
+                        self.stats["failures"] += 1
+            if retry:
+                self._transmit(qid, query)
+                continue
+            self._finish(query, name, ttl, definitive=rcode in (RCODE_NOERROR, RCODE_NXDOMAIN))
+
+    def _expire(self):
+        now = time.monotonic()
+        retransmit = []
+        expired = []
+        with self._lock:
+            for qid, query in list(self._in_flight.items()):
+                if query.deadline > now:
+                    continue
+                if query.attempts <= self.retries:
+                    query.server += 1
+                    retransmit.append((qid, query))
+                    self.stats["retransmits"] += 1
+                else:
+                    del self._in_flight[qid]
+                    expired.append(query)
+                    self.stats["timeouts"] += 1
+        for qid, query in retransmit:
+            self._transmit(qid, query)
+        for query in expired:
+            self._finish(query, "", 0, definitive=False)
+
+    def _finish(self, query: _Query, name: str, ttl: int, definitive: bool = True):
+        now = time.monotonic()
+        with self._lock:
+            self._failed.discard(query.ip)
+            if name:
+                self._cache[query.ip] = (name, now + max(ttl, MIN_POSITIVE_TTL))
+                self.stats["answered"] += 1
+            elif definitive:
+                self._cache[query.ip] = ("", now + self.negative_ttl)
+                self.stats["negative"] += 1
+            else:
+                self._cache[query.ip] = ("", now + FAILURE_TTL)
+                self._failed.add(query.ip)
+            event = self._waiting.pop(query.ip, None)
+        if event is not None:
+            event.set()
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 dns_resolver.py <ip|cidr> [...]")
+        sys.exit(1)
+
+    ips = []
+    for arg in sys.argv[1:]:
+        network = ipaddress.ip_network(arg, strict=False)
+        ips.extend(str(ip) for ip in (network.hosts() if network.num_addresses > 1 else [network.network_address]))
+
+    with PtrResolver() as resolver:
+        if not resolver.available:
+            print("Aucun serveur DNS dans /etc/resolv.conf")
+            sys.exit(1)
+        started = time.monotonic()
+        names = resolver.resolve_many(ips)
+        print(f"🔎 {len(ips)} PTR en {time.monotonic() - started:.2f}s via {', '.join(resolver.nameservers)}")
+        for ip, name in names.items():
+            if name:
+                print(f"  {ip:<16} {name}")
+        print(f"   {resolver.stats}")
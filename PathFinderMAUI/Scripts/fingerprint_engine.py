@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Fingerprint Engine Module - Classification OS / type d'appareil par empreintes
+Les empreintes sont déclaratives (ports, bande de TTL, mots-clés de bannière ou
+d'en-tête Server, constructeur de la MAC, options TCP du SYN-ACK, poids). Au chargement, les ports sont compilés en masques de
+bits ; les mots-clés sont trouvés par l'analyse de bannières partagée
+(banner_analysis, un automate pour tous) ; chaque règle est indexée par
+un port, un mot-clé ou un constructeur déclencheur, si bien qu'un hôte n'évalue que les règles
+que ses ports et bannières peuvent satisfaire. Le coût par hôte suit ce nombre de règles
+candidates (et de règles satisfaites à classer), pas la taille de la base : il croît avec
+les règles qui visent des ports et mots-clés courants (benchmark_fingerprints.py).
+"""
+
+import heapq
+import json
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from banner_analysis import BANNER_ANALYZER, BANNER_CACHE_SIZE, BannerAnalyzer, analyze_banner
+
+KINDS = ("os", "device")
+DEFAULT_LABELS = {"os": "Unknown", "device": "Appareil"}
+# Candidats conservés dans le résultat
+MAX_CANDIDATES = 3
+
+# Base d'empreintes. Conditions (toutes requises) :
+#   ports_any / ports_all : au moins un / tous ouverts ; max_ports / min_ports
+#   ttl : [min, max] ; banner : mot-clé dans une bannière (banner_port : celle de ce port)
+#   server / server_all : mot-clé(s) dans l'en-tête Server ; server_present ; ip_suffix
+#   vendor : mot-clé dans le constructeur de la MAC (registre OUI) ; random_mac : MAC privée
+#   tcp_options / tcp_missing : options TCP présentes / absentes du SYN-ACK (timestamps, sack,
+#   wscale, ecn ; relevé TCP_INFO) ; tcp_wscale : [min, max] du window scale annoncé
+# weight : confiance de la règle seule (0-1), sert aussi d'ordre de priorité.
+# family : règles qui se confortent entre elles (ex. TTL 128 et port 445 pour Windows).
+# Le libellé accepte {server}, {ports} et {ttl}.
+FINGERPRINT_DATABASE = [
+    # ---- OS ----
+    {"kind": "os", "label": "iOS (iPhone/iPad)", "family": "Apple", "weight": 0.95, "ports_any": [62078, 7000, 3689]},
+    {"kind": "os", "label": "Android", "family": "Android", "weight": 0.9, "ports_any": [8009, 8008]},
+    {"kind": "os", "label": "iOS/Android (Mobile)", "family": "Mobile", "weight": 0.8,
+     "ports_any": [5353], "ttl": [60, 64], "max_ports": 3},
+    {"kind": "os", "label": "Windows", "family": "Windows", "weight": 0.6,
+     "tcp_options": ["wscale"], "tcp_missing": ["timestamps"], "tcp_wscale": [8, 8]},
+    {"kind": "os", "label": "Windows (RDP actif)", "family": "Windows", "weight": 0.78, "ports_any": [3389]},
+    {"kind": "os", "label": "Windows", "family": "Windows", "weight": 0.75, "ports_any": [445, 135]},
+    {"kind": "os", "label": "Windows", "family": "Windows", "weight": 0.75, "server": ["microsoft-iis"]},
+    {"kind": "os", "label": "macOS", "family": "Unix", "weight": 0.72, "ports_all": [5900, 88]},
+    {"kind": "os", "label": "Ubuntu Linux", "family": "Unix", "weight": 0.7, "banner": ["ubuntu"], "banner_port": 22},
+    {"kind": "os", "label": "Ubuntu Linux", "family": "Unix", "weight": 0.7, "server_all": ["apache", "ubuntu"]},
+    {"kind": "os", "label": "Debian Linux", "family": "Unix", "weight": 0.69, "banner": ["debian"], "banner_port": 22},
+    {"kind": "os", "label": "Debian Linux", "family": "Unix", "weight": 0.69, "server_all": ["apache", "debian"]},
+    {"kind": "os", "label": "CentOS/RedHat Linux", "family": "Unix", "weight": 0.68,
+     "banner": ["centos", "redhat", "red hat"], "banner_port": 22},
+    {"kind": "os", "label": "Linux (Raspberry Pi OS)", "family": "Unix", "weight": 0.6, "vendor": ["raspberry"]},
+    {"kind": "os", "label": "iOS/macOS (Apple)", "family": "Apple", "weight": 0.6, "vendor": ["apple"]},
+    {"kind": "os", "label": "Mobile (iOS/Android probable)", "family": "Mobile", "weight": 0.55,
+     "ttl": [64, 64], "max_ports": 2},
+    {"kind": "os", "label": "Linux/Unix/macOS", "family": "Unix", "weight": 0.45, "banner": ["openssh"], "banner_port": 22},
+    {"kind": "os", "label": "Linux/Unix/macOS", "family": "Unix", "weight": 0.4, "tcp_options": ["timestamps", "sack"]},
+    {"kind": "os", "label": "Android", "family": "Android", "weight": 0.38,
+     "vendor": ["samsung", "xiaomi", "huawei", "oneplus", "motorola"]},
+    {"kind": "os", "label": "iOS/Android (Mobile)", "family": "Mobile", "weight": 0.38, "random_mac": True},
+    {"kind": "os", "label": "Windows", "family": "Windows", "weight": 0.4, "ttl": [120, 128]},
+    {"kind": "os", "label": "Système embarqué (pile TCP minimale)", "family": "Embarqué", "weight": 0.36,
+     "tcp_missing": ["timestamps", "sack", "wscale"]},
+    {"kind": "os", "label": "Linux/Unix/macOS", "family": "Unix", "weight": 0.35, "ttl": [60, 64]},
+    {"kind": "os", "label": "Linux/Unix/macOS (distant)", "family": "Unix", "weight": 0.2, "ttl": [50, 59]},
+    {"kind": "os", "label": "Windows (distant)", "family": "Windows", "weight": 0.2, "ttl": [110, 119]},
+    {"kind": "os", "label": "Cisco/Network Device (TTL: 255)", "family": "Network", "weight": 0.3, "ttl": [240, 255]},
+    {"kind": "os", "label": "Cisco/Network Device (distant)", "family": "Network", "weight": 0.2, "ttl": [230, 239]},
+    {"kind": "os", "label": "Unknown Network Device", "family": "Network", "weight": 0.1, "ttl": [129, 229]},
+    {"kind": "os", "label": "Unknown (TTL: {ttl})", "weight": 0.05, "ttl": [1, 49]},
+    {"kind": "os", "label": "Unknown (TTL: {ttl})", "weight": 0.05, "ttl": [65, 109]},
+
+    # ---- Types d'appareils ----
+    {"kind": "device", "label": "iPhone/iPad (Apple Home)", "family": "Apple", "weight": 0.95, "ports_any": [62078]},
+    {"kind": "device", "label": "iPhone/iPad (AirPlay)", "family": "Apple", "weight": 0.9, "ports_any": [7000]},
+    {"kind": "device", "label": "iPhone/iPad (iTunes/DAAP)", "family": "Apple", "weight": 0.88, "ports_any": [3689]},
+    {"kind": "device", "label": "Android (Chromecast)", "family": "Android", "weight": 0.85, "ports_any": [8009, 8008]},
+    {"kind": "device", "label": "Smartphone (iOS/Android)", "family": "Mobile", "weight": 0.8,
+     "ports_any": [5353], "max_ports": 3},
+    {"kind": "device", "label": "Routeur MikroTik", "family": "Routeur", "weight": 0.85, "vendor": ["routerboard"]},
+    {"kind": "device", "label": "Enceinte Sonos", "family": "Multimédia", "weight": 0.85, "vendor": ["sonos"]},
+    {"kind": "device", "label": "NAS", "family": "NAS", "weight": 0.85, "vendor": ["synology", "qnap"]},
+    {"kind": "device", "label": "Raspberry Pi", "family": "Linux", "weight": 0.85, "vendor": ["raspberry"]},
+    {"kind": "device", "label": "ESP32/ESP8266", "family": "Embarqué", "weight": 0.8, "vendor": ["espressif"]},
+    {"kind": "device", "label": "Caméra IP", "family": "Caméra", "weight": 0.8,
+     "vendor": ["hikvision", "dahua", "axis communications"]},
+    {"kind": "device", "label": "Pont Philips Hue", "family": "Domotique", "weight": 0.8,
+     "vendor": ["philips lighting", "signify"]},
+    {"kind": "device", "label": "Lecteur multimédia Roku", "family": "Multimédia", "weight": 0.8, "vendor": ["roku"]},
+    {"kind": "device", "label": "Routeur MikroTik", "family": "Routeur", "weight": 0.75, "banner": ["mikrotik", "routeros"]},
+    {"kind": "device", "label": "Imprimante Réseau", "family": "Imprimante", "weight": 0.75,
+     "vendor": ["brother", "seiko epson", "xerox", "lexmark", "kyocera", "ricoh"]},
+    {"kind": "device", "label": "Point d'accès/Routeur Ubiquiti", "family": "Routeur", "weight": 0.75, "vendor": ["ubiquiti"]},
+    {"kind": "device", "label": "Routeur Cisco", "family": "Routeur", "weight": 0.74, "banner": ["cisco"]},
+    {"kind": "device", "label": "Routeur", "family": "Routeur", "weight": 0.7, "banner": ["router", "gateway"]},
+    {"kind": "device", "label": "Imprimante Réseau", "family": "Imprimante", "weight": 0.72,
+     "banner": ["printer", "jetdirect"]},
+    {"kind": "device", "label": "Imprimante Réseau", "family": "Imprimante", "weight": 0.6, "ports_any": [9100, 631]},
+    {"kind": "device", "label": "Caméra IP", "family": "Caméra", "weight": 0.72, "banner": ["camera", "ipcam"]},
+    {"kind": "device", "label": "Caméra IP", "family": "Caméra", "weight": 0.55, "ports_any": [554]},
+    {"kind": "device", "label": "NAS", "family": "NAS", "weight": 0.7, "banner": ["nas", "synology", "qnap"]},
+    {"kind": "device", "label": "Raspberry Pi", "family": "Linux", "weight": 0.68, "banner": ["raspberry", "raspbian"]},
+    {"kind": "device", "label": "Arduino", "family": "Embarqué", "weight": 0.67, "banner": ["arduino"]},
+    {"kind": "device", "label": "ESP32/ESP8266", "family": "Embarqué", "weight": 0.67, "banner": ["esp8266", "esp32"]},
+    {"kind": "device", "label": "Appareil Apple", "family": "Apple", "weight": 0.6, "vendor": ["apple"]},
+    {"kind": "device", "label": "Google Chromecast/Nest", "family": "Android", "weight": 0.6, "vendor": ["google"]},
+    {"kind": "device", "label": "Amazon Echo/Fire TV", "family": "Amazon", "weight": 0.6, "vendor": ["amazon"]},
+    {"kind": "device", "label": "Routeur", "family": "Routeur", "weight": 0.55,
+     "vendor": ["tp-link", "netgear", "avm gmbh", "audiovisuelles", "freebox"]},
+    {"kind": "device", "label": "Smartphone/Tablette Android", "family": "Android", "weight": 0.5,
+     "vendor": ["samsung", "xiaomi", "huawei", "oneplus", "motorola"]},
+    {"kind": "device", "label": "Routeur Cisco", "family": "Routeur", "weight": 0.5, "vendor": ["cisco"]},
+    {"kind": "device", "label": "Serveur Web IIS (Windows)", "family": "Windows", "weight": 0.5,
+     "ports_any": [80, 8080, 443], "server": ["microsoft-iis", "iis"]},
+    {"kind": "device", "label": "Serveur Web Apache", "family": "Web", "weight": 0.5,
+     "ports_any": [80, 8080, 443], "server": ["apache"]},
+    {"kind": "device", "label": "Serveur Web Nginx", "family": "Web", "weight": 0.5,
+     "ports_any": [80, 8080, 443], "server": ["nginx"]},
+    {"kind": "device", "label": "Serveur Web ({server})", "family": "Web", "weight": 0.45,
+     "ports_any": [80, 8080, 443], "server_present": True},
+    {"kind": "device", "label": "Smartphone (adresse MAC privée)", "family": "Mobile", "weight": 0.45, "random_mac": True},
+    {"kind": "device", "label": "Serveur MySQL/MariaDB", "family": "Base de données", "weight": 0.44, "ports_any": [3306]},
+    {"kind": "device", "label": "Serveur PostgreSQL", "family": "Base de données", "weight": 0.43, "ports_any": [5432]},
+    {"kind": "device", "label": "Serveur MongoDB", "family": "Base de données", "weight": 0.42, "ports_any": [27017]},
+    {"kind": "device", "label": "Serveur Redis", "family": "Base de données", "weight": 0.41, "ports_any": [6379]},
+    {"kind": "device", "label": "Machine virtuelle (VMware)", "family": "Virtualisation", "weight": 0.42, "vendor": ["vmware"]},
+    {"kind": "device", "label": "Machine virtuelle (VirtualBox)", "family": "Virtualisation", "weight": 0.42,
+     "vendor": ["pcs systemtechnik"]},
+    {"kind": "device", "label": "Serveur MS SQL", "family": "Base de données", "weight": 0.4, "ports_any": [1433]},
+    {"kind": "device", "label": "PC/Serveur Windows (RDP)", "family": "Windows", "weight": 0.39, "ports_any": [3389]},
+    {"kind": "device", "label": "PC/Serveur Windows (SMB)", "family": "Windows", "weight": 0.38, "ports_all": [445, 139]},
+    {"kind": "device", "label": "Appareil Windows", "family": "Windows", "weight": 0.37, "ports_any": [445]},
+    {"kind": "device", "label": "Imprimante Réseau", "family": "Imprimante", "weight": 0.35,
+     "vendor": ["hewlett packard", "hp inc", "canon"]},
+    {"kind": "device", "label": "Serveur Mail (SMTP)", "family": "Mail", "weight": 0.35, "ports_any": [25, 587]},
+    {"kind": "device", "label": "Serveur Mail (POP/IMAP)", "family": "Mail", "weight": 0.34, "ports_any": [110, 143]},
+    {"kind": "device", "label": "PC/Portable", "family": "PC", "weight": 0.33,
+     "vendor": ["intel corporate", "dell", "lenovo", "asustek"]},
+    {"kind": "device", "label": "Serveur SSH/Linux", "family": "Linux", "weight": 0.3, "ports_any": [22], "max_ports": 3},
+    {"kind": "device", "label": "Passerelle/Routeur", "family": "Routeur", "weight": 0.25, "ip_suffix": [".1", ".254"]},
+    {"kind": "device", "label": "Appareil Réseau ({ports} ports)", "weight": 0.05, "min_ports": 1},
+]
+
+class Rule:
+    __slots__ = ("index", "kind", "label", "static_label", "family", "weight", "any_mask", "all_mask",
+                 "ttl", "min_ports", "max_ports", "banner", "banner_port", "server",
+                 "server_all", "server_present", "ip_suffix", "vendor", "random_mac",
+                 "tcp_options", "tcp_missing", "tcp_wscale", "needs_tcp", "trigger_only")
+
+    def __init__(self, index: int, spec: Dict, port_bits: Dict[int, int]):
+        self.index = index
+        self.kind = spec["kind"]
+        if self.kind not in KINDS:
+            raise ValueError(f"Type d'empreinte inconnu: {self.kind}")
+        self.label = spec["label"]
+        # Libellé sans champ à remplir : utilisé tel quel (pas de format() par hôte)
+        self.static_label = self.label if "{" not in self.label else None
+        self.family = spec.get("family", self.label)
+        self.weight = float(spec.get("weight", 0.5))
+        self.any_mask = _mask(spec.get("ports_any", ()), port_bits)
+        self.all_mask = _mask(spec.get("ports_all", ()), port_bits)
+        ttl = spec.get("ttl")
+        self.ttl = (int(ttl[0]), int(ttl[1])) if ttl else None
+        self.min_ports = spec.get("min_ports", 0)
+        self.max_ports = spec.get("max_ports")
+        self.banner = frozenset(keyword.lower() for keyword in spec.get("banner", ()))
+        self.banner_port = spec.get("banner_port")
+        self.server = frozenset(keyword.lower() for keyword in spec.get("server", ()))
+        self.server_all = frozenset(keyword.lower() for keyword in spec.get("server_all", ()))
+        self.server_present = bool(spec.get("server_present"))
+        self.ip_suffix = tuple(spec.get("ip_suffix", ()))
+        self.vendor = frozenset(keyword.lower() for keyword in spec.get("vendor", ()))
+        self.random_mac = bool(spec.get("random_mac"))
+        self.tcp_options = frozenset(spec.get("tcp_options", ()))
+        self.tcp_missing = frozenset(spec.get("tcp_missing", ()))
+        wscale = spec.get("tcp_wscale")
+        self.tcp_wscale = (int(wscale[0]), int(wscale[1])) if wscale else None
+        self.needs_tcp = bool(self.tcp_options or self.tcp_missing or self.tcp_wscale)
+        # Seule condition = déclencheur de l'index (port, constructeur, Server, MAC privée) :
+        # une règle candidate est satisfaite sans appeler matches()
+        conditions = (self.any_mask, self.all_mask, self.ttl, self.min_ports, self.max_ports is not None,
+                      self.banner, self.server, self.server_all, self.server_present, self.ip_suffix,
+                      self.vendor, self.random_mac, self.needs_tcp)
+        triggers = (self.any_mask, self.vendor, self.server_present, self.random_mac)
+        self.trigger_only = sum(map(bool, conditions)) <= 1 and (any(triggers) or not any(conditions))
+
+    def matches(self, host: "HostView") -> bool:
+        if self.any_mask and not host.mask & self.any_mask:
+            return False
+        if self.all_mask and host.mask & self.all_mask != self.all_mask:
+            return False
+        if self.ttl and not self.ttl[0] <= host.ttl <= self.ttl[1]:
+            return False
+        if host.port_count < self.min_ports:
+            return False
+        if self.max_ports is not None and host.port_count > self.max_ports:
+            return False
+        if self.banner:
+            found = host.port_keywords.get(self.banner_port, ()) if self.banner_port is not None else host.banner_keywords
+            if self.banner.isdisjoint(found):
+                return False
+        if self.server and self.server.isdisjoint(host.server_keywords):
+            return False
+        if self.server_all and not self.server_all <= host.server_keywords:
+            return False
+        if self.server_present and not host.server:
+            return False
+        if self.ip_suffix and not host.ip.endswith(self.ip_suffix):
+            return False
+        if self.vendor and self.vendor.isdisjoint(host.vendor_keywords):
+            return False
+        if self.random_mac and not host.random_mac:
+            return False
+        if self.needs_tcp:
+            if host.tcp_options is None:
+                return False
+            if not self.tcp_options <= host.tcp_options or not self.tcp_missing.isdisjoint(host.tcp_options):
+                return False
+            if self.tcp_wscale and (host.tcp_wscale is None
+                                    or not self.tcp_wscale[0] <= host.tcp_wscale <= self.tcp_wscale[1]):
+                return False
+        return True
+
+def _mask(ports: Iterable[int], port_bits: Dict[int, int]) -> int:
+    mask = 0
+    for port in ports:
+        mask |= port_bits[int(port)]
+    return mask
+
+class HostView:
+    __slots__ = ("ip", "ttl", "open_ports", "port_count", "mask", "server",
+                 "port_keywords", "banner_keywords", "server_keywords", "vendor_keywords", "random_mac",
+                 "tcp_options", "tcp_wscale")
+
+    def __init__(self, ip: str, ttl: int, open_ports: List[int], mask: int, server: str,
+                 port_keywords: Dict[int, frozenset], server_keywords: frozenset,
+                 vendor_keywords: frozenset = frozenset(), random_mac: bool = False, tcp: Dict = None):
+        self.ip = ip
+        self.ttl = ttl or 0
+        self.open_ports = open_ports
+        self.port_count = len(open_ports)
+        self.mask = mask
+        self.server = server
+        self.port_keywords = port_keywords
+        self.banner_keywords = frozenset().union(*port_keywords.values()) if port_keywords else frozenset()
+        self.server_keywords = server_keywords
+        self.vendor_keywords = vendor_keywords
+        self.random_mac = random_mac
+        # Relevé TCP_INFO (options du SYN-ACK) ; None si aucune connexion n'a pu être lue
+        self.tcp_options = frozenset(tcp.get("options", ())) if tcp else None
+        self.tcp_wscale = tcp.get("wscale") if tcp else None
+
+class FingerprintEngine:
+    def __init__(self, database: List[Dict] = None):
+        """Compile la base d'empreintes (FINGERPRINT_DATABASE par défaut)."""
+        self.compile(FINGERPRINT_DATABASE if database is None else database)
+
+    def compile(self, database: List[Dict]):
+        # Bits attribués dans l'ordre de la base : les ports courants (base intégrée)
+        # gardent des bits bas, le masque d'un hôte reste un petit entier
+        ports = dict.fromkeys(int(port) for spec in database
+                              for port in list(spec.get("ports_any", ())) + list(spec.get("ports_all", ())))
+        self.port_bits = {port: 1 << bit for bit, port in enumerate(ports)}
+        self.bit_ports = list(ports)
+        self.rules = [Rule(index, spec, self.port_bits) for index, spec in enumerate(database)]
+
+        keywords = set()
+        for rule in self.rules:
+            keywords |= rule.banner | rule.server | rule.server_all | rule.vendor
+        self.keywords = frozenset(keywords)
+        # Mots-clés tous connus de l'analyseur partagé : bannières lues une fois pour
+        # la classification et les CVE ; sinon automate propre à cette base
+        self.analyzer = None if keywords <= BANNER_ANALYZER.keywords else BannerAnalyzer(extra_keywords=keywords)
+        # Mots-clés mémorisés par texte distinct (bannière, Server, constructeur) : les mêmes
+        # reviennent d'un hôte à l'autre
+        self._analyze = analyze_banner if self.analyzer is None else lru_cache(BANNER_CACHE_SIZE)(self.analyzer.analyze)
+
+        # Index : chaque règle n'est rattachée qu'à un déclencheur
+        self.by_port: Dict[int, List[Rule]] = {}
+        self.by_keyword: Dict[str, List[Rule]] = {}
+        self.by_vendor: Dict[str, List[Rule]] = {}
+        self.with_server: List[Rule] = []
+        self.with_random_mac: List[Rule] = []
+        self.with_tcp: List[Rule] = []
+        self.always: List[Rule] = []
+        for rule in self.rules:
+            if rule.vendor:
+                # Constructeur : déclencheur le plus rare, un hôte n'en a qu'un
+                for keyword in rule.vendor:
+                    self.by_vendor.setdefault(keyword, []).append(rule)
+            elif rule.all_mask:
+                # Un des ports requis suffit comme déclencheur : le moins chargé
+                port = min(self._ports_of(rule.all_mask), key=lambda p: len(self.by_port.get(p, ())))
+                self.by_port.setdefault(port, []).append(rule)
+            elif rule.any_mask:
+                for port in self._ports_of(rule.any_mask):
+                    self.by_port.setdefault(port, []).append(rule)
+            elif rule.server_all:
+                self.by_keyword.setdefault(min(rule.server_all), []).append(rule)
+            elif rule.banner or rule.server:
+                for keyword in rule.banner | rule.server:
+                    self.by_keyword.setdefault(keyword, []).append(rule)
+            elif rule.server_present:
+                self.with_server.append(rule)
+            elif rule.random_mac:
+                self.with_random_mac.append(rule)
+            elif rule.needs_tcp:
+                self.with_tcp.append(rule)
+            else:
+                self.always.append(rule)
+
+    def _ports_of(self, mask: int) -> List[int]:
+        ports = []
+        while mask:
+            low = mask & -mask
+            ports.append(self.bit_ports[low.bit_length() - 1])
+            mask ^= low
+        return ports
+
+    def _keywords(self, text: str) -> frozenset:
+        if not text:
+            return frozenset()
+        return self._analyze(text).hints
+
+    def host_view(self, ip: str, ttl: int, open_ports: Iterable[int], banners: Dict = None,
+                  server: str = "", vendor: str = "", random_mac: bool = False, tcp: Dict = None) -> HostView:
+        open_ports = list(open_ports)
+        mask = 0
+        for port in open_ports:
+            mask |= self.port_bits.get(port, 0)
+        port_keywords = {}
+        for port, banner in (banners or {}).items():
+            found = self._keywords(banner)
+            if found:
+                port_keywords[int(port)] = found
+        return HostView(ip, ttl, open_ports, mask, server or "", port_keywords, self._keywords(server),
+                        self._keywords(vendor), random_mac, tcp)
+
+    def candidates(self, host: HostView) -> List[Rule]:
+        """Règles que les ports / mots-clés / constructeur de l'hôte peuvent satisfaire."""
+        seen = {}
+        for port in host.open_ports:
+            for rule in self.by_port.get(port, ()):
+                seen[rule.index] = rule
+        for keyword in host.banner_keywords | host.server_keywords:
+            for rule in self.by_keyword.get(keyword, ()):
+                seen[rule.index] = rule
+        for keyword in host.vendor_keywords:
+            for rule in self.by_vendor.get(keyword, ()):
+                seen[rule.index] = rule
+        if host.server:
+            for rule in self.with_server:
+                seen[rule.index] = rule
+        if host.random_mac:
+            for rule in self.with_random_mac:
+                seen[rule.index] = rule
+        if host.tcp_options is not None:
+            for rule in self.with_tcp:
+                seen[rule.index] = rule
+        for rule in self.always:
+            seen[rule.index] = rule
+        return list(seen.values())
+
+    def classify_view(self, host: HostView) -> Dict[str, Dict]:
+        matched = {kind: [] for kind in KINDS}
+        for rule in self.candidates(host):
+            if rule.trigger_only or rule.matches(host):
+                matched[rule.kind].append(rule)
+        return {kind: self._rank(rules, host, kind) for kind, rules in matched.items()}
+
+    def _rank(self, rules: List[Rule], host: HostView, kind: str) -> Dict:
+        if not rules:
+            return {"label": DEFAULT_LABELS[kind], "confidence": 0.0, "candidates": []}
+        # Confiance d'une famille : les règles indépendantes se cumulent (OU bruité) ;
+        # par libellé, la règle la plus forte (puis la première de la base), en une passe
+        doubt = {}
+        best = {}
+        for rule in rules:
+            doubt[rule.family] = doubt.get(rule.family, 1.0) * (1.0 - rule.weight)
+            label = rule.static_label
+            if label is None:
+                label = rule.label.format(server=host.server, ports=host.port_count, ttl=host.ttl)
+            current = best.get(label)
+            if current is None or (rule.weight, -rule.index) > (current.weight, -current.index):
+                best[label] = rule
+        confidence = {family: round(1.0 - value, 3) for family, value in doubt.items()}
+        # Rang : confiance cumulée rapportée, puis règle la plus forte (ordre de priorité de la base) ;
+        # seuls les MAX_CANDIDATES premiers sont extraits (tas), pas de tri complet
+        ranked = heapq.nsmallest(MAX_CANDIDATES, best.items(),
+                                 key=lambda item: (-confidence[item[1].family], -item[1].weight, item[1].index))
+        candidates = [(label, confidence[rule.family]) for label, rule in ranked]
+        return {"label": candidates[0][0], "confidence": candidates[0][1], "candidates": candidates}
+
+    def classify(self, ip: str, ttl: int, open_ports: Iterable[int], banners: Dict = None,
+                 server: str = "", vendor: str = "", random_mac: bool = False, tcp: Dict = None) -> Dict[str, Dict]:
+        """{"os": {...}, "device": {...}} avec label, confidence et candidats classés.
+        tcp : relevé TCP_INFO de l'hôte ({"options": [...], "wscale": n})."""
+        return self.classify_view(self.host_view(ip, ttl, open_ports, banners, server, vendor, random_mac, tcp))
+
+    def classify_many(self, hosts: Iterable[Tuple]) -> List[Dict[str, Dict]]:
+        """Classe un lot d'hôtes [(ip, ttl, ports ouverts, bannières, Server[, constructeur, MAC privée, TCP])]."""
+        return [self.classify(*host) for host in hosts]
+
+def load_database(path: str) -> List[Dict]:
+    """Base d'empreintes JSON (liste de règles) ajoutée à la base intégrée."""
+    with open(path, "r", encoding="utf-8") as f:
+        extra = json.load(f)
+    if not isinstance(extra, list):
+        raise ValueError("La base d'empreintes doit être une liste de règles")
+    return FINGERPRINT_DATABASE + extra
+
+if __name__ == "__main__":
+    # Test du module
+    engine = FingerprintEngine()
+    samples = [
+        ("192.168.1.10", 128, [135, 139, 445, 3389], {}, ""),
+        ("192.168.1.20", 64, [22, 80], {22: "SSH-2.0-OpenSSH_8.9p1 Ubuntu-3ubuntu0.1"}, "Apache/2.4.52 (Ubuntu)"),
+        ("192.168.1.30", 64, [62078, 5353], {}, ""),
+        ("192.168.1.40", 255, [80, 9100], {80: "HP JetDirect"}, "HP HTTP Server"),
+        ("192.168.1.1", 64, [53, 80], {80: "MikroTik RouterOS"}, ""),
+        ("192.168.1.50", 64, [80], {}, "", "Espressif Inc."),
+        ("192.168.1.60", 64, [], {}, "", "", True),
+        ("192.168.1.70", 0, [135, 445], {}, "", "", False, {"options": ["sack", "wscale"], "wscale": 8}),
+    ]
+    print(f"🧬 {len(engine.rules)} empreinte(s), {len(engine.port_bits)} port(s), "
+          f"{len(engine.keywords)} mot(s)-clé(s)")
+    for sample, result in zip(samples, engine.classify_many(samples)):
+        print(f"  {sample[0]:<15} OS: {result['os']['label']} ({result['os']['confidence']:.2f}) | "
+              f"Appareil: {result['device']['label']} ({result['device']['confidence']:.2f})")
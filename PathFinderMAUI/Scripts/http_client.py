@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+HTTP Client Module - Client HTTP/1.1 keep-alive avec pool de connexions
+Un pool par (hôte, port, TLS) réutilise les connexions entre les sondes web
+(http_checks, panneaux d'admin, directory buster) et reprend la session TLS
+quand une nouvelle connexion est nécessaire. Les corps sont lus avec une borne.
+"""
+
+import http.client
+import re
+import ssl
+import threading
+import urllib.parse
+import weakref
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from resource_governor import get_governor
+except ImportError:
+    def get_governor():
+        return None
+
+USER_AGENT = "PathFinder/1.0"
+DEFAULT_MAX_BODY = 64 * 1024
+# Taille des morceaux lus : la mémoire par sonde reste de l'ordre de quelques Ko
+CHUNK_SIZE = 4096
+MAX_REDIRECTS = 5
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+# Réponses d'un serveur qui refuse HEAD : la sonde repasse en GET
+HEAD_REJECTED_CODES = {400, 405, 501}
+# Attente d'un permis entre deux purges des connexions inactives (tous les clients)
+PERMIT_WAIT = 0.5
+
+PoolKey = Tuple[str, int, bool]
+
+def insecure_tls_context() -> ssl.SSLContext:
+    """Contexte TLS sans vérification (comme les sondes urllib historiques)."""
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+class StreamMatcher:
+    def __init__(self, patterns: Iterable[str], groups: Iterable[Iterable[str]] = None):
+        """
+        Recherche multi-motifs insensible à la casse sur un flux, morceau par morceau.
+        Seule la fin du morceau précédent (longueur du plus long motif - 1) est
+        conservée pour trouver les motifs à cheval sur deux morceaux.
+
+        Args:
+            groups: Groupes de motifs (un par consommateur) ; done quand chaque
+                    groupe a au moins un motif trouvé (défaut: un seul groupe)
+        """
+        patterns = list(patterns)
+        self.patterns = sorted({p.lower().encode("utf-8") for p in patterns}, key=len, reverse=True)
+        if not self.patterns:
+            raise ValueError("Au moins un motif est nécessaire")
+        self.groups = [{p.lower() for p in group} for group in (groups or [patterns])]
+        self._regex = re.compile(b"|".join(re.escape(p) for p in self.patterns))
+        self._overlap = len(self.patterns[0]) - 1
+        self._tail = b""
+        self.found: Set[str] = set()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Analyse un morceau ; retourne True quand la lecture peut s'arrêter."""
+        window = self._tail + chunk.lower()
+        for match in self._regex.finditer(window):
+            self.found.add(match.group().decode("utf-8"))
+        self._tail = window[-self._overlap:] if self._overlap else b""
+        return self.done
+
+    @property
+    def done(self) -> bool:
+        return all(group & self.found for group in self.groups)
+
+class HttpResponse:
+    def __init__(self, url: str, status: int, reason: str, headers, body: bytes, truncated: bool,
+                 matches: Optional[Set[str]] = None):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.truncated = truncated
+        self.matches = matches
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="ignore")
+
+def read_body(response, max_body: int, keep_body: bool = True,
+              matcher: StreamMatcher = None, body_prefix: int = 0) -> bytes:
+    """Lit le corps par morceaux de CHUNK_SIZE jusqu'à max_body octets ou un motif trouvé.
+    Retourne le corps lu (keep_body) ou ses `body_prefix` premiers octets."""
+    received = 0
+    kept = []
+    while received < max_body:
+        chunk = response.read(min(CHUNK_SIZE, max_body - received))
+        if not chunk:
+            break
+        if keep_body:
+            kept.append(chunk)
+        elif received < body_prefix:
+            kept.append(chunk[:body_prefix - received])
+        received += len(chunk)
+        if matcher is not None and matcher.feed(chunk):
+            break
+    return b"".join(kept)
+
+def _tcp_connect(conn: http.client.HTTPConnection, connect_timeout: Optional[float]):
+    """Connexion TCP avec son propre délai ; poignée de main TLS et lecture gardent conn.timeout."""
+    read_timeout = conn.timeout
+    if connect_timeout is not None:
+        conn.timeout = connect_timeout
+    try:
+        http.client.HTTPConnection.connect(conn)
+    finally:
+        conn.timeout = read_timeout
+    conn.sock.settimeout(read_timeout)
+
+class _PooledHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection dont le délai de connexion TCP est distinct du délai de lecture."""
+
+    def __init__(self, *args, connect_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connect_timeout = connect_timeout
+
+    def connect(self):
+        _tcp_connect(self, self.connect_timeout)
+
+class _PooledHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection qui reprend une session TLS précédente (ticket / session id)."""
+
+    def __init__(self, *args, tls_session=None, connect_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tls_session = tls_session
+        self.connect_timeout = connect_timeout
+
+    def connect(self):
+        _tcp_connect(self, self.connect_timeout)
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=self.host,
+                                              session=self.tls_session)
+
+# Clients vivants : un thread à court de permis ferme les connexions inactives de tous
+_CLIENTS: "weakref.WeakSet[HttpClient]" = weakref.WeakSet()
+_CLIENTS_LOCK = threading.Lock()
+
+class HttpClient:
+    def __init__(self, timeout: float = 3.0, max_body: int = DEFAULT_MAX_BODY,
+                 max_idle_per_host: int = 8, ssl_context: ssl.SSLContext = None,
+                 stage: str = "http", connect_timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: Délai de lecture / poignée de main TLS par défaut (et de connexion
+                     si connect_timeout n'est pas donné)
+            max_body: Octets de corps lus au plus par réponse
+            max_idle_per_host: Connexions inactives gardées par (hôte, port, TLS)
+            ssl_context: Contexte TLS (défaut: sans vérification)
+            stage: Étage du gouverneur de ressources ; chaque connexion garde son permis
+                   jusqu'à sa fermeture, y compris inactive dans le pool
+            connect_timeout: Délai de la seule connexion TCP (dérivable du RTT : le temps
+                             de réflexion du serveur et la poignée de main n'en font pas partie)
+        """
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_body = max_body
+        self.max_idle_per_host = max_idle_per_host
+        self.ssl_context = ssl_context or insecure_tls_context()
+        self.stage = stage
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, List[http.client.HTTPConnection]] = {}
+        self._sessions: Dict[PoolKey, ssl.SSLSession] = {}
+        # Certificat pair (DER) de chaque (hôte, port) TLS, lu à la poignée de main
+        self._certificates: Dict[Tuple[str, int], bytes] = {}
+        # Hôtes qui ont refusé HEAD : probe() passe directement au GET
+        self._head_rejected: Set[PoolKey] = set()
+        self.stats = {"requests": 0, "connections": 0, "reused": 0,
+                      "tls_handshakes": 0, "tls_resumed": 0, "evicted": 0}
+        with _CLIENTS_LOCK:
+            _CLIENTS.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                self._discard(conn)
+
+    def evict_idle(self) -> int:
+        """Ferme les connexions inactives (et rend leurs permis) ; retourne leur nombre."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+            count = sum(len(conns) for conns in idle.values())
+            self.stats["evicted"] += count
+        for conns in idle.values():
+            for conn in conns:
+                self._discard(conn)
+        return count
+
+    def peer_certificate(self, host: str, port: int) -> Optional[bytes]:
+        """Certificat DER présenté par host:port lors d'une connexion déjà faite."""
+        with self._lock:
+            return self._certificates.get((host, port))
+
+    def get(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> HttpResponse:
+        return self.request("HEAD", url, **kwargs)
+
+    def probe(self, url: str, body_prefix: int = 512, head: bool = True, **kwargs) -> HttpResponse:
+        """
+        Sonde d'existence : HEAD d'abord (aucun corps transféré), puis GET limité
+        par Range aux `body_prefix` premiers octets si le serveur refuse HEAD ou
+        si head=False (contenu nécessaire). Une réponse 206 est rapportée comme
+        200 avec la taille totale de la ressource dans Content-Length.
+        """
+        key = self._pool_key(url)
+        if head and key not in self._head_rejected:
+            response = self.head(url, **kwargs)
+            if response.status not in HEAD_REJECTED_CODES:
+                return response
+            with self._lock:
+                self._head_rejected.add(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers["Range"] = f"bytes=0-{max(1, body_prefix) - 1}"
+        response = self.get(url, headers=headers, keep_body=False, body_prefix=body_prefix, **kwargs)
+        if response.status == 416:
+            # Plage refusée : ressource vide, mais présente
+            response.status = 200
+        elif response.status == 206:
+            response.status = 200
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            if total.isdigit():
+                del response.headers["Content-Length"]
+                response.headers["Content-Length"] = total
+        return response
+
+    def request(self, method: str, url: str, headers: Dict[str, str] = None,
+                timeout: float = None, max_body: int = None,
+                follow_redirects: bool = True, stage: str = None,
+                keep_body: bool = True, markers: Iterable[str] = None,
+                marker_groups: Iterable[Iterable[str]] = None, body_prefix: int = 0) -> HttpResponse:
+        """
+        Envoie une requête et lit au plus `max_body` octets du corps, par morceaux.
+        keep_body=False : le corps est lu puis jeté (seuls statut / en-têtes servent).
+        markers : motifs cherchés en continu dans le corps ; la lecture s'arrête au
+        premier trouvé (ou quand chaque groupe de marker_groups a le sien) et
+        response.matches contient les motifs vus.
+        body_prefix : avec keep_body=False, octets de début de corps conservés.
+        Les redirections sont suivies comme urlopen() ; les codes 4xx/5xx sont
+        retournés (pas d'exception). Lève OSError / http.client.HTTPException
+        si le serveur est injoignable.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            matcher = StreamMatcher(markers, marker_groups) if markers else None
+            response = self._request_once(method, url, headers, timeout, max_body, stage or self.stage,
+                                          keep_body, matcher, body_prefix)
+            location = response.headers.get("Location")
+            if not (follow_redirects and response.status in REDIRECT_CODES and location):
+                return response
+            url = urllib.parse.urljoin(url, location)
+            if response.status == 303:
+                method = "GET"
+        return response
+
+    def _request_once(self, method: str, url: str, headers: Optional[Dict[str, str]],
+                      timeout: Optional[float], max_body: Optional[int], stage: str,
+                      keep_body: bool = True, matcher: StreamMatcher = None,
+                      body_prefix: int = 0) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        key = self._pool_key(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        send_headers = {"User-Agent": USER_AGENT}
+        send_headers.update(headers or {})
+        timeout = self.timeout if timeout is None else timeout
+        max_body = self.max_body if max_body is None else max_body
+
+        conn, reused = self._checkout(key, timeout, stage)
+        try:
+            response = self._exchange(conn, method, path, send_headers)
+        except (OSError, http.client.HTTPException):
+            self._discard(conn)
+            if not reused:
+                raise
+            # Connexion keep-alive fermée par le serveur entre deux requêtes
+            conn, reused = self._connect(key, timeout, stage), False
+            try:
+                response = self._exchange(conn, method, path, send_headers)
+            except (OSError, http.client.HTTPException):
+                self._discard(conn)
+                raise
+
+        try:
+            body = read_body(response, max_body, keep_body, matcher, body_prefix)
+            truncated = not response.isclosed()
+        except (OSError, http.client.HTTPException):
+            self._discard(conn)
+            raise
+
+        self._remember_session(key, conn)
+        with self._lock:
+            self.stats["requests"] += 1
+        if truncated or response.will_close:
+            # Reste du corps non lu : la connexion n'est pas réutilisable
+            self._discard(conn)
+        else:
+            self._checkin(key, conn)
+
+        return HttpResponse(url, response.status, response.reason, response.headers, body, truncated,
+                            matcher.found if matcher is not None else None)
+
+    @staticmethod
+    def _pool_key(url: str) -> PoolKey:
+        parts = urllib.parse.urlsplit(url)
+        use_tls = parts.scheme == "https"
+        return (parts.hostname or "", parts.port or (443 if use_tls else 80), use_tls)
+
+    @staticmethod
+    def _exchange(conn, method: str, path: str, headers: Dict[str, str]) -> http.client.HTTPResponse:
+        conn.request(method, path, headers=headers)
+        return conn.getresponse()
+
+    def _checkout(self, key: PoolKey, timeout: float, stage: str):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._connect(key, timeout, stage), False
+        conn.sock.settimeout(timeout)
+        with self._lock:
+            self.stats["reused"] += 1
+        return conn, True
+
+    def _connect(self, key: PoolKey, timeout: float, stage: str) -> http.client.HTTPConnection:
+        host, port, use_tls = key
+        connect_timeout = timeout if self.connect_timeout is None else min(self.connect_timeout, timeout)
+        if use_tls:
+            with self._lock:
+                session = self._sessions.get(key)
+            conn = _PooledHTTPSConnection(host, port, timeout=timeout, context=self.ssl_context,
+                                          tls_session=session, connect_timeout=connect_timeout)
+        else:
+            conn = _PooledHTTPConnection(host, port, timeout=timeout, connect_timeout=connect_timeout)
+        conn.permit = self._acquire_permit(stage)
+        try:
+            conn.connect()
+        except BaseException:
+            self._discard(conn)
+            raise
+        certificate = conn.sock.getpeercert(binary_form=True) if use_tls else None
+        with self._lock:
+            self.stats["connections"] += 1
+            if certificate:
+                self._certificates[(host, port)] = certificate
+            if use_tls:
+                if conn.sock.session_reused:
+                    self.stats["tls_resumed"] += 1
+                else:
+                    self.stats["tls_handshakes"] += 1
+        return conn
+
+    def _remember_session(self, key: PoolKey, conn: http.client.HTTPConnection):
+        # Ticket TLS 1.3 reçu après la poignée de main : le garder pour la suite
+        if key[2] and isinstance(conn.sock, ssl.SSLSocket) and conn.sock.session is not None:
+            with self._lock:
+                self._sessions[key] = conn.sock.session
+
+    def _checkin(self, key: PoolKey, conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        self._discard(conn)
+
+    @staticmethod
+    def _acquire_permit(stage: str):
+        """Permis du gouverneur pour toute la vie d'une connexion ; (gouverneur, étage) ou None.
+        Sans permis libre, les connexions inactives de tous les clients sont fermées
+        (elles ne doivent pas bloquer une requête en attente)."""
+        governor = get_governor()
+        if governor is None:
+            return None
+        if not governor.try_acquire(stage):
+            evict_idle_connections()
+            while not governor.acquire(stage, timeout=PERMIT_WAIT):
+                evict_idle_connections()
+        return (governor, stage)
+
+    @staticmethod
+    def _discard(conn: http.client.HTTPConnection):
+        """Ferme une connexion et rend son permis (une seule fois)."""
+        conn.close()
+        permit = getattr(conn, "permit", None)
+        if permit is not None:
+            conn.permit = None
+            permit[0].release(permit[1])
+
+def evict_idle_connections() -> int:
+    """Ferme les connexions inactives de tous les clients vivants ; retourne leur nombre."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS)
+    return sum(client.evict_idle() for client in clients)
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 http_client.py <url> [n]")
+        sys.exit(1)
+
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    started = time.monotonic()
+    with HttpClient() as client:
+        for _ in range(count):
+            try:
+                response = client.get(sys.argv[1])
+                status = response.status
+            except (OSError, http.client.HTTPException) as e:
+                status = f"erreur: {e}"
+        print(f"🌐 {count} requête(s) en {time.monotonic() - started:.2f}s → {status}")
+        print(f"   {client.stats}")
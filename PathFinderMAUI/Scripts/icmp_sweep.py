@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+ICMP Sweep Module - Découverte d'hôtes par echo ICMP depuis un seul socket
+Remplace un fork de /bin/ping par IP : socket ICMP datagramme non privilégié
+(Linux ping_group_range, macOS) avec repli sur un socket raw (root).
+"""
+
+import os
+import selectors
+import socket
+import struct
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+# Valeur Linux de IP_RECVTTL (absente du module socket sur certaines versions)
+IP_RECVTTL = getattr(socket, "IP_RECVTTL", 12)
+
+# TTL retourné quand le système ne fournit pas le TTL de la réponse (comme ping())
+DEFAULT_TTL = 64
+
+def icmp_checksum(data: bytes) -> int:
+    """Checksum Internet (RFC 1071) d'un message ICMP."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def build_echo_request(ident: int, seq: int, payload: bytes = b"PathFinder") -> bytes:
+    """Construit un paquet ICMP echo request avec son checksum."""
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+class IcmpSweeper:
+    def __init__(self, timeout: float = 1.0, batch_size: int = 256,
+                 batch_interval: float = 0.005, retries: int = 1, on_rtt=None):
+        """
+        Moteur de sweep ICMP.
+
+        Args:
+            timeout: Attente des réponses après le dernier envoi d'un tour
+            batch_size: Nombre d'echo requests envoyés par lot
+            batch_interval: Pause (lecture des réponses) entre deux lots
+            retries: Nombre de tours supplémentaires pour les hôtes muets
+            on_rtt: Rappel on_rtt(ip, rtt) pour chaque réponse (estimation RTT)
+        """
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = batch_interval
+        self.retries = max(0, retries)
+        self.on_rtt = on_rtt
+        self.sock = None
+        self.mode = ""
+        self._selector = None
+        self.ident = os.getpid() & 0xFFFF
+        self._seq = 0
+        self._cmsg_size = socket.CMSG_SPACE(4) if hasattr(socket, "CMSG_SPACE") else 0
+
+    def open(self) -> bool:
+        """Ouvre un socket ICMP datagramme, sinon raw. Retourne False sans droits."""
+        for kind, mode in ((socket.SOCK_DGRAM, "dgram"), (socket.SOCK_RAW, "raw")):
+            try:
+                sock = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+            except OSError:
+                continue
+            sock.setblocking(False)
+            try:
+                sock.setsockopt(socket.IPPROTO_IP, IP_RECVTTL, 1)
+            except OSError:
+                pass
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            except OSError:
+                pass
+            self.sock = sock
+            self.mode = mode
+            # selectors plutôt que select() : le numéro de fd peut dépasser
+            # FD_SETSIZE quand le reste du scan utilise des milliers de sockets
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(sock, selectors.EVENT_READ)
+            return True
+        return False
+
+    def close(self):
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def __enter__(self):
+        if self.sock is None and not self.open():
+            raise OSError("Aucun socket ICMP disponible (droits insuffisants)")
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def sweep(self, ips: Iterable[str]) -> Dict[str, Tuple[bool, int]]:
+        """Envoie un echo à chaque IP et retourne {ip: (alive, ttl)}."""
+        targets = list(dict.fromkeys(ips))
+        results = {ip: (False, 0) for ip in targets}
+        pending = targets
+
+        for _ in range(self.retries + 1):
+            if not pending:
+                break
+            self._sweep_round(pending, results)
+            pending = [ip for ip in pending if not results[ip][0]]
+
+        return results
+
+    def _next_seq(self) -> int:
+        self._seq = (self._seq + 1) & 0xFFFF
+        return self._seq
+
+    def _sweep_round(self, targets: List[str], results: Dict[str, Tuple[bool, int]]):
+        # ip -> (seq, instant d'envoi) : une réponse n'est acceptée que si
+        # l'adresse source ET le numéro de séquence correspondent
+        in_flight: Dict[str, Tuple[int, float]] = {}
+
+        for start in range(0, len(targets), self.batch_size):
+            for ip in targets[start:start + self.batch_size]:
+                seq = self._next_seq()
+                packet = build_echo_request(self.ident, seq)
+                if self._send(packet, ip):
+                    in_flight[ip] = (seq, time.monotonic())
+            self._drain(in_flight, results, self.batch_interval)
+
+        deadline = time.monotonic() + self.timeout
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._drain(in_flight, results, remaining)
+
+    def _send(self, packet: bytes, ip: str) -> bool:
+        try:
+            self.sock.sendto(packet, (ip, 0))
+            return True
+        except BlockingIOError:
+            # Buffer d'envoi plein : attendre qu'il se vide puis réessayer une fois
+            self._selector.modify(self.sock, selectors.EVENT_WRITE)
+            self._selector.select(self.timeout)
+            self._selector.modify(self.sock, selectors.EVENT_READ)
+            try:
+                self.sock.sendto(packet, (ip, 0))
+                return True
+            except OSError:
+                return False
+        except OSError:
+            # Broadcast refusé, réseau injoignable, etc.
+            return False
+
+    def _drain(self, in_flight: Dict[str, Tuple[int, float]],
+               results: Dict[str, Tuple[bool, int]], wait: float):
+        """Lit les réponses disponibles pendant au plus `wait` secondes."""
+        end = time.monotonic() + wait
+        while in_flight:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            if not self._selector.select(remaining):
+                return
+            while True:
+                try:
+                    if self._cmsg_size:
+                        data, ancdata, _flags, addr = self.sock.recvmsg(2048, self._cmsg_size)
+                    else:
+                        data, addr = self.sock.recvfrom(2048)
+                        ancdata = []
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    break
+
+                reply = self._parse_reply(data, ancdata)
+                if reply is None:
+                    continue
+                ident, seq, ttl = reply
+                # Le noyau réécrit l'identifiant des sockets datagramme
+                if self.mode == "raw" and ident != self.ident:
+                    continue
+                expected = in_flight.get(addr[0])
+                if expected is None or expected[0] != seq:
+                    continue
+                del in_flight[addr[0]]
+                results[addr[0]] = (True, ttl or DEFAULT_TTL)
+                if self.on_rtt is not None:
+                    self.on_rtt(addr[0], time.monotonic() - expected[1])
+
+    @staticmethod
+    def _parse_reply(data: bytes, ancdata) -> Optional[Tuple[int, int, int]]:
+        """Décode une réponse et retourne (ident, seq, ttl) ou None."""
+        ttl = 0
+        for level, ctype, cdata in ancdata:
+            if level == socket.IPPROTO_IP and ctype == socket.IP_TTL and len(cdata) >= 4:
+                ttl = struct.unpack("i", cdata[:4])[0]
+
+        # En-tête IP présent (socket raw, ou datagramme sous macOS)
+        if data and data[0] >> 4 == 4:
+            ihl = (data[0] & 0x0F) * 4
+            if len(data) < ihl + 8:
+                return None
+            ttl = data[8]
+            data = data[ihl:]
+
+        if len(data) < 8:
+            return None
+        icmp_type, _code, _checksum, ident, seq = struct.unpack("!BBHHH", data[:8])
+        if icmp_type != ICMP_ECHO_REPLY:
+            return None
+        return ident, seq, ttl
+
+def icmp_sweep(ips: Iterable[str], timeout: float = 1.0, batch_size: int = 256,
+               retries: int = 1, on_rtt=None) -> Optional[Dict[str, Tuple[bool, int]]]:
+    """
+    Sweep ICMP de toutes les IPs en un seul socket.
+
+    Returns:
+        {ip: (alive, ttl)} comme ping(), ou None si aucun socket ICMP
+        n'est utilisable (l'appelant retombe alors sur ping()).
+    """
+    sweeper = IcmpSweeper(timeout=timeout, batch_size=batch_size, retries=retries, on_rtt=on_rtt)
+    if not sweeper.open():
+        return None
+    try:
+        return sweeper.sweep(ips)
+    finally:
+        sweeper.close()
+
+if __name__ == "__main__":
+    # Test du module
+    import ipaddress
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 icmp_sweep.py <cidr>")
+        sys.exit(1)
+
+    hosts = [str(ip) for ip in ipaddress.ip_network(sys.argv[1], strict=False).hosts()]
+    started = time.monotonic()
+    results = icmp_sweep(hosts)
+    elapsed = time.monotonic() - started
+
+    if results is None:
+        print("❌ Aucun socket ICMP disponible (vérifier net.ipv4.ping_group_range)")
+        sys.exit(1)
+
+    alive = {ip: ttl for ip, (up, ttl) in results.items() if up}
+    print(f"📡 {len(alive)}/{len(hosts)} hôtes actifs en {elapsed:.2f}s")
+    for ip, ttl in alive.items():
+        print(f"  {ip} (TTL: {ttl})")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Identity Cache Module - Noms et identités d'appareils gardés d'un scan à l'autre
+Fichier ~/.pathfinder/identities.json (à côté de l'historique), indexé par
+IP + MAC : nom d'hôte, type d'appareil et OS supposé, chacun avec sa source et
+sa date. Chaque source a sa durée de validité ; un échec de résolution est
+aussi mémorisé (cache négatif) pour ne pas redemander à chaque scan.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+FIELDS = ("hostname", "device_type", "os")
+
+# Durée de validité (secondes) d'une valeur selon sa source
+SOURCE_TTLS = {
+    "dns": 24 * 3600,
+    "tools": 24 * 3600,
+    "netbios": 12 * 3600,
+    "mdns": 6 * 3600,
+    "ssdp": 6 * 3600,
+    "scan": 24 * 3600,
+}
+DEFAULT_TTL = 6 * 3600
+# Validité d'un échec de résolution (valeur vide)
+NEGATIVE_TTL = 3600
+# Intervalle minimal entre deux collectes multicast (mDNS / NetBIOS / SSDP)
+HARVEST_TTL = 6 * 3600
+# Entrées plus anciennes supprimées à l'enregistrement
+MAX_AGE = 30 * 24 * 3600
+
+def default_cache_path() -> Path:
+    return Path.home() / ".pathfinder" / "identities.json"
+
+def _normalize_mac(mac: str) -> str:
+    return (mac or "").lower().replace("-", ":")
+
+class IdentityCache:
+    def __init__(self, path: str = None):
+        """Cache vide ; load() le remplit depuis le disque."""
+        self.path = Path(path) if path else default_cache_path()
+        self._lock = threading.Lock()
+        # ip -> mac ('' si inconnue) -> champ -> {"value", "source", "at"}
+        self._entries: Dict[str, Dict[str, Dict[str, Dict]]] = {}
+        self._last_harvest = 0.0
+        self._dirty = False
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "updates": 0}
+
+    # ---- disque ----
+
+    def load(self) -> bool:
+        """Lit le fichier (une fois, au démarrage) ; False s'il est absent ou illisible."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        with self._lock:
+            self._entries = data.get("entries", {})
+            self._last_harvest = float(data.get("last_harvest", 0.0))
+            self._dirty = False
+        return True
+
+    def save(self, now: float = None) -> bool:
+        """Écrit le fichier (remplacement atomique) si quelque chose a changé."""
+        now = now or time.time()
+        with self._lock:
+            if not self._dirty:
+                return True
+            self._purge(now)
+            data = {"last_harvest": self._last_harvest, "entries": self._entries}
+            payload = json.dumps(data, indent=1, ensure_ascii=False)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            return False
+        return True
+
+    def _purge(self, now: float):
+        for ip in list(self._entries):
+            devices = self._entries[ip]
+            for mac in list(devices):
+                fields = devices[mac]
+                for field in list(fields):
+                    if now - fields[field].get("at", 0) > MAX_AGE:
+                        del fields[field]
+                if not fields:
+                    del devices[mac]
+            if not devices:
+                del self._entries[ip]
+
+    # ---- lecture ----
+
+    def _device(self, ip: str, mac: str) -> Optional[Dict[str, Dict]]:
+        devices = self._entries.get(ip)
+        if not devices:
+            return None
+        if mac:
+            # Autre MAC sur cette IP : autre appareil, rien de réutilisable
+            return devices.get(mac) or devices.get("")
+        if "" in devices:
+            return devices[""]
+        # MAC inconnue à ce stade (hôte routé, ARP pas encore rempli) : seulement si non ambigu
+        return next(iter(devices.values())) if len(devices) == 1 else None
+
+    def get(self, ip: str, field: str, mac: str = "", now: float = None) -> Optional[Tuple[str, str]]:
+        """(valeur, source) encore valide ; valeur "" = échec mémorisé ; None = à résoudre."""
+        now = now or time.time()
+        with self._lock:
+            device = self._device(ip, _normalize_mac(mac))
+            item = device.get(field) if device else None
+            if item is None or now - item.get("at", 0) > self._ttl(item):
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits" if item["value"] else "negative_hits"] += 1
+            return item["value"], item["source"]
+
+    def is_fresh(self, ip: str, field: str = "hostname", mac: str = "", now: float = None) -> bool:
+        """Vrai si le champ est connu (ou connu introuvable) et encore valide, sans compter de stats."""
+        now = now or time.time()
+        with self._lock:
+            device = self._device(ip, _normalize_mac(mac))
+            item = device.get(field) if device else None
+            return item is not None and now - item.get("at", 0) <= self._ttl(item)
+
+    @staticmethod
+    def _ttl(item: Dict) -> float:
+        if not item.get("value"):
+            return NEGATIVE_TTL
+        return SOURCE_TTLS.get(item.get("source"), DEFAULT_TTL)
+
+    # ---- écriture ----
+
+    def record(self, ip: str, field: str, value: str, source: str, mac: str = "",
+               now: float = None, refresh: bool = True):
+        """Mémorise une valeur ("" = introuvable) et sa source.
+        refresh=False : ne rajeunit pas une valeur identique déjà présente (valeur
+        lue dans le cache, pas re-résolue)."""
+        now = now or time.time()
+        mac = _normalize_mac(mac)
+        with self._lock:
+            devices = self._entries.setdefault(ip, {})
+            if mac and "" in devices:
+                # Appareil enfin identifié par sa MAC : reprendre ce qui était connu sans elle
+                anonymous = devices.pop("")
+                devices.setdefault(mac, {}).update(
+                    {key: item for key, item in anonymous.items() if key not in devices[mac]})
+            fields = devices.setdefault(mac, {})
+            previous = fields.get(field)
+            if previous is not None and previous["value"] == value and previous["source"] == source and not refresh:
+                return
+            fields[field] = {"value": value, "source": source, "at": now}
+            self.stats["updates"] += 1
+            self._dirty = True
+
+    def record_many(self, ip: str, values: Dict[str, Tuple[str, str]], mac: str = "", **kwargs):
+        """values : {champ: (valeur, source)}."""
+        for field, (value, source) in values.items():
+            self.record(ip, field, value, source, mac=mac, **kwargs)
+
+    # ---- collecte multicast ----
+
+    def harvest_due(self, now: float = None) -> bool:
+        now = now or time.time()
+        with self._lock:
+            return now - self._last_harvest > HARVEST_TTL
+
+    def mark_harvest(self, now: float = None):
+        with self._lock:
+            self._last_harvest = now or time.time()
+            self._dirty = True
+
+    def stale(self, ips: Iterable[str], field: str = "hostname") -> list:
+        """IPs dont le champ est à résoudre (absent ou expiré)."""
+        now = time.time()
+        return [ip for ip in ips if not self.is_fresh(ip, field, now=now)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(devices) for devices in self._entries.values())
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    cache = IdentityCache(sys.argv[1] if len(sys.argv) > 1 else None)
+    if not cache.load():
+        print(f"🗂️  Aucun cache lisible: {cache.path}")
+        sys.exit(0)
+    print(f"🗂️  {len(cache)} appareil(s) dans {cache.path}"
+          f"{' (collecte multicast due)' if cache.harvest_due() else ''}")
+    now = time.time()
+    for ip, devices in sorted(cache._entries.items()):
+        for mac, fields in devices.items():
+            parts = []
+            for field in FIELDS:
+                item = fields.get(field)
+                if item:
+                    age = int((now - item["at"]) / 60)
+                    parts.append(f"{field}={item['value'] or '∅'} ({item['source']}, {age} min)")
+            print(f"  {ip:<16} {mac or '-':<18} {'; '.join(parts)}")
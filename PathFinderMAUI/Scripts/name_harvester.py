@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Name Harvester Module - Noms et types d'appareils par multicast, en une passe
+Une requête mDNS (PTR inverses + énumération des services), des requêtes
+NetBIOS node-status et un M-SEARCH SSDP partent ensemble ; les réponses de tout
+le segment sont écoutées pendant une fenêtre bornée et donnent une table
+IP -> nom / type d'appareil, au lieu d'avahi-resolve / dns-sd hôte par hôte.
+"""
+
+import ipaddress
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dns_resolver import read_name
+
+MDNS_ADDR = ("224.0.0.251", 5353)
+SSDP_ADDR = ("239.255.255.250", 1900)
+NETBIOS_PORT = 137
+NETBIOS_BROADCAST = "255.255.255.255"
+
+TYPE_A = 1
+TYPE_PTR = 12
+TYPE_TXT = 16
+TYPE_SRV = 33
+# Bit "réponse unicast demandée" (QU) de la classe d'une question mDNS
+CLASS_IN_QU = 0x8001
+TYPE_NBSTAT = 0x21
+
+SERVICES_QUERY = "_services._dns-sd._udp.local"
+# Questions par paquet mDNS (paquet < 1500 octets)
+MDNS_QUESTIONS_PER_PACKET = 32
+# Au-delà, pas de PTR inverse mDNS ni de NetBIOS unicast (grandes plages)
+MAX_UNICAST_TARGETS = 4096
+
+# Services mDNS recherchés d'emblée (en plus de ceux annoncés par _services)
+COMMON_SERVICES = (
+    "_device-info._tcp.local", "_workstation._tcp.local", "_http._tcp.local",
+    "_ipp._tcp.local", "_printer._tcp.local", "_airplay._tcp.local", "_raop._tcp.local",
+    "_googlecast._tcp.local", "_hap._tcp.local", "_smb._tcp.local", "_companion-link._tcp.local",
+    "_spotify-connect._tcp.local", "_sonos._tcp.local",
+)
+
+# Type de service mDNS -> type d'appareil, par ordre de précision : parmi les services
+# annoncés par un appareil, le premier de cette liste l'emporte (ordre de réception ignoré)
+SERVICE_DEVICE_TYPES = (
+    ("_ipp._tcp", "Imprimante Réseau"),
+    ("_ipps._tcp", "Imprimante Réseau"),
+    ("_printer._tcp", "Imprimante Réseau"),
+    ("_pdl-datastream._tcp", "Imprimante Réseau"),
+    ("_googlecast._tcp", "Android (Chromecast)"),
+    ("_airplay._tcp", "Apple TV / AirPlay"),
+    ("_raop._tcp", "Enceinte AirPlay"),
+    ("_sonos._tcp", "Enceinte Sonos"),
+    ("_spotify-connect._tcp", "Enceinte connectée"),
+    ("_hap._tcp", "Accessoire HomeKit"),
+    ("_companion-link._tcp", "iPhone/iPad/Mac"),
+    ("_smb._tcp", "Partage SMB"),
+    ("_workstation._tcp", "Poste de travail"),
+)
+
+# Type de périphérique UPnP (ST/NT SSDP) -> type d'appareil
+SSDP_DEVICE_TYPES = (
+    ("internetgatewaydevice", "Routeur"),
+    ("wanconnectiondevice", "Routeur"),
+    ("mediarenderer", "Lecteur multimédia"),
+    ("mediaserver", "Serveur multimédia / NAS"),
+    ("printer", "Imprimante Réseau"),
+    ("digitalsecuritycamera", "Caméra IP"),
+    ("dial-multiscreen", "Smart TV"),
+)
+
+def _encode_name(name: str) -> bytes:
+    return b"".join(bytes([len(label)]) + label.encode("utf-8") for label in name.split(".") if label) + b"\x00"
+
+def build_mdns_query(names: Iterable[Tuple[str, int]]) -> bytes:
+    """Requête mDNS multi-questions [(nom, type)], réponses unicast demandées."""
+    names = list(names)
+    header = struct.pack("!HHHHHH", 0, 0, len(names), 0, 0, 0)
+    return header + b"".join(_encode_name(name) + struct.pack("!HH", qtype, CLASS_IN_QU)
+                             for name, qtype in names)
+
+def build_nbstat_query(transaction_id: int) -> bytes:
+    """Requête NetBIOS node status pour le nom joker "*"."""
+    header = struct.pack("!HHHHHH", transaction_id, 0, 1, 0, 0, 0)
+    # "*" complété par des zéros, encodage "first-level" (deux lettres par octet)
+    raw = b"*" + b"\x00" * 15
+    encoded = bytes(c for byte in raw for c in (0x41 + (byte >> 4), 0x41 + (byte & 0x0F)))
+    return header + b"\x20" + encoded + b"\x00" + struct.pack("!HH", TYPE_NBSTAT, 1)
+
+def build_msearch(wait: int = 1) -> bytes:
+    return ("M-SEARCH * HTTP/1.1\r\n"
+            f"HOST: {SSDP_ADDR[0]}:{SSDP_ADDR[1]}\r\n"
+            'MAN: "ssdp:discover"\r\n'
+            f"MX: {wait}\r\n"
+            "ST: ssdp:all\r\n\r\n").encode("ascii")
+
+def parse_dns_records(data: bytes) -> List[Tuple[str, int, object]]:
+    """Enregistrements (réponses + additionnels) d'un message DNS/mDNS :
+    [(nom, type, valeur)] avec valeur = IP (A), nom (PTR/SRV) ou [chaînes] (TXT)."""
+    if len(data) < 12:
+        raise ValueError("Message DNS trop court")
+    qdcount, ancount, nscount, arcount = struct.unpack("!HHHH", data[4:12])
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = read_name(data, offset)
+        offset += 4
+    records = []
+    for _ in range(ancount + nscount + arcount):
+        name, offset = read_name(data, offset)
+        if offset + 10 > len(data):
+            raise ValueError("Enregistrement DNS tronqué")
+        rtype, _, _, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        rdata = data[offset:offset + rdlength]
+        if rtype == TYPE_A and rdlength == 4:
+            records.append((name, rtype, socket.inet_ntoa(rdata)))
+        elif rtype == TYPE_PTR:
+            records.append((name, rtype, read_name(data, offset)[0]))
+        elif rtype == TYPE_SRV and rdlength > 6:
+            records.append((name, rtype, read_name(data, offset + 6)[0]))
+        elif rtype == TYPE_TXT:
+            strings, pos = [], 0
+            while pos < len(rdata):
+                strings.append(rdata[pos + 1:pos + 1 + rdata[pos]].decode("utf-8", errors="replace"))
+                pos += 1 + rdata[pos]
+            records.append((name, rtype, strings))
+        offset += rdlength
+    return records
+
+def parse_nbstat_response(data: bytes) -> Tuple[str, str]:
+    """Réponse node status -> (nom de machine, groupe de travail)."""
+    # En-tête (12) + nom encodé (34) + type/classe/TTL (8) + longueur (2)
+    offset = 12 + 34 + 10
+    if len(data) <= offset:
+        raise ValueError("Réponse NetBIOS trop courte")
+    count = data[offset]
+    offset += 1
+    machine = workgroup = ""
+    for _ in range(count):
+        entry = data[offset:offset + 18]
+        if len(entry) < 18:
+            break
+        name = entry[:15].decode("ascii", errors="replace").strip()
+        suffix = entry[15]
+        group = bool(entry[16] & 0x80)
+        if suffix == 0x00 and not group and not machine:
+            machine = name
+        elif suffix == 0x00 and group and not workgroup:
+            workgroup = name
+        offset += 18
+    return machine, workgroup
+
+def parse_ssdp_response(data: bytes) -> Dict[str, str]:
+    """En-têtes d'une réponse / annonce SSDP (clés en minuscules)."""
+    headers = {}
+    for line in data.decode("utf-8", errors="replace").split("\r\n")[1:]:
+        key, sep, value = line.partition(":")
+        if sep:
+            headers[key.strip().lower()] = value.strip()
+    return headers
+
+def _reverse_ip(name: str) -> Optional[str]:
+    """"4.3.2.1.in-addr.arpa" -> "1.2.3.4"."""
+    labels = name.lower().split(".")
+    if labels[-2:] != ["in-addr", "arpa"] or len(labels) != 6:
+        return None
+    return ".".join(reversed(labels[:4]))
+
+class NameHarvester:
+    def __init__(self, window: float = 2.0, mdns_addr: Tuple[str, int] = MDNS_ADDR,
+                 ssdp_addr: Tuple[str, int] = SSDP_ADDR, netbios_port: int = NETBIOS_PORT,
+                 netbios_broadcast: Optional[str] = NETBIOS_BROADCAST, interface_ip: str = None):
+        """
+        Args:
+            window: Durée d'écoute des réponses après les envois
+            mdns_addr / ssdp_addr / netbios_port: Destinations (modifiables pour les tests)
+            netbios_broadcast: Adresse de diffusion NetBIOS (None = unicast seulement)
+            interface_ip: Interface des envois multicast (défaut: celle du système)
+        """
+        self.window = window
+        self.mdns_addr = mdns_addr
+        self.ssdp_addr = ssdp_addr
+        self.netbios_port = netbios_port
+        self.netbios_broadcast = netbios_broadcast
+        self.interface_ip = interface_ip
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._done = threading.Event()
+        self._thread = None
+        self._queried_services = set()
+        self.stats = {"mdns": 0, "netbios": 0, "ssdp": 0, "hosts": 0}
+
+    # ---- résultats ----
+
+    def lookup(self, ip: str, wait: bool = True) -> Dict:
+        """{"name", "device_type", "sources", "services"...} pour ip ({} si rien)."""
+        if wait and self._thread is not None:
+            self._done.wait(self.window + 1.0)
+        with self._lock:
+            return dict(self._entries.get(ip, {}))
+
+    def results(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {ip: dict(entry) for ip, entry in self._entries.items()}
+
+    # ---- exécution ----
+
+    def start(self, targets: Iterable[str] = ()):
+        """Lance la collecte en arrière-plan ; lookup() attend la fin de la fenêtre."""
+        targets = list(targets)
+        self._thread = threading.Thread(target=self.harvest, args=(targets,), daemon=True)
+        self._thread.start()
+
+    def harvest(self, targets: Iterable[str] = ()) -> Dict[str, Dict]:
+        """Envoie toutes les requêtes puis écoute pendant `window` secondes."""
+        targets = [ip for ip in targets][:MAX_UNICAST_TARGETS + 1]
+        unicast = targets if len(targets) <= MAX_UNICAST_TARGETS else []
+        selector = selectors.DefaultSelector()
+        sockets = {}
+        try:
+            for kind in ("mdns", "netbios", "ssdp"):
+                try:
+                    sock = self._open_socket(kind)
+                except OSError:
+                    continue
+                sockets[kind] = sock
+                selector.register(sock, selectors.EVENT_READ, kind)
+
+            if "mdns" in sockets:
+                questions = [(SERVICES_QUERY, TYPE_PTR)] + [(service, TYPE_PTR) for service in COMMON_SERVICES]
+                questions += [(ipaddress.ip_address(ip).reverse_pointer, TYPE_PTR) for ip in unicast]
+                self._queried_services.update(COMMON_SERVICES)
+                self._send_mdns(sockets["mdns"], questions)
+            if "netbios" in sockets:
+                if self.netbios_broadcast:
+                    self._send(sockets["netbios"], build_nbstat_query(0xFFFF),
+                               (self.netbios_broadcast, self.netbios_port))
+                for index, ip in enumerate(unicast):
+                    self._send(sockets["netbios"], build_nbstat_query(index & 0xFFFF), (ip, self.netbios_port))
+            if "ssdp" in sockets:
+                self._send(sockets["ssdp"], build_msearch(max(1, int(self.window) - 1)), self.ssdp_addr)
+
+            deadline = time.monotonic() + self.window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    self._receive(key.fileobj, key.data)
+        finally:
+            selector.close()
+            for sock in sockets.values():
+                sock.close()
+            self._done.set()
+        return self.results()
+
+    def _open_socket(self, kind: str) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        if kind == "netbios":
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        else:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
+            if self.interface_ip:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                                socket.inet_aton(self.interface_ip))
+        sock.bind(("", 0))
+        return sock
+
+    @staticmethod
+    def _send(sock: socket.socket, packet: bytes, addr: Tuple[str, int]):
+        try:
+            sock.sendto(packet, addr)
+        except OSError:
+            # Réseau injoignable / tampon plein : la source est simplement ignorée
+            pass
+
+    def _send_mdns(self, sock: socket.socket, questions: List[Tuple[str, int]]):
+        for start in range(0, len(questions), MDNS_QUESTIONS_PER_PACKET):
+            self._send(sock, build_mdns_query(questions[start:start + MDNS_QUESTIONS_PER_PACKET]),
+                       self.mdns_addr)
+
+    def _receive(self, sock: socket.socket, kind: str):
+        while True:
+            try:
+                data, addr = sock.recvfrom(9000)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            try:
+                if kind == "mdns":
+                    self._handle_mdns(sock, data, addr[0])
+                elif kind == "netbios":
+                    self._handle_netbios(data, addr[0])
+                else:
+                    self._handle_ssdp(data, addr[0])
+            except (ValueError, IndexError, struct.error):
+                continue
+
+    def _entry(self, ip: str) -> Dict:
+        entry = self._entries.get(ip)
+        if entry is None:
+            entry = self._entries[ip] = {"name": "", "device_type": "", "sources": [], "services": []}
+        return entry
+
+    def _note(self, ip: str, source: str, name: str = "", device_type: str = "",
+              service: str = "", **extra):
+        with self._lock:
+            entry = self._entry(ip)
+            self.stats["hosts"] = len(self._entries)
+            if source not in entry["sources"]:
+                entry["sources"].append(source)
+            if name and not entry["name"]:
+                entry["name"] = name
+                entry["name_source"] = source
+            if service and service not in entry["services"]:
+                entry["services"].append(service)
+                # Type le plus précis parmi tous les services annoncés (un type SSDP déjà
+                # noté reste en place)
+                ranked = _device_type(entry["services"])
+                if ranked and (not entry["device_type"] or entry.get("device_type_source") == "mdns"):
+                    entry["device_type"] = ranked
+                    entry["device_type_source"] = "mdns"
+            elif device_type and not entry["device_type"]:
+                entry["device_type"] = device_type
+                entry["device_type_source"] = source
+            for key, value in extra.items():
+                entry.setdefault(key, value)
+
+    def _handle_mdns(self, sock: socket.socket, data: bytes, sender: str):
+        records = parse_dns_records(data)
+        with self._lock:
+            self.stats["mdns"] += 1
+        new_services = []
+        for name, rtype, value in records:
+            lowered = name.lower()
+            if rtype == TYPE_A:
+                self._note(value, "mdns", name=_strip_local(name))
+            elif rtype == TYPE_PTR and lowered.endswith(".in-addr.arpa"):
+                ip = _reverse_ip(lowered)
+                if ip:
+                    self._note(ip, "mdns", name=_strip_local(value))
+            elif rtype == TYPE_PTR and lowered == SERVICES_QUERY:
+                if value.lower() not in self._queried_services:
+                    self._queried_services.add(value.lower())
+                    new_services.append((value, TYPE_PTR))
+            elif rtype == TYPE_PTR:
+                service = _service_type(lowered)
+                instance = value[:-len(name) - 1] if value.lower().endswith("." + lowered) else ""
+                self._note(sender, "mdns", service=service, instance=instance)
+            elif rtype == TYPE_SRV:
+                self._note(sender, "mdns", name=_strip_local(value))
+            elif rtype == TYPE_TXT and "_device-info." in lowered:
+                model = next((item[6:] for item in value if item.lower().startswith("model=")), "")
+                if model:
+                    self._note(sender, "mdns", model=model)
+        if new_services:
+            # Types annoncés par _services : les interroger dans la même fenêtre
+            self._send_mdns(sock, new_services)
+
+    def _handle_netbios(self, data: bytes, sender: str):
+        machine, workgroup = parse_nbstat_response(data)
+        with self._lock:
+            self.stats["netbios"] += 1
+        if machine:
+            # Nom et groupe de travail seulement : Samba (NAS, Linux) et des imprimantes
+            # répondent aussi, le type d'appareil reste à la classification par empreintes
+            self._note(sender, "netbios", name=machine, workgroup=workgroup)
+
+    def _handle_ssdp(self, data: bytes, sender: str):
+        headers = parse_ssdp_response(data)
+        with self._lock:
+            self.stats["ssdp"] += 1
+        target = (headers.get("st") or headers.get("nt") or "").lower()
+        device_type = next((label for key, label in SSDP_DEVICE_TYPES if key in target), "")
+        self._note(sender, "ssdp", device_type=device_type, server=headers.get("server", ""),
+                   location=headers.get("location", ""))
+
+def _strip_local(name: str) -> str:
+    name = name.rstrip(".")
+    return name[:-6] if name.lower().endswith(".local") else name
+
+def _service_type(name: str) -> str:
+    """"_ipp._tcp.local" -> "_ipp._tcp"."""
+    return _strip_local(name)
+
+def _device_type(services: Iterable[str]) -> str:
+    """Type d'appareil du service le mieux classé dans SERVICE_DEVICE_TYPES ("" si aucun)."""
+    services = set(services)
+    return next((label for key, label in SERVICE_DEVICE_TYPES if key in services), "")
+
+def device_type_rank(label: str) -> int:
+    """Rang d'un type d'appareil mDNS dans SERVICE_DEVICE_TYPES (plus petit = plus précis)."""
+    return next((index for index, (_, known) in enumerate(SERVICE_DEVICE_TYPES) if known == label),
+                len(SERVICE_DEVICE_TYPES))
+
+def harvest_names(targets: Iterable[str] = (), window: float = 2.0, **kwargs) -> Dict[str, Dict]:
+    """Collecte en une passe bloquante ; retourne {ip: entrée}."""
+    return NameHarvester(window=window, **kwargs).harvest(targets)
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    targets = []
+    for arg in sys.argv[1:]:
+        network = ipaddress.ip_network(arg, strict=False)
+        targets.extend(str(ip) for ip in network.hosts())
+
+    started = time.monotonic()
+    harvester = NameHarvester()
+    found = harvester.harvest(targets)
+    print(f"📣 {len(found)} appareil(s) nommé(s) en {time.monotonic() - started:.2f}s {harvester.stats}")
+    for ip, entry in sorted(found.items(), key=lambda item: ipaddress.ip_address(item[0])):
+        print(f"  {ip:<16} {entry['name'] or '-':<24} {entry['device_type'] or '-':<22} "
+              f"{','.join(entry['sources'])}")
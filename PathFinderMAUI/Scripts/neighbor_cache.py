@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Neighbor Cache Module - Lecture groupée de la table ARP/voisins du système
+Sous Linux, /proc/net/arp est lu en une fois par rafraîchissement au lieu de
+lancer arping/arp par hôte. Ailleurs, un seul appel `arp` par rafraîchissement.
+"""
+
+import platform
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, Optional
+
+IS_WINDOWS = platform.system().lower().startswith("win")
+PROC_NET_ARP = "/proc/net/arp"
+
+# Flag ATF_COM : entrée résolue (les entrées incomplètes ont 0x0)
+ATF_COM = 0x2
+NULL_MAC = "00:00:00:00:00:00"
+
+def read_proc_arp(path: str = PROC_NET_ARP) -> Optional[Dict[str, str]]:
+    """Lit /proc/net/arp et retourne {ip: mac}, ou None si indisponible."""
+    try:
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    out = {}
+    for line in lines[1:]:
+        fields = line.split()
+        if len(fields) < 4:
+            continue
+        ip, flags, mac = fields[0], fields[2], fields[3].lower()
+        try:
+            if not int(flags, 16) & ATF_COM:
+                continue
+        except ValueError:
+            continue
+        if mac == NULL_MAC:
+            continue
+        out[ip] = mac
+    return out
+
+def read_arp_command() -> Dict[str, str]:
+    """Table ARP via un seul appel à la commande `arp` (Windows/macOS)."""
+    out = {}
+    try:
+        if IS_WINDOWS:
+            p = subprocess.check_output(["arp", "-a"], universal_newlines=True)
+            for line in p.splitlines():
+                m = re.search(r"(\d+\.\d+\.\d+\.\d+)\s+([0-9a-fA-F\-\:]{17})", line)
+                if m:
+                    out[m.group(1)] = m.group(2).replace("-", ":").lower()
+        else:
+            p = subprocess.check_output(["arp", "-n"], universal_newlines=True)
+            for line in p.splitlines():
+                m = re.search(r"(\d+\.\d+\.\d+\.\d+)\s+.*\s+([0-9a-fA-F:]{17})", line)
+                if m:
+                    out[m.group(1)] = m.group(2).lower()
+    except Exception:
+        pass
+    return out
+
+class NeighborCache:
+    def __init__(self, refresh_interval: float = 0.2):
+        """
+        Snapshot IP→MAC partagé entre les workers.
+
+        Args:
+            refresh_interval: Délai minimal entre deux relectures de la table
+                (les ratés simultanés de plusieurs threads sont regroupés)
+        """
+        self.refresh_interval = refresh_interval
+        self._entries: Dict[str, str] = {}
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        self.refresh_count = 0
+
+    def refresh(self, force: bool = False) -> Dict[str, str]:
+        """Relit la table système et fusionne les nouvelles entrées."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return self._entries
+            table = read_proc_arp()
+            if table is None:
+                table = read_arp_command()
+            # Fusion : une entrée expirée côté noyau reste connue pour ce scan
+            self._entries.update(table)
+            self._last_refresh = now
+            self.refresh_count += 1
+            return self._entries
+
+    def lookup(self, ip: str) -> str:
+        """Retourne la MAC connue pour l'IP ('' si absente)."""
+        mac = self._entries.get(ip)
+        if mac is None:
+            mac = self.refresh().get(ip)
+        return mac or ""
+
+    def is_present(self, ip: str) -> bool:
+        """Vrai si l'IP a une entrée résolue (l'appareil a répondu en ARP)."""
+        return bool(self.lookup(ip))
+
+    def snapshot(self, refresh: bool = False) -> Dict[str, str]:
+        """Copie du snapshot courant, éventuellement rafraîchi."""
+        if refresh:
+            self.refresh(force=True)
+        with self._lock:
+            return dict(self._entries)
+
+if __name__ == "__main__":
+    # Test du module
+    cache = NeighborCache()
+    table = cache.snapshot(refresh=True)
+    print(f"📋 {len(table)} voisin(s) dans la table")
+    for ip, mac in sorted(table.items()):
+        print(f"  {ip} → {mac}")
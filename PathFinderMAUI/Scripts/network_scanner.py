@@ -8,11 +8,14 @@ Usage:
 """
 
 import argparse
+import contextlib
+import errno
 import ipaddress
+import itertools
 import platform
 import subprocess
 import socket
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import re
 import json
 import csv
@@ -20,9 +23,12 @@ import ssl
 import datetime
 import urllib.request
 import urllib.error
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import os
 import sys
+import queue
+import threading
+import time
 
 # Import des modules additionnels
 try:
@@ -32,7 +38,7 @@ except ImportError:
     CVE_SCANNER_AVAILABLE = False
 
 try:
-    from directory_buster import directory_bust
+    from directory_buster import directory_bust, get_wordlist
     DIRECTORY_BUSTER_AVAILABLE = True
 except ImportError:
     DIRECTORY_BUSTER_AVAILABLE = False
@@ -43,9 +49,232 @@ try:
 except ImportError:
     HISTORY_AVAILABLE = False
 
+try:
+    from icmp_sweep import icmp_sweep
+    ICMP_SWEEP_AVAILABLE = True
+except ImportError:
+    ICMP_SWEEP_AVAILABLE = False
+
+try:
+    from neighbor_cache import NeighborCache
+    NEIGHBOR_CACHE_AVAILABLE = True
+except ImportError:
+    NEIGHBOR_CACHE_AVAILABLE = False
+
+try:
+    from tcp_prober import probe_tcp_liveness, TCP_PROBE_PORTS
+    TCP_PROBER_AVAILABLE = True
+except ImportError:
+    TCP_PROBER_AVAILABLE = False
+    TCP_PROBE_PORTS = [80, 443, 8080, 5353, 62078]
+
+try:
+    from rtt_estimator import RttEstimator
+    RTT_ESTIMATOR_AVAILABLE = True
+except ImportError:
+    RTT_ESTIMATOR_AVAILABLE = False
+
+try:
+    from async_portscan import AsyncPortScanner
+    ASYNC_PORTSCAN_AVAILABLE = True
+except ImportError:
+    ASYNC_PORTSCAN_AVAILABLE = False
+
+try:
+    from banner_grabber import BannerGrabber, grab_banners
+    BANNER_GRABBER_AVAILABLE = True
+except ImportError:
+    BANNER_GRABBER_AVAILABLE = False
+
+try:
+    from http_client import HttpClient, StreamMatcher, read_body
+    HTTP_CLIENT_AVAILABLE = True
+except ImportError:
+    HTTP_CLIENT_AVAILABLE = False
+
+try:
+    from web_planner import WebProbePlanner, DEFAULT_BODY_PREFIX
+    WEB_PLANNER_AVAILABLE = True
+except ImportError:
+    WEB_PLANNER_AVAILABLE = False
+
+try:
+    from tls_inspector import certificate_report, fetch_peer_certificate
+    TLS_INSPECTOR_AVAILABLE = True
+except ImportError:
+    TLS_INSPECTOR_AVAILABLE = False
+
+try:
+    from dns_resolver import PtrResolver
+    DNS_RESOLVER_AVAILABLE = True
+except ImportError:
+    DNS_RESOLVER_AVAILABLE = False
+
+try:
+    from name_harvester import NameHarvester, MAX_UNICAST_TARGETS, device_type_rank
+    NAME_HARVESTER_AVAILABLE = True
+except ImportError:
+    NAME_HARVESTER_AVAILABLE = False
+
+try:
+    from identity_cache import IdentityCache
+    IDENTITY_CACHE_AVAILABLE = True
+except ImportError:
+    IDENTITY_CACHE_AVAILABLE = False
+
+try:
+    from fingerprint_engine import FingerprintEngine
+    FINGERPRINT_ENGINE_AVAILABLE = True
+except ImportError:
+    FINGERPRINT_ENGINE_AVAILABLE = False
+
+try:
+    from tcp_info import TcpInfoStore
+    TCP_INFO_AVAILABLE = True
+except ImportError:
+    TCP_INFO_AVAILABLE = False
+
+try:
+    from oui_lookup import OUI_REGISTRY, is_random_mac
+    OUI_LOOKUP_AVAILABLE = True
+except ImportError:
+    OUI_LOOKUP_AVAILABLE = False
+
+try:
+    from risk_engine import RiskEngine, load_config as load_risk_config
+    RISK_ENGINE_AVAILABLE = True
+except ImportError:
+    RISK_ENGINE_AVAILABLE = False
+
+try:
+    from targets import TargetSet
+    TARGETS_AVAILABLE = True
+except ImportError:
+    TARGETS_AVAILABLE = False
+
+try:
+    from port_spec import PortFrequency, PortSet
+    PORT_SPEC_AVAILABLE = True
+except ImportError:
+    PORT_SPEC_AVAILABLE = False
+
+try:
+    from resource_governor import (ResourceGovernor, RESOURCE_EXHAUSTION_ERRNOS,
+                                   get_governor, install_governor, socket_permit)
+    RESOURCE_GOVERNOR_AVAILABLE = True
+except ImportError:
+    RESOURCE_GOVERNOR_AVAILABLE = False
+    RESOURCE_EXHAUSTION_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.EADDRNOTAVAIL, errno.ENOBUFS}
+
+    def get_governor():
+        return None
+
+    @contextlib.contextmanager
+    def socket_permit(stage: str, count: int = 1):
+        yield
+
 IS_WINDOWS = platform.system().lower().startswith("win")
 PING_COUNT = 1
 
+# Taille des lots tirés de la liste de cibles (découverte groupée par lot)
+DISCOVERY_CHUNK = 65536
+# Au-delà de ce nombre de cibles, les hôtes éteints ne sont plus conservés
+MAX_DOWN_RECORDS = 65536
+
+# Planchers des timeouts adaptatifs (le plafond reste l'ancienne valeur fixe)
+PORT_TIMEOUT_FLOOR = 0.08
+LIVENESS_TIMEOUT_FLOOR = 0.1
+# Seule la connexion TCP des sondes web suit le RTT ; lecture et poignée de main TLS
+# (temps de réflexion du serveur, CPU faibles) gardent HTTP_TIMEOUT
+HTTP_CONNECT_TIMEOUT_FLOOR = 0.5
+HTTP_TIMEOUT = 3.0
+
+# Nouvelles tentatives quand le système manque de sockets (EMFILE, EADDRNOTAVAIL...)
+EXHAUSTION_RETRIES = 3
+EXHAUSTION_BACKOFF = 0.05
+
+# Octets de corps lus au plus par les sondes web
+HTTP_MAX_BODY = 64 * 1024
+
+# Détection des panneaux d'admin : sondes parallèles par hôte, plafond global,
+# budget de temps par hôte et arrêt après N échecs consécutifs (serveur lent / tarpit)
+ADMIN_PROBE_WORKERS = 8
+ADMIN_PROBE_GLOBAL_LIMIT = 64
+ADMIN_PROBE_BUDGET = 10.0
+ADMIN_PROBE_MAX_FAILURES = 5
+ADMIN_PROBE_SLOTS = threading.BoundedSemaphore(ADMIN_PROBE_GLOBAL_LIMIT)
+
+# (mot-clé du chemin, libellé, marqueurs de contenu) - première règle applicable
+ADMIN_PANEL_RULES = [
+    ("phpmyadmin", "phpMyAdmin", ("phpmyadmin", "pma_")),
+    ("adminer", "Adminer", ("adminer", "login")),
+    ("pgadmin", "pgAdmin", ("pgadmin", "postgresql")),
+    ("mongo", "Mongo-Express", ("mongo", "mongodb")),
+    ("admin", "Admin Panel", ("login", "password", "username")),
+]
+
+# Chemins testés par detect_admin_panels()
+ADMIN_PATHS = [
+    # MySQL/MariaDB
+    "/phpmyadmin", "/phpMyAdmin", "/pma", "/mysql", "/myadmin", "/dbadmin",
+    "/phpmyadmin/index.php", "/pma/index.php",
+    
+    # Adminer (multi-DB)
+    "/adminer.php", "/adminer", "/db", "/database",
+    
+    # PostgreSQL
+    "/pgadmin", "/pgadmin4", "/pgsql",
+    
+    # MongoDB
+    "/mongo-express", "/mongodb", "/mongo",
+    
+    # Redis
+    "/phpredisadmin", "/redis",
+    
+    # Admin génériques
+    "/admin", "/administrator", "/cpanel", "/webadmin",
+    "/admin.php", "/admin/login", "/admin/index.php",
+    "/wp-admin", "/wp-login.php",
+    
+    # Elasticsearch/Kibana
+    "/kibana", "/_plugin/kibana",
+    
+    # Autres
+    "/manager", "/status", "/server-status"
+]
+
+# Plan de sondes web par hôte (http_checks + panneaux d'admin + directory buster) :
+# budget commun, plus large que celui des seuls panneaux d'admin
+WEB_PLAN_BUDGET = 20.0
+
+# Estimation SRTT/RTTVAR partagée par tous les étages du scan
+RTT_ESTIMATOR = RttEstimator() if RTT_ESTIMATOR_AVAILABLE else None
+
+# Relevés TCP_INFO (RTT noyau, options du SYN-ACK) des connexions abouties, par hôte
+TCP_INFO_STORE = TcpInfoStore() if TCP_INFO_AVAILABLE else None
+
+# Fréquence d'ouverture des ports : les ports souvent ouverts sont sondés en premier
+PORT_FREQUENCY = PortFrequency() if PORT_SPEC_AVAILABLE else None
+
+# Empreintes OS / appareil compilées une fois ; classification en lot par classify_hosts()
+FINGERPRINT_ENGINE = FingerprintEngine() if FINGERPRINT_ENGINE_AVAILABLE else None
+
+# Règles de risque et poids du score compilés une fois ; évaluation en lot dans main()
+RISK_ENGINE = RiskEngine() if RISK_ENGINE_AVAILABLE else None
+
+# Résolveur PTR UDP partagé (créé à la première utilisation) ; la chaîne
+# nslookup/dig/host/avahi-resolve/dns-sd n'est essayée qu'avec --hostname-fallback
+PTR_RESOLVER = None
+PTR_RESOLVER_LOCK = threading.Lock()
+HOSTNAME_SUBPROCESS_FALLBACK = False
+
+# Noms locaux (mDNS, NetBIOS, SSDP) collectés en une passe au début du scan
+NAME_HARVEST_ENABLED = True
+NAME_HARVEST_WINDOW = 2.0
+
+# Identités (nom, type d'appareil, OS) du scan précédent, lues au démarrage par main()
+IDENTITY_CACHE = None
+
 # Ports pour pentest complet - services critiques et vulnérabilités courantes
 DEFAULT_PORTS = [
     20,21,22,23,25,53,80,110,111,135,139,143,443,445,465,587,993,995,
@@ -80,6 +309,13 @@ CRITICAL_PORTS = {
     27017: "MongoDB - NoSQL injection"
 }
 
+# Bases de données signalées comme exposées par analyze_security_risks()
+EXPOSED_DB_PORTS = frozenset([1433, 3306, 5432, 27017, 6379, 9200])
+
+# Ports HTTP(S) testés par worker_scan_host()
+HTTP_PORTS = (80, 8000, 8080, 8443, 8888)
+WEB_PORTS = (80, 8080, 443, 8443)
+
 def parse_ip_range(arg: str) -> List[str]:
     if "/" in arg:
         net = ipaddress.ip_network(arg, strict=False)
@@ -95,6 +331,53 @@ def parse_ip_range(arg: str) -> List[str]:
     except Exception:
         raise ValueError("Plage IP invalide. Utilise CIDR (ex: 192.168.1.0/24) ou range (192.168.1.1-254)")
 
+def observe_rtt(ip: str, rtt: float):
+    """Transmet un échantillon de RTT à l'estimateur (si disponible)."""
+    if RTT_ESTIMATOR is not None:
+        RTT_ESTIMATOR.observe(ip, rtt)
+
+def observe_connect(ip: str, sock: socket.socket, elapsed: float):
+    """Connexion aboutie : RTT mesuré par le noyau (TCP_INFO) s'il est lisible,
+    sinon le temps chronométré. À appeler avant de fermer la socket."""
+    info = TCP_INFO_STORE.observe(ip, sock) if TCP_INFO_STORE is not None else None
+    observe_rtt(ip, info.rtt if info is not None else elapsed)
+
+def adaptive_timeout(ip: str, default: float, floor: float) -> float:
+    """Timeout dérivé du RTT mesuré de l'hôte (ou de son /24), borné par `default`."""
+    if RTT_ESTIMATOR is None:
+        return default
+    return RTT_ESTIMATOR.timeout(ip, default, floor, default)
+
+def load_targets(target: str, exclude: str = None):
+    """Cibles du scan : TargetSet paresseux si disponible, sinon liste d'IPs."""
+    if TARGETS_AVAILABLE:
+        return TargetSet.parse(target, exclude)
+    ips = parse_ip_range(target)
+    if exclude:
+        excluded = set(parse_ip_range(exclude))
+        ips = [ip for ip in ips if ip not in excluded]
+    return ips
+
+def load_ports(spec: str):
+    """Ports à scanner : PortSet (plages, exclusions, profils) ou liste simple en repli."""
+    if PORT_SPEC_AVAILABLE:
+        return PortSet.parse(spec, profiles={"default": DEFAULT_PORTS})
+    return [int(p) for p in spec.split(",") if p.strip()]
+
+def describe_ports(ports) -> str:
+    if isinstance(ports, list):
+        return str(ports)
+    return f"{ports.describe()} ({len(ports)} ports)"
+
+def iter_chunks(iterable, size: int):
+    """Découpe un itérable en listes d'au plus `size` éléments, à la demande."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 def ping(ip: str, timeout: float = 1.0) -> Tuple[bool, int]:
     """Ping et retourne (alive, ttl) pour OS detection."""
     if IS_WINDOWS:
@@ -149,16 +432,23 @@ def arp_ping(ip: str) -> bool:
     except Exception:
         return False
 
-def tcp_ping(ip: str, ports: List[int] = [80, 443, 8080]) -> bool:
+def tcp_ping(ip: str, ports: List[int] = [80, 443, 8080], timeout: float = 0.5) -> bool:
     """TCP SYN sur ports communs pour détecter les appareils sans ping ICMP.
     Très efficace pour les mobiles qui bloquent ICMP."""
     for port in ports:
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(0.5)
-            result = sock.connect_ex((ip, port))
-            sock.close()
+            with socket_permit("liveness"):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.settimeout(timeout)
+                started = time.monotonic()
+                result = sock.connect_ex((ip, port))
+                elapsed = time.monotonic() - started
+                if result == 0:
+                    observe_connect(ip, sock, elapsed)
+                sock.close()
             if result == 0 or result == 111:  # 0=open, 111=refused but alive
+                if result == 111:
+                    observe_rtt(ip, elapsed)
                 return True
         except:
             pass
@@ -199,6 +489,7 @@ def analyze_security_risks(host_data: Dict) -> Dict:
     }
     
     open_ports = host_data.get("open_ports", [])
+    open_set = frozenset(open_ports)
     
     for port in open_ports:
         if port in CRITICAL_PORTS:
@@ -209,39 +500,38 @@ def analyze_security_risks(host_data: Dict) -> Dict:
             })
     
     # Vérifications supplémentaires
-    if 21 in open_ports:
+    if 21 in open_set:
         risks["high"].append({
             "type": "FTP Anonymous",
             "description": "FTP pourrait autoriser l'accès anonyme"
         })
     
-    if 23 in open_ports:
+    if 23 in open_set:
         risks["critical"].append({
             "type": "Telnet",
             "description": "Protocole non chiffré - Credentials visibles"
         })
     
-    if 80 in open_ports and 443 not in open_ports:
+    if 80 in open_set and 443 not in open_set:
         risks["medium"].append({
             "type": "HTTP sans HTTPS",
             "description": "Pas de chiffrement - Données en clair"
         })
     
-    if 445 in open_ports or 139 in open_ports:
+    if 445 in open_set or 139 in open_set:
         risks["high"].append({
             "type": "SMB exposé",
             "description": "Vulnérable à EternalBlue, énumération possible"
         })
     
-    if 3389 in open_ports:
+    if 3389 in open_set:
         risks["high"].append({
             "type": "RDP exposé",
             "description": "Cible de brute force, vulnérable à BlueKeep"
         })
     
     # Check for databases exposées
-    db_ports = [1433, 3306, 5432, 27017, 6379, 9200]
-    exposed_dbs = [p for p in open_ports if p in db_ports]
+    exposed_dbs = [p for p in open_ports if p in EXPOSED_DB_PORTS]
     if exposed_dbs:
         risks["critical"].append({
             "type": "Base de données exposée",
@@ -278,13 +568,47 @@ def arp_table() -> Dict[str, str]:
         pass
     return out
 
-def scan_port(ip: str, port: int, timeout: float = 1.5) -> Tuple[int, bool, str]:
-    """Tentative de connexion TCP stricte avec banner grabbing."""
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+def scan_port(ip: str, port: int, timeout: float = 1.5, grab_banner: bool = True) -> Tuple[int, bool, str]:
+    """Tentative de connexion TCP stricte avec banner grabbing (désactivable quand
+    l'étape banner_grabber collecte les bannières ensuite).
+    Un manque de sockets côté scanner est réessayé au lieu d'être rapporté comme port fermé."""
+    for attempt in range(EXHAUSTION_RETRIES + 1):
+        with socket_permit("portscan"):
+            result = _scan_port_once(ip, port, timeout, grab_banner)
+        if result is not None:
+            return result
+        governor = get_governor()
+        if governor is not None:
+            governor.note_exhaustion("portscan")
+        time.sleep(EXHAUSTION_BACKOFF * (attempt + 1))
+    return (port, False, "")
+
+def _scan_port_once(ip: str, port: int, timeout: float,
+                    grab_banner: bool = True) -> Optional[Tuple[int, bool, str]]:
+    """Une tentative de scan_port ; None si le système manque de sockets."""
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    except OSError as e:
+        if e.errno in RESOURCE_EXHAUSTION_ERRNOS:
+            return None
+        return (port, False, "")
     s.settimeout(timeout)
     try:
         # Connexion TCP - retourne 0 si succès
+        started = time.monotonic()
         result = s.connect_ex((ip, port))
+        if result in RESOURCE_EXHAUSTION_ERRNOS:
+            s.close()
+            return None
+        if result == 0:
+            # SYN-ACK : RTT et options relevés par le noyau, sans paquet de plus
+            observe_connect(ip, s, time.monotonic() - started)
+        elif result == errno.ECONNREFUSED:
+            # RST : un aller-retour complet mesurable
+            observe_rtt(ip, time.monotonic() - started)
+        if result == 0 and not grab_banner:
+            s.close()
+            return (port, True, "")
         if result == 0:
             # Port vraiment ouvert - essayer de lire la bannière
             try:
@@ -320,7 +644,82 @@ def scan_port(ip: str, port: int, timeout: float = 1.5) -> Tuple[int, bool, str]
             pass
         return (port, False, "")
 
-def http_checks(ip: str, port: int, use_tls: bool=False, timeout: float=3.0) -> Dict:
+class RequestBudget:
+    def __init__(self, seconds: float = ADMIN_PROBE_BUDGET, max_failures: int = ADMIN_PROBE_MAX_FAILURES):
+        """Budget de requêtes web d'un hôte : temps total et échecs consécutifs."""
+        self.deadline = time.monotonic() + seconds
+        self.max_failures = max_failures
+        self.consecutive_failures = 0
+        self.lock = threading.Lock()
+    
+    def record(self, success: bool):
+        """Une réponse HTTP (quel que soit le code) remet le compteur d'échecs à zéro."""
+        with self.lock:
+            self.consecutive_failures = 0 if success else self.consecutive_failures + 1
+    
+    def remaining(self) -> float:
+        """Secondes restantes ; 0 si le budget est épuisé."""
+        if self.consecutive_failures >= self.max_failures:
+            return 0.0
+        return max(0.0, self.deadline - time.monotonic())
+
+def http_fetch(url: str, timeout: float, client=None, method: str = "GET",
+               max_body: int = HTTP_MAX_BODY, ctx=None, keep_body: bool = False,
+               markers: List[str] = None, marker_groups: List[List[str]] = None,
+               body_prefix: int = 0) -> Tuple[int, Dict, bytes, Optional[set]]:
+    """Requête web via le client keep-alive partagé, ou urllib en repli.
+    Le corps est lu par morceaux (au plus max_body octets) ; avec `markers`, la
+    lecture s'arrête au premier motif trouvé (un par groupe avec marker_groups).
+    Retourne (status, headers, corps si keep_body sinon ses body_prefix premiers
+    octets, motifs trouvés). Lève une exception si le serveur est injoignable."""
+    if client is not None:
+        response = client.request(method, url, timeout=timeout, max_body=max_body,
+                                  keep_body=keep_body, markers=markers,
+                                  marker_groups=marker_groups, body_prefix=body_prefix)
+        return response.status, response.headers, response.body, response.matches
+    
+    if ctx is None:
+        ctx = ssl.create_default_context()
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    req = urllib.request.Request(url, method=method)
+    req.add_header('User-Agent', 'PathFinder/1.0')
+    try:
+        with socket_permit("http"), urllib.request.urlopen(req, timeout=timeout, context=ctx) as response:
+            if HTTP_CLIENT_AVAILABLE:
+                matcher = StreamMatcher(markers, marker_groups) if markers else None
+                body = read_body(response, max_body, keep_body, matcher, body_prefix)
+                return response.status, response.headers, body, matcher.found if matcher else None
+            body = response.read(max_body)
+            matches = {m for m in markers if m in body.lower().decode('utf-8', errors='ignore')} if markers else None
+            return response.status, response.headers, body if keep_body else body[:body_prefix], matches
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b"", set() if markers else None
+
+def web_plan_fetch(client, url: str, timeout: float, markers: List[str], marker_groups,
+                   head: bool) -> Tuple[int, Dict, bytes, Optional[set]]:
+    """Requête du plan de sondes web : lecture du corps avec marqueurs, sinon HEAD
+    (ou GET limité par Range) - une archive n'est jamais téléchargée pour son statut."""
+    if markers:
+        return http_fetch(url, timeout, client, markers=markers, marker_groups=marker_groups,
+                          body_prefix=DEFAULT_BODY_PREFIX)
+    response = client.probe(url, DEFAULT_BODY_PREFIX, head=head, timeout=timeout)
+    return response.status, response.headers, response.body, None
+
+def planned_fetch(url: str, timeout: float, client=None, ctx=None, planner=None,
+                  markers: Tuple[str, ...] = ()) -> Tuple[int, Dict, bytes, Optional[set]]:
+    """http_fetch, ou la réponse partagée du plan de sondes web de l'hôte."""
+    if planner is None:
+        return http_fetch(url, timeout, client, ctx=ctx, markers=list(markers) or None)
+    response = planner.get(url, markers)
+    if response.error:
+        raise OSError(f"Pas de réponse: {url}")
+    # Réponse identique à celle d'un chemin inexistant : traitée comme un 404
+    status = 404 if response.soft404 else response.status
+    return status, response.headers, response.body_prefix, response.matches
+
+def http_checks(ip: str, port: int, use_tls: bool=False, timeout: float=3.0, client=None,
+                budget: "RequestBudget" = None, planner=None) -> Dict:
     """Checks HTTP(S): headers, server header, robots.txt existence."""
     res = {
         "server": "", 
@@ -338,112 +737,121 @@ def http_checks(ip: str, port: int, use_tls: bool=False, timeout: float=3.0) ->
     ctx.verify_mode = ssl.CERT_NONE
     
     try:
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'PathFinder/1.0')
-        
-        with urllib.request.urlopen(req, timeout=timeout, context=ctx) as response:
-            res["status_code"] = response.status
-            res["server"] = response.headers.get("Server", "")
-            res["x_powered_by"] = response.headers.get("X-Powered-By", "")
+        status, headers, _, _ = planned_fetch(url, timeout, client, ctx, planner)
+        res["status_code"] = status
+        res["server"] = headers.get("Server", "")
+        res["x_powered_by"] = headers.get("X-Powered-By", "")
         
-        # robots.txt check
-        try:
-            robots_url = f"{proto}://{ip}:{port}/robots.txt"
-            robots_req = urllib.request.Request(robots_url)
-            robots_req.add_header('User-Agent', 'PathFinder/1.0')
-            with urllib.request.urlopen(robots_req, timeout=timeout, context=ctx) as robots_response:
-                res["robots_txt"] = robots_response.status == 200
-        except Exception:
-            res["robots_txt"] = False
-    except urllib.error.HTTPError as e:
-        res["status_code"] = e.code
-        res["server"] = e.headers.get("Server", "")
-        res["x_powered_by"] = e.headers.get("X-Powered-By", "")
+        # robots.txt check (seulement si la page d'accueil n'est pas en erreur)
+        if status < 400:
+            try:
+                robots_url = f"{proto}://{ip}:{port}/robots.txt"
+                robots_status, _, _, _ = planned_fetch(robots_url, timeout, client, ctx, planner)
+                res["robots_txt"] = robots_status == 200
+            except Exception:
+                res["robots_txt"] = False
     except Exception:
         pass
     
     # Détection des interfaces d'administration exposées
-    res["admin_panels"] = detect_admin_panels(ip, port, proto, ctx, timeout)
+    res["admin_panels"] = detect_admin_panels(ip, port, proto, ctx, timeout, client, budget, planner)
     
     return res
 
-def detect_admin_panels(ip: str, port: int, proto: str, ctx, timeout: float = 2.0) -> List[str]:
-    """Détecte les panneaux d'administration et interfaces DB exposés."""
-    admin_paths = [
-        # MySQL/MariaDB
-        "/phpmyadmin", "/phpMyAdmin", "/pma", "/mysql", "/myadmin", "/dbadmin",
-        "/phpmyadmin/index.php", "/pma/index.php",
-        
-        # Adminer (multi-DB)
-        "/adminer.php", "/adminer", "/db", "/database",
-        
-        # PostgreSQL
-        "/pgadmin", "/pgadmin4", "/pgsql",
-        
-        # MongoDB
-        "/mongo-express", "/mongodb", "/mongo",
-        
-        # Redis
-        "/phpredisadmin", "/redis",
-        
-        # Admin génériques
-        "/admin", "/administrator", "/cpanel", "/webadmin",
-        "/admin.php", "/admin/login", "/admin/index.php",
-        "/wp-admin", "/wp-login.php",
-        
-        # Elasticsearch/Kibana
-        "/kibana", "/_plugin/kibana",
-        
-        # Autres
-        "/manager", "/status", "/server-status"
-    ]
+def detect_admin_panels(ip: str, port: int, proto: str, ctx, timeout: float = 2.0,
+                        client=None, budget: "RequestBudget" = None, planner=None) -> List[str]:
+    """Détecte les panneaux d'administration et interfaces DB exposés.
+    Sondes concurrentes, bornées par hôte (budget) et globalement (ADMIN_PROBE_SLOTS).
+    Avec `planner`, les réponses sont prises dans le plan de sondes web de l'hôte."""
+    admin_paths = ADMIN_PATHS
     
-    found_panels = []
+    if planner is not None:
+        urls = [f"{proto}://{ip}:{port}{path}" for path in admin_paths]
+        rules = [admin_panel_rule(path) for path in admin_paths]
+        responses = planner.get_many([(url, markers) for url, (_, markers) in zip(urls, rules)])
+        found = []
+        for url, (label, markers), response in zip(urls, rules, responses):
+            if not response.error and not response.soft404:
+                # Seuls les marqueurs de ce panneau comptent (la réponse est partagée)
+                matches = {marker for marker in markers if response.matched((marker,))}
+                panel = admin_panel_result(url, label, markers, response.status, matches)
+                if panel:
+                    found.append(panel)
+        return found
     
-    for path in admin_paths:
+    if budget is None:
+        budget = RequestBudget()
+    
+    def probe(path: str) -> Optional[str]:
+        # Budget de l'hôte épuisé : ne plus rien envoyer
+        remaining = budget.remaining()
+        if remaining <= 0:
+            return None
+        url = f"{proto}://{ip}:{port}{path}"
+        label, markers = admin_panel_rule(path)
         try:
-            url = f"{proto}://{ip}:{port}{path}"
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'PathFinder/1.0')
-            
-            with urllib.request.urlopen(req, timeout=timeout, context=ctx) as response:
-                if response.status == 200:
-                    content = response.read().decode('utf-8', errors='ignore').lower()
-                    
-                    # Vérification du contenu pour confirmer
-                    if "phpmyadmin" in path.lower():
-                        if "phpmyadmin" in content or "pma_" in content:
-                            found_panels.append(f"phpMyAdmin: {url}")
-                    elif "adminer" in path.lower():
-                        if "adminer" in content or "login" in content:
-                            found_panels.append(f"Adminer: {url}")
-                    elif "pgadmin" in path.lower():
-                        if "pgadmin" in content or "postgresql" in content:
-                            found_panels.append(f"pgAdmin: {url}")
-                    elif "mongo" in path.lower():
-                        if "mongo" in content or "mongodb" in content:
-                            found_panels.append(f"Mongo-Express: {url}")
-                    elif "admin" in path.lower():
-                        if "login" in content or "password" in content or "username" in content:
-                            found_panels.append(f"Admin Panel: {url}")
-                    else:
-                        found_panels.append(f"Interface: {url}")
-                        
-        except urllib.error.HTTPError as e:
-            # 401/403 signifie que la page existe mais nécessite auth
-            if e.code in [401, 403]:
-                found_panels.append(f"Protected: {proto}://{ip}:{port}{path} (HTTP {e.code})")
+            with ADMIN_PROBE_SLOTS:
+                # Lecture du corps arrêtée dès qu'un marqueur de confirmation est vu
+                status, _, _, matches = http_fetch(url, min(timeout, remaining), client, ctx=ctx,
+                                                   markers=markers)
         except Exception:
-            pass
+            budget.record(False)
+            return None
+        budget.record(True)
+        return admin_panel_result(url, label, markers, status, matches)
     
-    return found_panels
+    # Sondes en parallèle ; résultats rendus dans l'ordre de admin_paths
+    found = {}
+    executor = ThreadPoolExecutor(max_workers=ADMIN_PROBE_WORKERS)
+    futures = {executor.submit(probe, path): index for index, path in enumerate(admin_paths)}
+    try:
+        pending = set(futures)
+        while pending and budget.remaining() > 0:
+            done, pending = wait(pending, timeout=budget.remaining(), return_when=FIRST_COMPLETED)
+            for future in done:
+                panel = future.result()
+                if panel:
+                    found[futures[future]] = panel
+    finally:
+        # cancel_futures (Python 3.9+) n'existe pas en 3.7 : annulation explicite
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+    
+    return [found[index] for index in sorted(found)]
+
+def admin_panel_result(url: str, label: str, markers: Tuple[str, ...], status: int,
+                       matches: Optional[set]) -> Optional[str]:
+    """Panneau signalé pour une réponse, ou None."""
+    if status == 200 and (not markers or matches):
+        return f"{label}: {url}"
+    if status in [401, 403]:
+        # 401/403 signifie que la page existe mais nécessite auth
+        return f"Protected: {url} (HTTP {status})"
+    return None
 
-def tls_cert_expiry(ip: str, port: int=443, timeout: float=3.0) -> Dict:
-    """Retourne la date d'expiration du certificat TLS si accessible."""
-    out = {"valid": None, "expires_in_days": None, "notAfter": None}
+def admin_panel_rule(path: str) -> Tuple[str, Tuple[str, ...]]:
+    """(libellé, marqueurs de contenu confirmant le panneau) pour un chemin testé."""
+    path = path.lower()
+    for keyword, label, markers in ADMIN_PANEL_RULES:
+        if keyword in path:
+            return label, markers
+    return "Interface", ()
+
+def tls_cert_expiry(ip: str, port: int=443, timeout: float=3.0, client=None) -> Dict:
+    """Retourne la date d'expiration du certificat TLS si accessible.
+    Le certificat de la poignée de main HTTPS du client keep-alive est réutilisé
+    (pas de nouvelle connexion) ; les certificats auto-signés sont lus aussi."""
+    if TLS_INSPECTOR_AVAILABLE:
+        der = client.peer_certificate(ip, port) if client is not None else None
+        if der is None:
+            der = fetch_peer_certificate(ip, port, timeout)
+        return certificate_report(der)
+    
+    out = {"valid": None, "within_dates": None, "expires_in_days": None, "notAfter": None}
     try:
         ctx = ssl.create_default_context()
-        with socket.create_connection((ip, port), timeout=timeout) as sock:
+        with socket_permit("tls"), socket.create_connection((ip, port), timeout=timeout) as sock:
             with ctx.wrap_socket(sock, server_hostname=ip) as ssock:
                 cert = ssock.getpeercert()
                 notAfter = cert.get('notAfter')
@@ -452,21 +860,177 @@ def tls_cert_expiry(ip: str, port: int=443, timeout: float=3.0) -> Dict:
                     delta = dt - datetime.datetime.utcnow()
                     out["notAfter"] = dt.isoformat()
                     out["expires_in_days"] = delta.days
+                    out["within_dates"] = delta.days >= 0
                     out["valid"] = delta.days >= 0
     except Exception:
         pass
     return out
 
-def get_hostname(ip: str, timeout: float = 2.0) -> str:
+def get_ptr_resolver():
+    """Résolveur PTR partagé, ou None (module absent / pas de /etc/resolv.conf)."""
+    global PTR_RESOLVER
+    if not DNS_RESOLVER_AVAILABLE:
+        return None
+    with PTR_RESOLVER_LOCK:
+        if PTR_RESOLVER is None:
+            PTR_RESOLVER = PtrResolver()
+    return PTR_RESOLVER if PTR_RESOLVER.available else None
+
+def resolve_hostname(ip: str, timeout: float = 2.0, fallback: bool = None) -> Tuple[str, str]:
+    """Résolution réseau du nom d'hôte : (nom, source "dns" / "tools") ; sans nom,
+    ("", "dns") si le DNS a répondu qu'il n'y en a pas (NXDOMAIN, pas de PTR), ("", "")
+    s'il n'a pas répondu (timeout, SERVFAIL) : échec à ne pas mémoriser.
+    PTR en UDP par le résolveur intégré (requêtes de tous les hôtes en parallèle) ;
+    les outils système ne sont essayés qu'avec fallback (--hostname-fallback)."""
+    resolver = get_ptr_resolver()
+    answered = True
+    if resolver is not None:
+        hostname = resolver.resolve(ip)
+        if hostname and hostname != ip:
+            return hostname, "dns"
+        answered = not resolver.failed(ip)
+    else:
+        try:
+            # Méthode 1: Résolution DNS inverse standard
+            hostname = socket.gethostbyaddr(ip)[0]
+            if hostname and hostname != ip:
+                return hostname, "dns"
+        except socket.herror:
+            pass
+        except Exception:
+            answered = False
+    
+    if fallback is None:
+        fallback = HOSTNAME_SUBPROCESS_FALLBACK
+    if fallback:
+        hostname = hostname_from_tools(ip, timeout)
+        if hostname:
+            return hostname, "tools"
+    return "", "dns" if answered else ""
+
+def get_hostname(ip: str, timeout: float = 2.0, fallback: bool = None) -> str:
     """Tentative de résolution DNS inverse pour obtenir le nom d'hôte."""
+    hostname = resolve_hostname(ip, timeout, fallback)[0]
+    if hostname:
+        return hostname
+    
+    # Si aucune méthode ne fonctionne, essayer de deviner le type d'appareil
     try:
-        # Méthode 1: Résolution DNS inverse standard
-        hostname = socket.gethostbyaddr(ip)[0]
-        if hostname and hostname != ip:
-            return hostname
+        # Méthode 7: Détection basée sur les ports ouverts et autres indices
+        return detect_device_type(ip)
     except Exception:
         pass
     
+    # Si aucune méthode ne fonctionne, retourner une chaîne vide
+    return ""
+
+def local_device_type_wins(cached: Optional[Dict], local: Dict) -> bool:
+    """Type collecté à ce scan plutôt que celui du cache : toujours s'il n'y a rien en
+    cache, sinon seulement entre deux types mDNS et s'il est mieux classé (un Mac vu
+    "Partage SMB" au scan précédent devient "iPhone/iPad/Mac")."""
+    if cached is None:
+        return True
+    if cached["source"] != "mdns" or local.get("device_type_source") != "mdns":
+        return False
+    return device_type_rank(local["device_type"]) < device_type_rank(cached["value"])
+
+def identify_host(ip: str, mac: str = "", local_names=None) -> Dict[str, Dict]:
+    """Nom d'hôte et type d'appareil : cache d'identités d'abord, puis noms collectés
+    (mDNS / NetBIOS / SSDP), puis résolution PTR.
+    Retourne {champ: {"value", "source", "cached"}} ; un nom vide est un échec."""
+    identity = {}
+    cache = IDENTITY_CACHE
+    for field in ("hostname", "device_type"):
+        cached = cache.get(ip, field, mac) if cache is not None else None
+        # NetBIOS ne dit rien du type d'appareil (Samba, imprimantes) : types mémorisés ignorés
+        if cached is not None and not (field == "device_type" and cached[1] == "netbios"):
+            identity[field] = {"value": cached[0], "source": cached[1], "cached": True}
+    if ("hostname" in identity and "device_type" in identity
+            and (local_names is None or identity["device_type"]["source"] != "mdns")):
+        return identity
+    
+    local = local_names.lookup(ip) if local_names is not None else {}
+    if local.get("device_type") and local_device_type_wins(identity.get("device_type"), local):
+        identity["device_type"] = {"value": local["device_type"],
+                                   "source": local.get("device_type_source", ""), "cached": False}
+    if "hostname" not in identity:
+        if local.get("name"):
+            hostname, source = local["name"], local.get("name_source", "")
+        else:
+            hostname, source = resolve_hostname(ip)
+        # Absence de nom confirmée par le DNS : mémorisée (cache négatif) ;
+        # DNS muet (timeout, SERVFAIL) : rien n'est mémorisé, nouvel essai au prochain scan
+        identity["hostname"] = {"value": hostname, "source": source or "dns", "cached": False}
+        if not hostname and not source:
+            identity["hostname"]["transient"] = True
+    return identity
+
+def apply_cached_os(result: Dict, mac: str = ""):
+    """OS du cache d'identités quand la détection n'a rien donné."""
+    if result["os"] != "Unknown" or IDENTITY_CACHE is None:
+        return
+    cached_os = IDENTITY_CACHE.get(result["ip"], "os", mac)
+    if cached_os is not None and cached_os[0]:
+        result["os"] = cached_os[0]
+        result.setdefault("identity", {})["os"] = {"value": cached_os[0], "source": cached_os[1], "cached": True}
+
+def http_server_header(result: Dict) -> str:
+    """En-tête Server du premier service web analysé (même ordre que worker_scan_host)."""
+    for key in [f"http_{p}" for p in HTTP_PORTS] + ["http_https"]:
+        server = result.get(key, {}).get("server", "")
+        if server:
+            return server
+    return ""
+
+def classify_hosts(results: List[Dict]):
+    """OS et type d'appareil de tous les hôtes actifs en une passe (moteur d'empreintes).
+    Ajoute os_confidence, device_type / device_confidence et les candidats classés."""
+    alive = [r for r in results if r.get("alive")]
+    guesses = FINGERPRINT_ENGINE.classify_many(
+        (r["ip"], r.get("ttl", 0), r.get("open_ports", []), r.get("banners", {}), http_server_header(r),
+         r.get("vendor", ""), r.get("mac_random", False), r.get("tcp"))
+        for r in alive)
+    for r, guess in zip(alive, guesses):
+        r["os"] = guess["os"]["label"]
+        r["os_confidence"] = guess["os"]["confidence"]
+        apply_cached_os(r, r.get("mac", ""))
+        # Type annoncé par l'appareil lui-même (mDNS / SSDP / cache) plutôt que deviné
+        announced = r.get("identity", {}).get("device_type")
+        if announced and announced["value"]:
+            r["device_type"], r["device_confidence"] = announced["value"], 1.0
+        else:
+            r["device_type"] = guess["device"]["label"]
+            r["device_confidence"] = guess["device"]["confidence"]
+        r["fingerprint_candidates"] = {kind: guess[kind]["candidates"] for kind in ("os", "device")}
+
+def annotate_vendors(results: List[Dict]) -> int:
+    """Constructeur (registre OUI) de chaque MAC connue, en un lot sur tous les résultats.
+    Retourne le nombre de MACs identifiées."""
+    vendors = OUI_REGISTRY.lookup_many(r["mac"] for r in results if r.get("mac"))
+    for r in results:
+        mac = r.get("mac")
+        if mac:
+            r["vendor"] = vendors.get(mac, "")
+            r["mac_random"] = is_random_mac(mac)
+    return sum(1 for vendor in vendors.values() if vendor)
+
+def update_identity_cache(cache, results: List[Dict]):
+    """Reporte dans le cache les identités du scan (MACs déjà remplies)."""
+    for r in results:
+        if not r.get("alive"):
+            continue
+        identity = dict(r.get("identity", {}))
+        if r.get("os") and r["os"] != "Unknown" and "os" not in identity:
+            identity["os"] = {"value": r["os"], "source": "scan", "cached": False}
+        for field, item in identity.items():
+            if item.get("transient"):
+                continue
+            # Valeur lue dans le cache : ne pas la rajeunir, elle expirera à son terme
+            cache.record(r["ip"], field, item["value"], item["source"], mac=r.get("mac", ""),
+                         refresh=not item["cached"])
+
+def hostname_from_tools(ip: str, timeout: float = 2.0) -> str:
+    """Résolution par les outils système (un processus par outil, lent)."""
     try:
         # Méthode 2: Utiliser nslookup si disponible
         if not IS_WINDOWS:
@@ -536,14 +1100,6 @@ def get_hostname(ip: str, timeout: float = 2.0) -> str:
     except Exception:
         pass
     
-    # Si aucune méthode ne fonctionne, essayer de deviner le type d'appareil
-    try:
-        # Méthode 7: Détection basée sur les ports ouverts et autres indices
-        return detect_device_type(ip)
-    except Exception:
-        pass
-    
-    # Si aucune méthode ne fonctionne, retourner une chaîne vide
     return ""
 
 def detect_device_type(ip: str) -> str:
@@ -577,7 +1133,140 @@ def detect_device_type(ip: str) -> str:
     except Exception:
         return ""
 
-def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8) -> Dict:
+def discover_host(ip: str, neighbors=None) -> Tuple[bool, int, str]:
+    """Découverte d'un hôte isolé : retourne (alive, ttl, detection_method)."""
+    # Méthode 1: Ping ICMP classique
+    alive, ttl = ping(ip, timeout=1.0)
+    if alive:
+        return True, ttl, "ICMP"
+    
+    # Méthode 2: Si ping échoue, essayer ARP (pour téléphones/mobiles)
+    # Le ping a déjà déclenché la résolution ARP : une entrée dans la table
+    # des voisins suffit, sans lancer arping par hôte
+    if neighbors is not None:
+        alive = neighbors.is_present(ip)
+    else:
+        alive = arp_ping(ip)
+    if alive:
+        return True, 64, "ARP"  # TTL par défaut
+    
+    # Méthode 3: Si toujours pas détecté, TCP ping sur ports communs
+    timeout = adaptive_timeout(ip, 0.5, LIVENESS_TIMEOUT_FLOOR)
+    if TCP_PROBER_AVAILABLE:
+        alive = probe_tcp_liveness([ip], timeout=timeout, on_rtt=observe_rtt, on_connect=observe_connect,
+                                   governor=get_governor()).get(ip, False)
+    else:
+        alive = tcp_ping(ip, TCP_PROBE_PORTS, timeout=timeout)
+    if alive:
+        return True, 64, "TCP"
+    
+    return False, 0, ""
+
+def discover_hosts(ips: List[str], neighbors=None, workers: int = 100,
+                   on_result=None) -> Dict[str, Tuple[bool, int, str]]:
+    """
+    Découverte groupée de toutes les IPs avant l'analyse des hôtes actifs.
+    
+    Args:
+        on_result: Rappel on_result(ip, discovery) appelé dès que l'état d'un
+            hôte est connu (les hôtes ICMP/ARP sans attendre la sonde TCP)
+    
+    Returns:
+        {ip: (alive, ttl, detection_method)}, vide si le sweep ICMP n'est pas
+        disponible (les workers font alors la découverte hôte par hôte).
+    """
+    if not ICMP_SWEEP_AVAILABLE:
+        return {}
+    
+    # Méthode 1: sweep ICMP en un seul socket au lieu d'un fork de ping par IP
+    try:
+        icmp_results = icmp_sweep(ips, timeout=1.0, on_rtt=observe_rtt)
+    except Exception as e:
+        print(f"⚠️  Sweep ICMP indisponible: {e}")
+        return {}
+    if icmp_results is None:
+        return {}
+    
+    # Méthode 2: le sweep a déclenché la résolution ARP, une lecture de la table suffit
+    if neighbors is not None:
+        neighbors.refresh(force=True)
+    
+    discovery = {}
+    silent = []
+    
+    def found(ip, state):
+        discovery[ip] = state
+        if on_result is not None:
+            on_result(ip, state)
+    
+    for ip in ips:
+        alive, ttl = icmp_results.get(ip, (False, 0))
+        if alive:
+            found(ip, (True, ttl, "ICMP"))
+        elif neighbors is not None and neighbors.is_present(ip):
+            found(ip, (True, 64, "ARP"))
+        else:
+            silent.append(ip)
+    print(f"📡 Sweep ICMP/ARP: {len(discovery)} hôte(s) actif(s)")
+    
+    # Méthode 3: sonde TCP de tous les hôtes muets en même temps
+    # (timeout par hôte dérivé du RTT déjà mesuré sur son /24)
+    def liveness_timeout(ip):
+        return adaptive_timeout(ip, 0.5, LIVENESS_TIMEOUT_FLOOR)
+    
+    if TCP_PROBER_AVAILABLE:
+        tcp_alive = probe_tcp_liveness(silent, timeout_for=liveness_timeout, on_rtt=observe_rtt,
+                                       on_connect=observe_connect, governor=get_governor())
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            tcp_alive = dict(zip(silent, ex.map(
+                lambda ip: tcp_ping(ip, TCP_PROBE_PORTS, timeout=liveness_timeout(ip)), silent)))
+    for ip in silent:
+        found(ip, (True, 64, "TCP") if tcp_alive.get(ip) else (False, 0, ""))
+    
+    return discovery
+
+def collect_banners(ip: str, open_ports: List[int], timeout_port: float,
+                    port_scanner=None) -> Dict[int, str]:
+    """Bannières {port: texte} des ports ouverts, toutes sondes en parallèle."""
+    connect_timeout = adaptive_timeout(ip, timeout_port, PORT_TIMEOUT_FLOOR)
+    try:
+        if port_scanner is not None:
+            # Boucle asyncio du moteur de scan déjà en marche
+            grabber = BannerGrabber(connect_timeout=connect_timeout, governor=get_governor())
+            return port_scanner.run(grabber.grab_all(ip, open_ports))
+        return grab_banners(ip, open_ports, connect_timeout=connect_timeout, governor=get_governor())
+    except Exception:
+        return {}
+
+def plan_web_probes(planner, ip: str, open_set) -> None:
+    """Déclare d'avance les URLs de http_checks, detect_admin_panels et directory_bust
+    (mêmes ports que worker_scan_host) pour qu'elles partent ensemble, sans doublon."""
+    http_ports = [p for p in HTTP_PORTS if p in open_set][:1]
+    if 443 in open_set and 443 not in http_ports:
+        http_ports.append(443)
+    for port in http_ports:
+        base = f"{'https' if port in [443, 8443] else 'http'}://{ip}:{port}"
+        # Référence soft-404 avant tout le reste : les réponses "wildcard" sont écartées
+        planner.establish_baseline(base)
+        planner.add(f"{base}/")
+        for path in ADMIN_PATHS:
+            planner.add(base + path, admin_panel_rule(path)[1])
+    
+    web_ports = [p for p in WEB_PORTS if p in open_set]
+    if DIRECTORY_BUSTER_AVAILABLE and web_ports:
+        port = web_ports[0]
+        base = f"{'https' if port in [443, 8443] else 'http'}://{ip}:{port}"
+        planner.establish_baseline(base)
+        if planner.is_wildcard(base):
+            # Le serveur répond à tout : la wordlist ne serait que du bruit
+            return
+        for path in get_wordlist("quick"):
+            planner.add(f"{base}/{path}")
+
+def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8,
+                     discovery: Tuple[bool, int, str] = None, neighbors=None,
+                     port_scanner=None, local_names=None) -> Dict:
     result = {
         "ip": ip, 
         "alive": False, 
@@ -593,29 +1282,13 @@ def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8) -> Dict
         "detection_method": ""
     }
     
-    # Méthode 1: Ping ICMP classique
-    alive, ttl = ping(ip, timeout=1.0)
+    # Découverte (déjà faite en bloc par discover_hosts() si disponible)
+    if discovery is None:
+        discovery = discover_host(ip, neighbors)
+    alive, ttl, result["detection_method"] = discovery
     result["alive"] = alive
     result["ttl"] = ttl
     
-    # Méthode 2: Si ping échoue, essayer ARP (pour téléphones/mobiles)
-    if not alive:
-        alive = arp_ping(ip)
-        if alive:
-            result["alive"] = True
-            result["ttl"] = 64  # TTL par défaut
-            result["detection_method"] = "ARP"
-    else:
-        result["detection_method"] = "ICMP"
-    
-    # Méthode 3: Si toujours pas détecté, TCP ping sur ports communs
-    if not alive:
-        alive = tcp_ping(ip, [80, 443, 8080, 5353, 62078])
-        if alive:
-            result["alive"] = True
-            result["ttl"] = 64
-            result["detection_method"] = "TCP"
-    
     if not alive:
         return result
     
@@ -624,8 +1297,21 @@ def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8) -> Dict
     banners = {}
     critical_services = []
     
-    for port in ports:
-        port_res = scan_port(ip, port, timeout=timeout_port)
+    # Ports les plus souvent ouverts d'abord
+    if PORT_FREQUENCY is not None:
+        ports = PORT_FREQUENCY.order(ports)
+    
+    # Timeout dérivé du RTT (quelques ms sur le LAN au lieu de timeout_port)
+    if port_scanner is not None:
+        # Moteur asynchrone partagé : tous les ports de l'hôte en vol à la fois
+        port_results = port_scanner.scan_host(ip, ports, adaptive_timeout(ip, timeout_port, PORT_TIMEOUT_FLOOR))
+    else:
+        port_results = (scan_port(ip, port, timeout=adaptive_timeout(ip, timeout_port, PORT_TIMEOUT_FLOOR),
+                                  grab_banner=not BANNER_GRABBER_AVAILABLE)
+                        for port in ports)
+    
+    for port_res in port_results:
+        port = port_res[0]
         if port_res[1]:
             open_ports.append(port)
             if port_res[2]:
@@ -638,37 +1324,80 @@ def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8) -> Dict
                     "risk": CRITICAL_PORTS[port]
                 })
     
+    open_ports.sort()
+    open_set = frozenset(open_ports)
+    
+    # Bannières : étape séparée, sondes par protocole sur les seuls ports ouverts
+    if BANNER_GRABBER_AVAILABLE and open_ports:
+        banners = collect_banners(ip, open_ports, timeout_port, port_scanner)
+    if PORT_FREQUENCY is not None:
+        PORT_FREQUENCY.observe(open_ports)
     result["open_ports"] = open_ports
     result["banners"] = banners
     result["critical_services"] = critical_services
+    # RTT noyau et options TCP des connexions du scan (indice d'OS même sans ICMP)
+    tcp = TCP_INFO_STORE.summary(ip) if TCP_INFO_STORE is not None else None
+    if tcp is not None:
+        result["tcp"] = tcp
     
     # HTTP checks on multiple ports
     http_info = {}
-    http_ports = [80, 8000, 8080, 8443, 8888]
-    for p in http_ports:
-        if p in open_ports:
-            http_info = http_checks(ip, p, use_tls=(p in [443, 8443]))
+    http_timeout = HTTP_TIMEOUT
+    # Client keep-alive partagé par toutes les sondes web de l'hôte
+    web_client = None
+    if HTTP_CLIENT_AVAILABLE:
+        web_client = HttpClient(timeout=http_timeout,
+                                connect_timeout=adaptive_timeout(ip, HTTP_TIMEOUT, HTTP_CONNECT_TIMEOUT_FLOOR))
+    # Budget des sondes de panneaux d'admin partagé entre les ports web de l'hôte
+    web_budget = RequestBudget()
+    # Plan de sondes web : chaque URL n'est demandée qu'une fois pour tous les modules
+    web_planner = None
+    if web_client is not None and WEB_PLANNER_AVAILABLE:
+        web_budget = RequestBudget(WEB_PLAN_BUDGET)
+        web_planner = WebProbePlanner(
+            fetch=lambda url, timeout, markers, groups, head: web_plan_fetch(
+                web_client, url, timeout, markers, groups, head),
+            timeout=http_timeout, budget=web_budget, max_workers=ADMIN_PROBE_WORKERS,
+            slots=ADMIN_PROBE_SLOTS)
+        plan_web_probes(web_planner, ip, open_set)
+        web_planner.run()
+    for p in HTTP_PORTS:
+        if p in open_set:
+            http_info = http_checks(ip, p, use_tls=(p in [443, 8443]), timeout=http_timeout,
+                                    client=web_client, budget=web_budget, planner=web_planner)
             result[f"http_{p}"] = http_info
             break
     
     # HTTPS checks
-    if 443 in open_ports:
-        result["http_https"] = http_checks(ip, 443, use_tls=True)
-        result["tls"] = tls_cert_expiry(ip, 443)
+    if 443 in open_set:
+        result["http_https"] = http_checks(ip, 443, use_tls=True, timeout=http_timeout,
+                                           client=web_client, budget=web_budget, planner=web_planner)
+        result["tls"] = tls_cert_expiry(ip, 443, timeout=http_timeout, client=web_client)
         if not http_info:
             http_info = result["http_https"]
     
-    # Détection OS avancée APRÈS avoir tous les infos
-    result["os"] = detect_os_advanced(ttl, open_ports, banners, http_info)
+    # Résolution du nom d'hôte (cache d'identités, puis noms mDNS/NetBIOS/SSDP, puis PTR)
+    mac = neighbors.lookup(ip) if neighbors is not None else ""
+    identity = identify_host(ip, mac, local_names)
+    local = local_names.lookup(ip, wait=False) if local_names is not None else {}
+    if local:
+        result["local_names"] = local
+    result["identity"] = identity
     
-    # Résolution du nom d'hôte
-    hostname = get_hostname(ip)
+    # Détection OS avancée APRÈS avoir tous les infos (en lot après le scan avec le moteur d'empreintes)
+    if FINGERPRINT_ENGINE is None:
+        result["os"] = detect_os_advanced(ttl, open_ports, banners, http_info)
+        apply_cached_os(result, mac)
+    hostname = identity["hostname"]["value"] or detect_device_type(ip)
     if not hostname:
         hostname = detect_device_type_from_ports(ip, open_ports, banners, http_info)
     result["hostname"] = hostname
     
-    # Analyse des risques de sécurité
-    result["security_risks"] = analyze_security_risks(result)
+    # Analyse des risques de sécurité (en lot après le scan avec le moteur de règles)
+    if RISK_ENGINE is None:
+        result["security_risks"] = analyze_security_risks(result)
+    else:
+        result["security_risks"] = {"critical": [], "high": [], "medium": [], "low": [], "info": []}
     
     # ====== NOUVEAUX MODULES ======
     
@@ -692,7 +1421,7 @@ def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8) -> Dict
     
     # Directory Buster - Scan des répertoires/fichiers cachés (sur port 80/443)
     if DIRECTORY_BUSTER_AVAILABLE:
-        web_ports = [p for p in [80, 8080, 443, 8443] if p in open_ports]
+        web_ports = [p for p in WEB_PORTS if p in open_set]
         if web_ports:
             try:
                 # Scan rapide sur le premier port web trouvé
@@ -704,11 +1433,14 @@ def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8) -> Dict
                     port, 
                     use_https=use_https, 
                     wordlist_level="quick",
-                    max_workers=10
+                    max_workers=10,
+                    client=web_client,
+                    planner=web_planner
                 )
                 
                 result["directory_scan"] = {
                     "port": port,
+                    "wildcard": dir_results.get("wildcard", False),
                     "sensitive_files": dir_results.get("sensitive", []),
                     "found_paths": len(dir_results.get("found", [])),
                     "protected_paths": len(dir_results.get("protected", []))
@@ -726,11 +1458,177 @@ def worker_scan_host(ip: str, ports: List[int], timeout_port: float=0.8) -> Dict
             except Exception as e:
                 result["directory_scan"] = {"error": str(e)}
     
+    if web_planner is not None:
+        result["web_plan"] = dict(web_planner.stats)
+    if web_client is not None:
+        result["http_connections"] = dict(web_client.stats)
+        web_client.close()
+    
     return result
 
+class PipelineStats:
+    def __init__(self, queue_size: int):
+        """Compteurs partagés des deux étages du pipeline (thread-safe)."""
+        self.queue_size = queue_size
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.counters = {
+            "discovered": 0,
+            "live": 0,
+            "analyzed": 0,
+            "errors": 0,
+            "result_errors": 0,
+            "queue_full_waits": 0,
+            "max_queue_depth": 0
+        }
+        self.discovery_seconds = None
+        self.total_seconds = None
+    
+    def add(self, name: str, value: int = 1):
+        with self.lock:
+            self.counters[name] += value
+    
+    def observe_depth(self, depth: int):
+        with self.lock:
+            if depth > self.counters["max_queue_depth"]:
+                self.counters["max_queue_depth"] = depth
+    
+    def snapshot(self, live_queue: "queue.Queue" = None) -> Dict:
+        with self.lock:
+            snap = dict(self.counters)
+        snap["queue_size"] = self.queue_size
+        snap["queue_depth"] = live_queue.qsize() if live_queue is not None else 0
+        snap["discovery_seconds"] = self.discovery_seconds
+        snap["total_seconds"] = self.total_seconds
+        return snap
+
+def start_name_harvest(targets):
+    """Lance en arrière-plan la collecte mDNS / NetBIOS / SSDP (ou None).
+    Les requêtes unicast (PTR mDNS inverses, NetBIOS) ne visent que les petites plages."""
+    if not NAME_HARVESTER_AVAILABLE or not NAME_HARVEST_ENABLED:
+        return None
+    cache = IDENTITY_CACHE
+    # Réseau stable : noms déjà en cache, pas de nouvelle collecte avant HARVEST_TTL
+    if cache is not None and not cache.harvest_due():
+        return None
+    try:
+        unicast = targets if len(targets) <= MAX_UNICAST_TARGETS else ()
+    except TypeError:
+        unicast = ()
+    if cache is not None:
+        unicast = cache.stale(unicast)
+        cache.mark_harvest()
+    harvester = NameHarvester(window=NAME_HARVEST_WINDOW)
+    harvester.start(unicast)
+    return harvester
+
+def identity_known(ip: str, neighbors=None) -> bool:
+    """Vrai si le nom de l'hôte est en cache (positif ou négatif) : pas de PTR à envoyer."""
+    if IDENTITY_CACHE is None:
+        return False
+    mac = neighbors.lookup(ip) if neighbors is not None else ""
+    return IDENTITY_CACHE.is_fresh(ip, "hostname", mac)
+
+def run_scan_pipeline(targets, ports: List[int], deep_workers: int = 200,
+                      discovery_workers: int = 50, queue_size: int = 400,
+                      neighbors=None, on_result=None, port_scanner=None) -> Dict:
+    """
+    Pipeline en deux étages : la découverte alimente une file bornée que
+    consomme un pool d'analyse approfondie dimensionné séparément.
+    
+    Args:
+        targets: Itérable d'IPs (TargetSet ou liste), tiré lot par lot
+        deep_workers: Threads d'analyse (ports, HTTP, TLS, CVE, dirbust)
+        discovery_workers: Threads de découverte hôte par hôte (sans sweep ICMP)
+        queue_size: Capacité de la file des hôtes actifs (contre-pression)
+        on_result: Rappel appelé avec le résultat de chaque hôte
+        port_scanner: Moteur AsyncPortScanner partagé (None = scan_port threadé)
+    
+    Returns:
+        Les métriques du pipeline (profondeur de file, compteurs, durées)
+    """
+    live_queue = queue.Queue(maxsize=queue_size)
+    stats = PipelineStats(queue_size)
+    harvester = start_name_harvest(targets)
+    
+    def analyze_loop():
+        while True:
+            item = live_queue.get()
+            if item is None:
+                return
+            ip, state = item
+            try:
+                res = worker_scan_host(ip, ports, discovery=state, neighbors=neighbors,
+                                       port_scanner=port_scanner, local_names=harvester)
+            except Exception as e:
+                print(f"[!] erreur sur {ip}: {e}")
+                stats.add("errors")
+                continue
+            stats.add("analyzed")
+            # Une erreur du rappel ne doit pas tuer l'analyseur (la découverte bloquerait sur la file)
+            try:
+                on_result(res)
+            except Exception as e:
+                print(f"[!] erreur sur le résultat de {ip}: {e}")
+                stats.add("result_errors")
+    
+    def route(ip, state):
+        stats.add("discovered")
+        if state[0]:
+            stats.add("live")
+            # PTR envoyé dès la découverte : la réponse est là quand l'analyse la demande
+            resolver = get_ptr_resolver()
+            if resolver is not None and not identity_known(ip, neighbors):
+                resolver.prefetch(ip)
+            if live_queue.full():
+                stats.add("queue_full_waits")
+            # Bloque quand l'analyse est saturée : la découverte ralentit d'elle-même
+            live_queue.put((ip, state))
+            stats.observe_depth(live_queue.qsize())
+        else:
+            on_result(worker_scan_host(ip, ports, discovery=state))
+    
+    def discover_one(ip):
+        try:
+            route(ip, discover_host(ip, neighbors))
+        except Exception as e:
+            print(f"[!] erreur sur {ip}: {e}")
+            stats.add("errors")
+    
+    analyzers = [threading.Thread(target=analyze_loop, daemon=True) for _ in range(deep_workers)]
+    for t in analyzers:
+        t.start()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=discovery_workers) as discovery_pool:
+            for chunk in iter_chunks(targets, DISCOVERY_CHUNK):
+                # Découverte groupée (ICMP, ARP, TCP) si le sweep est disponible
+                if discover_hosts(chunk, neighbors, workers=discovery_workers, on_result=route):
+                    continue
+                # Sinon découverte hôte par hôte, bornée par discovery_workers
+                in_flight = set()
+                for ip in chunk:
+                    if len(in_flight) >= discovery_workers * 2:
+                        _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    in_flight.add(discovery_pool.submit(discover_one, ip))
+                wait(in_flight)
+        stats.discovery_seconds = round(time.monotonic() - stats.started, 2)
+    finally:
+        for _ in analyzers:
+            live_queue.put(None)
+        for t in analyzers:
+            t.join()
+    
+    stats.total_seconds = round(time.monotonic() - stats.started, 2)
+    snap = stats.snapshot(live_queue)
+    if harvester is not None:
+        snap["name_harvest"] = harvester.stats
+    return snap
+
 def detect_os_advanced(ttl: int, open_ports: List[int], banners: Dict, http_info: Dict) -> str:
     """Détection avancée de l'OS combinant TTL, ports et bannières."""
     os_hints = []
+    open_set = frozenset(open_ports)
     
     # Analyse du TTL
     base_os = detect_os_from_ttl(ttl)
@@ -738,15 +1636,15 @@ def detect_os_advanced(ttl: int, open_ports: List[int], banners: Dict, http_info
     
     # Détection spécifique des mobiles AVANT les autres
     # iPhone/iOS
-    if 62078 in open_ports or 7000 in open_ports or 3689 in open_ports:
+    if 62078 in open_set or 7000 in open_set or 3689 in open_set:
         return "iOS (iPhone/iPad)"
     
     # Android
-    if 8009 in open_ports or 8008 in open_ports:
+    if 8009 in open_set or 8008 in open_set:
         return "Android"
     
     # mDNS suggère iOS ou Android moderne
-    if 5353 in open_ports:
+    if 5353 in open_set:
         if ttl >= 60 and ttl <= 64:
             # TTL 64 est courant pour iOS/Android/Linux
             # Si peu de ports ouverts = probablement mobile
@@ -758,10 +1656,10 @@ def detect_os_advanced(ttl: int, open_ports: List[int], banners: Dict, http_info
         return "Mobile (iOS/Android probable)"
     
     # Analyse des ports caractéristiques
-    if 445 in open_ports or 3389 in open_ports or 135 in open_ports:
+    if 445 in open_set or 3389 in open_set or 135 in open_set:
         os_hints.append("Windows")
     
-    if 22 in open_ports and 80 in open_ports:
+    if 22 in open_set and 80 in open_set:
         # Vérifier le banner SSH
         ssh_banner = banners.get(22, "")
         if "ubuntu" in ssh_banner.lower():
@@ -783,7 +1681,7 @@ def detect_os_advanced(ttl: int, open_ports: List[int], banners: Dict, http_info
         os_hints.append("Debian Linux")
     
     # Ports Mac spécifiques
-    if 5900 in open_ports and 88 in open_ports:
+    if 5900 in open_set and 88 in open_set:
         os_hints.append("macOS")
     
     # Consolidation
@@ -808,22 +1706,23 @@ def detect_os_advanced(ttl: int, open_ports: List[int], banners: Dict, http_info
 
 def detect_device_type_from_ports(ip: str, open_ports: List[int], banners: Dict, http_info: Dict) -> str:
     """Détecte le type d'appareil basé sur les ports ouverts et les bannières."""
+    open_set = frozenset(open_ports)
     try:
         # PRIORITÉ 1: Détection des mobiles
         # iPhone/iPad
-        if 62078 in open_ports:
+        if 62078 in open_set:
             return "iPhone/iPad (Apple Home)"
-        if 7000 in open_ports:
+        if 7000 in open_set:
             return "iPhone/iPad (AirPlay)"
-        if 3689 in open_ports:
+        if 3689 in open_set:
             return "iPhone/iPad (iTunes/DAAP)"
         
         # Android
-        if 8009 in open_ports or 8008 in open_ports:
+        if 8009 in open_set or 8008 in open_set:
             return "Android (Chromecast)"
         
         # Mobile générique (mDNS + peu de ports)
-        if 5353 in open_ports and len(open_ports) <= 3:
+        if 5353 in open_set and len(open_ports) <= 3:
             return "Smartphone (iOS/Android)"
         
         # Si UNIQUEMENT mDNS ouvert = probablement mobile en veille
@@ -853,7 +1752,7 @@ def detect_device_type_from_ports(ip: str, open_ports: List[int], banners: Dict,
                 return "ESP32/ESP8266"
         
         # Serveur Web
-        if 80 in open_ports or 8080 in open_ports or 443 in open_ports:
+        if 80 in open_set or 8080 in open_set or 443 in open_set:
             server_header = http_info.get("server", "").lower()
             if "apache" in server_header:
                 return "Serveur Web Apache"
@@ -865,33 +1764,33 @@ def detect_device_type_from_ports(ip: str, open_ports: List[int], banners: Dict,
                 return f"Serveur Web ({server_header})"
         
         # Bases de données
-        if 3306 in open_ports:
+        if 3306 in open_set:
             return "Serveur MySQL/MariaDB"
-        elif 5432 in open_ports:
+        elif 5432 in open_set:
             return "Serveur PostgreSQL"
-        elif 27017 in open_ports:
+        elif 27017 in open_set:
             return "Serveur MongoDB"
-        elif 6379 in open_ports:
+        elif 6379 in open_set:
             return "Serveur Redis"
-        elif 1433 in open_ports:
+        elif 1433 in open_set:
             return "Serveur MS SQL"
         
         # Services Windows
-        if 3389 in open_ports:
+        if 3389 in open_set:
             return "PC/Serveur Windows (RDP)"
-        elif 445 in open_ports and 139 in open_ports:
+        elif 445 in open_set and 139 in open_set:
             return "PC/Serveur Windows (SMB)"
-        elif 445 in open_ports:
+        elif 445 in open_set:
             return "Appareil Windows"
         
         # Mail
-        if 25 in open_ports or 587 in open_ports:
+        if 25 in open_set or 587 in open_set:
             return "Serveur Mail (SMTP)"
-        elif 110 in open_ports or 143 in open_ports:
+        elif 110 in open_set or 143 in open_set:
             return "Serveur Mail (POP/IMAP)"
         
         # SSH uniquement
-        if 22 in open_ports and len(open_ports) <= 3:
+        if 22 in open_set and len(open_ports) <= 3:
             return "Serveur SSH/Linux"
         
         # Routeur typique
@@ -918,90 +1817,229 @@ def pretty_save(results: List[Dict], out_json: str=None, out_csv: str=None):
 def main():
     parser = argparse.ArgumentParser(description="Network scanner + basic vulnerability indicators")
     parser.add_argument("target", help="CIDR or range")
-    parser.add_argument("--workers", type=int, default=200)
-    parser.add_argument("--ports", type=str, default=",".join(map(str, DEFAULT_PORTS)))
+    parser.add_argument("--workers", type=int, default=200,
+                        help="Threads d'analyse approfondie des hôtes actifs")
+    parser.add_argument("--discovery-workers", type=int, default=50,
+                        help="Threads de découverte hôte par hôte (sans sweep ICMP)")
+    parser.add_argument("--queue-size", type=int, default=0,
+                        help="Capacité de la file découverte → analyse (défaut: 2 x workers)")
+    parser.add_argument("--ports", type=str, default=",".join(map(str, DEFAULT_PORTS)),
+                        help="Ports, plages et profils : 22,80,8000-8100 ; top1000,!135-139 ; "
+                             "top100, top1000, mobile, db, default, all")
+    parser.add_argument("--scan-engine", choices=["threaded", "async"], default="threaded",
+                        help="Moteur de scan de ports : scan_port par thread ou asyncio partagé")
+    parser.add_argument("--max-in-flight", type=int, default=512,
+                        help="Connexions simultanées maximales du moteur async")
+    parser.add_argument("--hostname-fallback", action="store_true",
+                        help="Essayer nslookup/dig/host/avahi-resolve/dns-sd si le PTR ne répond pas")
+    parser.add_argument("--no-name-harvest", action="store_true",
+                        help="Ne pas collecter les noms mDNS/NetBIOS/SSDP du segment local")
+    parser.add_argument("--no-identity-cache", action="store_true",
+                        help="Ignorer le cache des noms/identités (~/.pathfinder/identities.json)")
+    parser.add_argument("--exclude", type=str, default=None, help="CIDR/ranges à exclure")
+    parser.add_argument("--omit-down", action="store_true",
+                        help="Ne pas inclure les hôtes éteints dans les résultats")
+    parser.add_argument("--risk-rules", type=str, default=None,
+                        help="Règles de risque / poids du score (JSON) fusionnés avec les règles intégrées")
     parser.add_argument("--out-json", default="scan_report.json")
     parser.add_argument("--out-csv", default="scan_report.csv")
     args = parser.parse_args()
 
-    ips = parse_ip_range(args.target)
-    ports = [int(p) for p in args.ports.split(",") if p.strip()]
-    print(f"Scan {len(ips)} IPs sur ports {ports} avec {args.workers} workers — ceci peut prendre du temps.")
+    global HOSTNAME_SUBPROCESS_FALLBACK, NAME_HARVEST_ENABLED, IDENTITY_CACHE, RISK_ENGINE
+    HOSTNAME_SUBPROCESS_FALLBACK = args.hostname_fallback
+    NAME_HARVEST_ENABLED = not args.no_name_harvest
+    if IDENTITY_CACHE_AVAILABLE and not args.no_identity_cache:
+        IDENTITY_CACHE = IdentityCache()
+        IDENTITY_CACHE.load()
+    if args.risk_rules:
+        if not RISK_ENGINE_AVAILABLE:
+            parser.error("--risk-rules nécessite le module risk_engine")
+        try:
+            RISK_ENGINE = RiskEngine(*load_risk_config(args.risk_rules))
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"--risk-rules: {e}")
+    targets = load_targets(args.target, args.exclude)
+    try:
+        ports = load_ports(args.ports)
+    except ValueError as e:
+        parser.error(str(e))
+    total_targets = len(targets)
+    print(f"Scan {total_targets} IPs sur ports {describe_ports(ports)} avec {args.workers} workers — ceci peut prendre du temps.")
+
+    # Fréquences du scan précédent : ses ports ouverts sont sondés en premier
+    if PORT_FREQUENCY is not None and HISTORY_AVAILABLE:
+        try:
+            previous = ScanHistory().get_latest_scan()
+            if previous:
+                PORT_FREQUENCY.seed(previous.get("results", []))
+        except Exception:
+            pass
+
+    # Sur de très grandes plages, garder les hôtes éteints ferait croître la mémoire
+    omit_down = args.omit_down or total_targets > MAX_DOWN_RECORDS
+    if omit_down and not args.omit_down:
+        print(f"ℹ️  Plus de {MAX_DOWN_RECORDS} cibles : les hôtes éteints ne sont pas conservés")
+
+    # Table des voisins lue en bloc (remplie par le sweep / les pings)
+    neighbors = NeighborCache() if NEIGHBOR_CACHE_AVAILABLE else None
 
     results = []
-    with ThreadPoolExecutor(max_workers=args.workers) as ex:
-        futures = {ex.submit(worker_scan_host, ip, ports): ip for ip in ips}
-        for fut in as_completed(futures):
-            ip = futures[fut]
-            try:
-                res = fut.result()
+    down_count = 0
+    results_lock = threading.Lock()
+
+    def collect(res):
+        nonlocal down_count
+        ip = res["ip"]
+        with results_lock:
+            # print sommaire
+            if res["alive"]:
+                print(f"[+] {ip} alive — open: {res['open_ports']}")
                 results.append(res)
-                # print sommaire
-                if res["alive"]:
-                    print(f"[+] {ip} alive — open: {res['open_ports']}")
-                else:
-                    print(f"[-] {ip} down")
-            except Exception as e:
-                print(f"[!] erreur sur {ip}: {e}")
+            else:
+                print(f"[-] {ip} down")
+                down_count += 1
+                if not omit_down:
+                    results.append(res)
+
+    # Budget de sockets partagé par tous les étages (limite fd / ports éphémères)
+    governor = None
+    if RESOURCE_GOVERNOR_AVAILABLE:
+        governor = ResourceGovernor()
+        install_governor(governor)
+        print(f"🧮 Budget sockets: {governor.capacity} (fd {governor.fd_limit}, "
+              f"ports éphémères {governor.ephemeral_ports})")
+
+    port_scanner = None
+    if args.scan_engine == "async":
+        if ASYNC_PORTSCAN_AVAILABLE:
+            # Bannières lues ensuite par banner_grabber : le scan ne fait que se connecter
+            port_scanner = AsyncPortScanner(max_in_flight=args.max_in_flight,
+                                            banner_timeout=0 if BANNER_GRABBER_AVAILABLE else 1.0,
+                                            on_rtt=observe_rtt, on_connect=observe_connect, governor=governor)
+            port_scanner.start()
+        else:
+            print("⚠️  Moteur async indisponible, scan threadé utilisé")
+
+    try:
+        pipeline_stats = run_scan_pipeline(
+            targets, ports,
+            deep_workers=args.workers,
+            discovery_workers=args.discovery_workers,
+            queue_size=args.queue_size or args.workers * 2,
+            neighbors=neighbors,
+            on_result=collect,
+            port_scanner=port_scanner
+        )
+    finally:
+        if port_scanner is not None:
+            port_scanner.close()
+    print(f"📊 Pipeline: {pipeline_stats['live']}/{pipeline_stats['discovered']} hôtes actifs, "
+          f"découverte {pipeline_stats['discovery_seconds']}s, total {pipeline_stats['total_seconds']}s, "
+          f"file max {pipeline_stats['max_queue_depth']}/{pipeline_stats['queue_size']}")
+    resource_stats = governor.stats() if governor is not None else None
+    if resource_stats is not None:
+        print(f"🧮 Sockets: pic {resource_stats['peak_in_use']}/{resource_stats['capacity']}, "
+              f"attentes {resource_stats['blocked'] or '-'}, "
+              f"manques système {resource_stats['exhaustion_events'] or '-'}")
+
+    harvest_stats = pipeline_stats.get("name_harvest")
+    if harvest_stats is not None:
+        print(f"📣 Noms locaux: {harvest_stats['hosts']} appareil(s) (mDNS {harvest_stats['mdns']}, "
+              f"NetBIOS {harvest_stats['netbios']}, SSDP {harvest_stats['ssdp']} réponse(s))")
+
+    if TCP_INFO_STORE is not None and TCP_INFO_STORE.stats["captured"]:
+        print(f"📶 TCP_INFO: {TCP_INFO_STORE.stats['captured']} connexion(s) relevée(s) sur "
+              f"{TCP_INFO_STORE.stats['hosts']} hôte(s)")
+
+    resolver = get_ptr_resolver()
+    if resolver is not None:
+        print(f"🔎 PTR: {resolver.stats['answered']} nom(s), {resolver.stats['queries']} requête(s), "
+              f"{resolver.stats['retransmits']} retransmission(s)")
+        resolver.close()
+
+    if omit_down:
+        print(f"ℹ️  {down_count} hôte(s) éteint(s) non conservé(s) dans les résultats")
 
     # Fill MAC table from ARP cache (post-scan, pings should have rempli la table)
-    arp = arp_table()
+    arp = neighbors.snapshot(refresh=True) if neighbors is not None else arp_table()
     for r in results:
         if r["ip"] in arp:
             r["mac"] = arp[r["ip"]]
 
-    # Calcul du score de priorité basé sur les vulnérabilités
-    for r in results:
-        r["priority_score"] = 0
-        r["risk_level"] = "INFO"
+    # Table OUI ouverte ici seulement (première recherche), pour tout le lot
+    if OUI_LOOKUP_AVAILABLE and any(r.get("mac") for r in results):
+        identified = annotate_vendors(results)
+        print(f"🏷️  Constructeurs: {identified} MAC(s) identifiée(s) "
+              f"(registre {OUI_REGISTRY.source}, {len(OUI_REGISTRY)} préfixe(s))")
+
+    if FINGERPRINT_ENGINE is not None:
+        classify_hosts(results)
+
+    if IDENTITY_CACHE is not None:
+        update_identity_cache(IDENTITY_CACHE, results)
+        cache_stats = IDENTITY_CACHE.stats
+        saved = IDENTITY_CACHE.save()
+        print(f"🗂️  Identités: {cache_stats['hits']} en cache, {cache_stats['negative_hits']} échec(s) mémorisé(s), "
+              f"{cache_stats['updates']} mise(s) à jour{'' if saved else ' (non enregistrées)'}")
+
+    # Constats des règles de risque et score de priorité, en lot sur tout le jeu de résultats
+    if RISK_ENGINE is not None:
+        risk_stats = RISK_ENGINE.apply(results)
+        print(f"⚖️  Risques: {risk_stats['hosts']} hôte(s), {risk_stats['combinations']} combinaison(s) de ports "
+              f"évaluée(s) en {risk_stats['seconds'] * 1000:.1f} ms ({risk_stats['backend']})")
+    else:
+        # Calcul du score de priorité basé sur les vulnérabilités
+        for r in results:
+            r["priority_score"] = 0
+            r["risk_level"] = "INFO"
         
-        if not r["alive"]:
-            continue
+            if not r["alive"]:
+                continue
             
-        # Base score
-        r["priority_score"] += 1
+            # Base score
+            r["priority_score"] += 1
         
-        # Ports ouverts
-        r["priority_score"] += len(r.get("open_ports", []))
+            # Ports ouverts
+            r["priority_score"] += len(r.get("open_ports", []))
         
-        # Services critiques exposés
-        critical_services = r.get("critical_services", [])
-        r["priority_score"] += len(critical_services) * 5
+            # Services critiques exposés
+            critical_services = r.get("critical_services", [])
+            r["priority_score"] += len(critical_services) * 5
         
-        # Analyse des risques de sécurité
-        security_risks = r.get("security_risks", {})
-        critical_count = len(security_risks.get("critical", []))
-        high_count = len(security_risks.get("high", []))
-        medium_count = len(security_risks.get("medium", []))
+            # Analyse des risques de sécurité
+            security_risks = r.get("security_risks", {})
+            critical_count = len(security_risks.get("critical", []))
+            high_count = len(security_risks.get("high", []))
+            medium_count = len(security_risks.get("medium", []))
         
-        r["priority_score"] += critical_count * 10
-        r["priority_score"] += high_count * 5
-        r["priority_score"] += medium_count * 2
+            r["priority_score"] += critical_count * 10
+            r["priority_score"] += high_count * 5
+            r["priority_score"] += medium_count * 2
         
-        # Déterminer le niveau de risque global
-        if critical_count > 0:
-            r["risk_level"] = "CRITIQUE"
-        elif high_count > 0:
-            r["risk_level"] = "ÉLEVÉ"
-        elif medium_count > 0:
-            r["risk_level"] = "MOYEN"
-        elif len(r.get("open_ports", [])) > 0:
-            r["risk_level"] = "FAIBLE"
+            # Déterminer le niveau de risque global
+            if critical_count > 0:
+                r["risk_level"] = "CRITIQUE"
+            elif high_count > 0:
+                r["risk_level"] = "ÉLEVÉ"
+            elif medium_count > 0:
+                r["risk_level"] = "MOYEN"
+            elif len(r.get("open_ports", [])) > 0:
+                r["risk_level"] = "FAIBLE"
         
-        # Certificats SSL expirés ou expirant bientôt
-        tls = r.get("tls", {})
-        if tls.get("expires_in_days") is not None:
-            if tls["expires_in_days"] < 0:
-                r["priority_score"] += 8
-                if r["risk_level"] == "FAIBLE":
-                    r["risk_level"] = "MOYEN"
-            elif tls["expires_in_days"] < 30:
-                r["priority_score"] += 3
+            # Certificats SSL expirés ou expirant bientôt
+            tls = r.get("tls", {})
+            if tls.get("expires_in_days") is not None:
+                if tls["expires_in_days"] < 0:
+                    r["priority_score"] += 8
+                    if r["risk_level"] == "FAIBLE":
+                        r["risk_level"] = "MOYEN"
+                elif tls["expires_in_days"] < 30:
+                    r["priority_score"] += 3
         
-        # HTTP server header exposé
-        http = r.get("http") or r.get("http_https") or {}
-        if http.get("server"):
-            r["priority_score"] += 1
+            # HTTP server header exposé
+            http = r.get("http") or r.get("http_https") or {}
+            if http.get("server"):
+                r["priority_score"] += 1
 
     # sort by priority
     results_sorted = sorted(results, key=lambda x: x["priority_score"], reverse=True)
@@ -1039,6 +2077,8 @@ def main():
     final_results = {
         "scan_results": results_sorted,
         "comparison": comparison,
+        "pipeline": pipeline_stats,
+        "resources": resource_stats,
         "modules_status": {
             "cve_scanner": CVE_SCANNER_AVAILABLE,
             "directory_buster": DIRECTORY_BUSTER_AVAILABLE,
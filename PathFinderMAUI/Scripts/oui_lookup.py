@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+OUI Lookup Module - Constructeur d'une adresse MAC (registre IEEE hors ligne)
+Les registres IEEE MA-L / MA-M / MA-S (oui.txt, mam.txt, oui36.txt ou leurs
+versions CSV, à défaut nmap-mac-prefixes / manuf de Wireshark) sont compilés
+une fois en une table binaire triée de préfixes (~/.pathfinder/oui.bin),
+projetée en mémoire (mmap) et interrogée par bisection. Rien n'est lu avant la
+première recherche ; sans registre sur le disque, une petite table intégrée
+des constructeurs courants sert de repli.
+"""
+
+import bisect
+import csv
+import mmap
+import os
+import re
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Fichiers de registre cherchés, du plus précis au plus large
+SOURCE_NAMES = ("oui.txt", "mam.txt", "oui36.txt", "iab.txt",
+                "oui.csv", "mam.csv", "oui36.csv", "iab.csv",
+                "manuf", "nmap-mac-prefixes")
+# Emplacements des paquets ieee-data / hwdata / nmap / wireshark
+SYSTEM_DIRS = ("/usr/share/ieee-data", "/var/lib/ieee-data", "/usr/share/hwdata",
+               "/usr/share/misc", "/usr/share/nmap", "/usr/share/wireshark")
+
+# Tailles de préfixe : MA-S / IAB (36 bits), MA-M (28 bits), MA-L (24 bits)
+PREFIX_BITS = (36, 28, 24)
+MAX_VENDOR_BYTES = 255
+
+# Table compilée : en-tête, enregistrements triés (clé, décalage du nom), puis noms
+# clé = (préfixe sur 48 bits << 8) | longueur du préfixe ; un bit du décalage
+# signale un bloc MA-L dont des sous-blocs MA-M / MA-S sont attribués ailleurs
+MAGIC = b"PFOUI\x00\x00\x01"
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct("<QI")
+SPLIT_FLAG = 0x80000000
+
+# Repli sans registre : préfixes MA-L de constructeurs fréquents sur un réseau local
+BUILTIN_OUIS = {
+    "Apple, Inc.": ["000393", "000A95", "001B63", "001EC2", "002500", "28CFE9", "3C0754",
+                    "A483E7", "ACBC32", "D0817A", "F01898", "8C8590"],
+    "Samsung Electronics Co.,Ltd": ["0012FB", "001632", "002119", "5C0A5B", "8C7712", "BC1485", "F025B7"],
+    "Xiaomi Communications Co Ltd": ["286C07", "34CE00", "640980", "7C1DD9", "F8A45F"],
+    "Huawei Technologies Co.,Ltd": ["00E0FC", "001882", "00259E", "286ED4", "4846FB", "70723C"],
+    "Google, Inc.": ["1CF29A", "3C5AB4", "546009", "A47733", "F4F5D8", "F4F5E8"],
+    "Amazon Technologies Inc.": ["0C47C9", "40B4CD", "44650D", "6837E9", "74C246", "84D6D0", "F0272D", "FC65DE"],
+    "Roku, Inc.": ["B0A737", "CC6DA0", "D83134", "DC3A5E"],
+    "Sonos, Inc.": ["000E58", "5CAAFD", "949F3E", "B8E937"],
+    "Philips Lighting BV": ["001788"],
+    "Raspberry Pi Foundation": ["B827EB"],
+    "Raspberry Pi Trading Ltd": ["2CCF67", "D83ADD", "DCA632", "E45F01"],
+    "Espressif Inc.": ["18FE34", "240AC4", "246F28", "30AEA4", "5CCF7F", "84F3EB", "A4CF12", "ECFABC"],
+    "Synology Incorporated": ["001132"],
+    "QNAP Systems, Inc.": ["00089B", "245EBE"],
+    "Ubiquiti Networks Inc.": ["002722", "0418D6", "24A43C", "44D9E7", "687251", "788A20", "802AA8",
+                               "F09FC2", "FCECDA"],
+    "Routerboard.com": ["000C42", "4C5E0C", "64D154", "6C3B6B", "D4CA6D", "E48D8C"],
+    "Cisco Systems, Inc": ["00000C", "001B54"],
+    "TP-LINK TECHNOLOGIES CO.,LTD.": ["14CC20", "50C7BF", "60E327", "98DAC4", "C04A00", "EC086B", "F4F26D"],
+    "NETGEAR": ["00095B", "00146C", "001B2F", "204E7F", "28C68E", "A040A0", "C03F0E"],
+    "AVM GmbH": ["00040E", "246511", "2C91AB", "3CA62F", "444E6D", "7CFF4D", "C80E14"],
+    "FREEBOX SAS": ["0007CB", "F4CAE5"],
+    "Hangzhou Hikvision Digital Technology Co.,Ltd.": ["2857BE", "4419B6", "BCAD28", "C056E3"],
+    "Zhejiang Dahua Technology Co., Ltd.": ["3CEF8C", "9002A9", "E0508B"],
+    "Axis Communications AB": ["00408C", "ACCC8E"],
+    "Hewlett Packard": ["0001E6", "000BCD", "001185", "10604B", "3CD92B", "9C8E99"],
+    "Brother industries, LTD.": ["001BA9", "008077", "30055C"],
+    "Canon Inc.": ["000085", "001E8F", "180CAC"],
+    "Seiko Epson Corporation": ["000048", "0026AB", "64EB8C"],
+    "VMware, Inc.": ["000569", "000C29", "001C14", "005056"],
+    "PCS Systemtechnik GmbH": ["080027"],
+    "Microsoft Corporation": ["00155D"],
+    "Intel Corporate": ["001B21", "001E67", "3CA9F4", "7C7A91", "A0369F"],
+    "Dell Inc.": ["001422", "001E4F", "141877", "180373", "B8CA3A", "F01FAF"],
+}
+
+_TXT_HEX_RE = re.compile(r"^\s*([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})\s+\(hex\)\s*(.*)$")
+_TXT_BASE16_RE = re.compile(r"^\s*([0-9A-Fa-f]{12}|[0-9A-Fa-f]{6})(?:-([0-9A-Fa-f]{12}|[0-9A-Fa-f]{6}))?"
+                            r"\s+\(base 16\)\s*(.*)$")
+_PREFIX_LINE_RE = re.compile(r"^([0-9A-Fa-f][0-9A-Fa-f:.\-]*)(?:/(\d+))?\s+(.+)$")
+
+def default_table_path() -> Path:
+    return Path.home() / ".pathfinder" / "oui.bin"
+
+# ---- adresses ----
+
+def mac_to_int(mac: str) -> Optional[int]:
+    """Adresse MAC (aa:bb:.., aa-bb-.., aabb.ccdd.eeff, 0:1b:.. sans zéros) en entier 48 bits."""
+    if not mac:
+        return None
+    mac = mac.strip()
+    parts = re.split(r"[:\-]", mac)
+    digits = "".join(part.zfill(2) for part in parts) if len(parts) == 6 else mac.replace(".", "")
+    if len(digits) != 12:
+        return None
+    try:
+        return int(digits, 16)
+    except ValueError:
+        return None
+
+def is_random_mac(mac: str) -> bool:
+    """Adresse administrée localement (MAC privée / aléatoire des téléphones et PC récents)."""
+    value = mac_to_int(mac)
+    return value is not None and bool(value >> 40 & 0x02)
+
+def _prefix_key(value: int, bits: int) -> int:
+    """Clé triable d'un préfixe : bits de poids fort de l'adresse, puis longueur."""
+    return ((value >> (48 - bits)) << (48 - bits)) << 8 | bits
+
+# ---- lecture des registres ----
+
+def parse_registry(path: str) -> Iterator[Tuple[int, int, str]]:
+    """(préfixe 48 bits, longueur en bits, constructeur) d'un fichier de registre."""
+    name = os.path.basename(path).lower()
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        if name.endswith(".csv"):
+            yield from _parse_csv(f)
+        elif name.endswith(".txt"):
+            yield from _parse_ieee_txt(f)
+        else:
+            yield from _parse_prefix_lines(f)
+
+def _parse_ieee_txt(lines: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+    # Bloc IEEE : ligne "AA-BB-CC (hex)", puis "AABBCC (base 16)" (MA-L) ou la plage
+    # des 24 bits bas "D00000-DFFFFF (base 16)" (MA-M / MA-S / IAB, parfois en 48 bits)
+    oui = None
+    for line in lines:
+        match = _TXT_HEX_RE.match(line)
+        if match:
+            oui = int("".join(match.group(1, 2, 3)), 16)
+            continue
+        match = _TXT_BASE16_RE.match(line)
+        if not match:
+            continue
+        vendor = match.group(3).strip()
+        if match.group(2) is None:
+            yield int(match.group(1), 16) << 24, 24, vendor
+        elif oui is not None or len(match.group(1)) == 12:
+            low, high = int(match.group(1), 16), int(match.group(2), 16)
+            if len(match.group(1)) == 6:
+                low, high = oui << 24 | low, oui << 24 | high
+            size = high - low + 1
+            if size > 0 and size & (size - 1) == 0:
+                yield low, 48 - (size.bit_length() - 1), vendor
+        oui = None
+
+def _parse_csv(lines: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+    # Registry,Assignment,Organization Name,Organization Address (6, 7 ou 9 chiffres)
+    for row in csv.reader(lines):
+        if len(row) < 3 or not row[1] or row[1].lower() == "assignment":
+            continue
+        try:
+            value = int(row[1], 16)
+        except ValueError:
+            continue
+        bits = len(row[1]) * 4
+        if bits in PREFIX_BITS:
+            yield value << (48 - bits), bits, row[2].strip()
+
+def _parse_prefix_lines(lines: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+    # nmap-mac-prefixes ("000393 Apple") et manuf de Wireshark ("00:1B:C5:00:00:00/36<tab>court<tab>nom")
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        match = _PREFIX_LINE_RE.match(line.strip())
+        if not match:
+            continue
+        digits = re.sub(r"[:.\-]", "", match.group(1))
+        try:
+            value = int(digits, 16)
+        except ValueError:
+            continue
+        bits = int(match.group(2)) if match.group(2) else len(digits) * 4
+        vendor = match.group(3).split("\t")[-1].strip()
+        if bits > len(digits) * 4:
+            value <<= bits - len(digits) * 4
+        elif bits < len(digits) * 4:
+            value >>= len(digits) * 4 - bits
+        if bits in PREFIX_BITS:
+            yield value << (48 - bits), bits, vendor
+
+def builtin_entries() -> Iterator[Tuple[int, int, str]]:
+    for vendor, prefixes in BUILTIN_OUIS.items():
+        for prefix in prefixes:
+            yield int(prefix, 16) << 24, 24, vendor
+
+# ---- compilation ----
+
+def compile_table(entries: Iterable[Tuple[int, int, str]]) -> bytes:
+    """Table binaire triée ; un préfixe déjà vu (fichier précédent) est conservé."""
+    records: Dict[int, str] = {}
+    for value, bits, vendor in entries:
+        if bits in PREFIX_BITS and vendor:
+            records.setdefault(_prefix_key(value, bits), vendor)
+    # Blocs MA-L découpés : seuls ceux-là demandent une recherche plus longue
+    split = {_prefix_key(key >> 8, 24) for key in records if key & 0xFF != 24}
+
+    names = bytearray()
+    offsets: Dict[str, int] = {}
+    body = bytearray()
+    for key in sorted(records):
+        vendor = records[key]
+        offset = offsets.get(vendor)
+        if offset is None:
+            encoded = vendor.encode("utf-8")[:MAX_VENDOR_BYTES]
+            offset = offsets[vendor] = len(names)
+            names.append(len(encoded))
+            names += encoded
+        body += RECORD.pack(key, offset | (SPLIT_FLAG if key in split else 0))
+    return HEADER.pack(MAGIC, len(records), len(names)) + bytes(body) + bytes(names)
+
+def find_sources(dirs: Iterable[str] = None) -> List[str]:
+    """Registres présents : ~/.pathfinder d'abord, puis les répertoires système."""
+    if dirs is None:
+        dirs = [str(default_table_path().parent)] + list(SYSTEM_DIRS)
+    sources = []
+    for directory in dirs:
+        for name in SOURCE_NAMES:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                sources.append(path)
+    return sources
+
+def build_table(sources: List[str], path: str = None) -> Optional[str]:
+    """Compile les registres dans le fichier de table (remplacement atomique)."""
+    table = compile_table(entry for source in sources for entry in parse_registry(source))
+    target = Path(path) if path else default_table_path()
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(table)
+        os.replace(tmp, target)
+    except OSError:
+        return None
+    return str(target)
+
+# ---- recherche ----
+
+class _Keys:
+    """Vue séquence des clés de la table, pour bisect (rien n'est copié)."""
+    __slots__ = ("buffer", "count")
+
+    def __init__(self, buffer, count: int):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> int:
+        return RECORD.unpack_from(self.buffer, HEADER.size + index * RECORD.size)[0]
+
+class OuiRegistry:
+    def __init__(self, table_path: str = None, sources: List[str] = None):
+        """Registre paresseux : la table est ouverte (ou compilée) à la première recherche.
+        Args:
+            table_path: Table compilée (défaut ~/.pathfinder/oui.bin)
+            sources: Registres IEEE à compiler (défaut : recherche sur le disque)
+        """
+        self.table_path = Path(table_path) if table_path else default_table_path()
+        self.sources = sources
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._file = None
+        self._buffer = b""
+        self._keys = _Keys(b"", 0)
+        self._names_start = HEADER.size
+        self.source = ""
+        self.stats = {"lookups": 0, "found": 0}
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            sources = self.find_sources() if self.sources is None else self.sources
+            if sources:
+                newest = max(os.path.getmtime(source) for source in sources)
+                fresh = self.table_path.is_file() and self.table_path.stat().st_mtime >= newest
+                if (fresh or build_table(sources, str(self.table_path))) and self._open(self.table_path):
+                    self.source = str(self.table_path)
+                else:
+                    # Table non enregistrable : compilée en mémoire pour ce processus
+                    self._attach(compile_table(entry for source in sources for entry in parse_registry(source)))
+                    self.source = "mémoire"
+            elif self.table_path.is_file() and self._open(self.table_path):
+                self.source = str(self.table_path)
+            else:
+                self._attach(compile_table(builtin_entries()))
+                self.source = "intégré"
+            self._loaded = True
+
+    def find_sources(self) -> List[str]:
+        return find_sources()
+
+    def _open(self, path: Path) -> bool:
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return False
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            return False
+        if not self._attach(buffer):
+            buffer.close()
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def _attach(self, buffer) -> bool:
+        if len(buffer) < HEADER.size:
+            return False
+        magic, count, names_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or len(buffer) != HEADER.size + count * RECORD.size + names_size:
+            return False
+        self._buffer = buffer
+        self._keys = _Keys(buffer, count)
+        self._names_start = HEADER.size + count * RECORD.size
+        return True
+
+    def _find(self, key: int) -> Optional[int]:
+        """Décalage (avec drapeau) de l'enregistrement de clé exacte, ou None."""
+        keys = self._keys
+        index = bisect.bisect_left(keys, key)
+        if index < keys.count and keys[index] == key:
+            return RECORD.unpack_from(self._buffer, HEADER.size + index * RECORD.size)[1]
+        return None
+
+    def _name(self, offset: int) -> str:
+        start = self._names_start + (offset & ~SPLIT_FLAG)
+        length = self._buffer[start]
+        return bytes(self._buffer[start + 1:start + 1 + length]).decode("utf-8", errors="replace")
+
+    def _resolve(self, value: int) -> Tuple[str, bool]:
+        """(constructeur, préfixe plus long possible) ; le second indique qu'une
+        autre adresse du même OUI peut avoir un autre constructeur."""
+        if not self._loaded:
+            self._load()
+        # Préfixe le plus long : MA-M / MA-S seulement sous un bloc MA-L découpé (ou absent)
+        offset = self._find(_prefix_key(value, 24))
+        split = offset is None or bool(offset & SPLIT_FLAG)
+        if split:
+            for bits in PREFIX_BITS[:-1]:
+                longer = self._find(_prefix_key(value, bits))
+                if longer is not None:
+                    offset = longer
+                    break
+        return ("" if offset is None else self._name(offset)), split
+
+    def lookup_int(self, value: int) -> str:
+        return self._resolve(value)[0]
+
+    def lookup(self, mac: str) -> str:
+        """Constructeur de l'adresse MAC ("" si inconnue ou administrée localement)."""
+        value = mac_to_int(mac)
+        self.stats["lookups"] += 1
+        if value is None or value >> 40 & 0x02:
+            return ""
+        vendor = self.lookup_int(value)
+        if vendor:
+            self.stats["found"] += 1
+        return vendor
+
+    def lookup_many(self, macs: Iterable[str]) -> Dict[str, str]:
+        """{mac: constructeur} pour tout un lot ; une recherche par préfixe distinct."""
+        by_oui: Dict[int, str] = {}
+        vendors = {}
+        for mac in macs:
+            if mac in vendors:
+                continue
+            value = mac_to_int(mac)
+            self.stats["lookups"] += 1
+            if value is None or value >> 40 & 0x02:
+                vendors[mac] = ""
+                continue
+            oui = value >> 24
+            vendor = by_oui.get(oui)
+            if vendor is None:
+                vendor, split = self._resolve(value)
+                # Bloc découpé : le constructeur dépend des bits suivants, pas de mémoire par OUI
+                if not split:
+                    by_oui[oui] = vendor
+            vendors[mac] = vendor
+            if vendor:
+                self.stats["found"] += 1
+        return vendors
+
+    def __len__(self) -> int:
+        if not self._loaded:
+            self._load()
+        return self._keys.count
+
+    def close(self):
+        with self._lock:
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+            if self._file is not None:
+                self._file.close()
+            self._file = None
+            self._buffer = b""
+            self._keys = _Keys(b"", 0)
+            self._loaded = False
+
+# Registre partagé ; rien n'est ouvert avant la première recherche
+OUI_REGISTRY = OuiRegistry()
+
+def lookup_vendor(mac: str) -> str:
+    return OUI_REGISTRY.lookup(mac)
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+    import time
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--compile":
+        started = time.monotonic()
+        written = build_table(sys.argv[2:])
+        if written is None:
+            print("❌ Table non enregistrable")
+            sys.exit(1)
+        registry = OuiRegistry(written, sources=[])
+        print(f"🏷️  {len(registry)} préfixe(s) compilé(s) dans {written} "
+              f"en {time.monotonic() - started:.2f}s")
+        sys.exit(0)
+
+    macs = sys.argv[1:] or ["b8:27:eb:12:34:56", "00:0c:29:aa:bb:cc", "3c:07:54:01:02:03", "da:a1:19:00:00:01"]
+    started = time.perf_counter()
+    count = len(OUI_REGISTRY)
+    print(f"🏷️  Registre: {OUI_REGISTRY.source}, {count} préfixe(s), "
+          f"ouvert en {(time.perf_counter() - started) * 1000:.1f} ms")
+    for mac in macs:
+        vendor = lookup_vendor(mac)
+        print(f"  {mac:<18} {vendor or ('(adresse aléatoire)' if is_random_mac(mac) else '?')}")
+    values = [mac_to_int(mac) for mac in macs if mac_to_int(mac) is not None] * 20000
+    started = time.perf_counter()
+    for value in values:
+        OUI_REGISTRY.lookup_int(value)
+    if values:
+        print(f"⏱️  {(time.perf_counter() - started) / len(values) * 1e6:.2f} µs/recherche")
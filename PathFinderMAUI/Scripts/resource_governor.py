@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Resource Governor Module - Budget partagé de sockets / descripteurs de fichiers
+Lit RLIMIT_NOFILE et la plage de ports éphémères au démarrage, puis délivre des
+permis à chaque étage du scan. Quand les sockets manquent, les étages attendent
+au lieu d'échouer (et de rapporter à tort des ports fermés).
+"""
+
+import asyncio
+import errno
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Descripteurs gardés pour Python, stdout, fichiers, pipes de sous-processus
+FD_RESERVE = 64
+# Valeurs par défaut quand le système ne fournit pas l'information
+DEFAULT_FD_LIMIT = 512
+DEFAULT_EPHEMERAL_PORTS = 16384
+
+# Erreurs indiquant un manque de ressources (et non un port fermé)
+RESOURCE_EXHAUSTION_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.EADDRNOTAVAIL, errno.ENOBUFS}
+
+# Part maximale de la capacité par étage (évite qu'un étage affame les autres)
+DEFAULT_STAGE_SHARES = {
+    "liveness": 0.5,
+    "portscan": 0.6,
+    "http": 0.3,
+    "tls": 0.1,
+    "banner": 0.2,
+    "dirbust": 0.3,
+}
+
+def read_fd_limit(raise_soft: bool = True) -> int:
+    """Limite de descripteurs ; relève la limite souple jusqu'à la limite dure."""
+    try:
+        import resource
+    except ImportError:
+        return DEFAULT_FD_LIMIT
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if raise_soft and soft != resource.RLIM_INFINITY:
+        target = hard if hard != resource.RLIM_INFINITY else 65536
+        if target > soft:
+            try:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+                soft = target
+            except (ValueError, OSError):
+                pass
+    if soft == resource.RLIM_INFINITY:
+        return 65536
+    return soft
+
+def read_ephemeral_port_count(path: str = "/proc/sys/net/ipv4/ip_local_port_range") -> int:
+    """Nombre de ports éphémères disponibles pour les connexions sortantes."""
+    try:
+        with open(path, "r") as f:
+            low, high = (int(v) for v in f.read().split()[:2])
+        return high - low + 1
+    except (OSError, ValueError):
+        return DEFAULT_EPHEMERAL_PORTS
+
+class ResourceGovernor:
+    def __init__(self, capacity: int = None, stage_shares: Dict[str, float] = None):
+        """
+        Args:
+            capacity: Nombre total de sockets simultanés (défaut: limites système)
+            stage_shares: Part maximale de la capacité par étage
+        """
+        self.fd_limit = read_fd_limit()
+        self.ephemeral_ports = read_ephemeral_port_count()
+        if capacity is None:
+            capacity = min(self.fd_limit - FD_RESERVE, self.ephemeral_ports)
+        self.capacity = max(1, capacity)
+
+        shares = dict(DEFAULT_STAGE_SHARES)
+        shares.update(stage_shares or {})
+        self.stage_limits = {stage: max(1, int(self.capacity * share)) for stage, share in shares.items()}
+
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._stage_in_use: Dict[str, int] = {}
+        self.peak_in_use = 0
+        self.blocked: Dict[str, int] = {}
+        self.wait_seconds: Dict[str, float] = {}
+        self.exhaustion_events: Dict[str, int] = {}
+
+    def stage_limit(self, stage: str) -> int:
+        return self.stage_limits.get(stage, self.capacity)
+
+    def _available(self, stage: str, count: int) -> bool:
+        return (self._in_use + count <= self.capacity and
+                self._stage_in_use.get(stage, 0) + count <= self.stage_limit(stage))
+
+    def _take(self, stage: str, count: int):
+        self._in_use += count
+        self._stage_in_use[stage] = self._stage_in_use.get(stage, 0) + count
+        if self._in_use > self.peak_in_use:
+            self.peak_in_use = self._in_use
+
+    def try_acquire(self, stage: str, count: int = 1) -> bool:
+        """Prend `count` permis sans attendre ; False si le budget est épuisé."""
+        with self._cond:
+            if not self._available(stage, count):
+                return False
+            self._take(stage, count)
+            return True
+
+    def acquire(self, stage: str, count: int = 1, timeout: Optional[float] = None) -> bool:
+        """Prend `count` permis, en attendant qu'ils se libèrent si nécessaire."""
+        count = min(count, self.stage_limit(stage), self.capacity)
+        with self._cond:
+            if not self._available(stage, count):
+                started = time.monotonic()
+                ok = self._cond.wait_for(lambda: self._available(stage, count), timeout)
+                self._record_block(stage, time.monotonic() - started)
+                if not ok:
+                    return False
+            self._take(stage, count)
+            return True
+
+    async def acquire_async(self, stage: str, count: int = 1, poll: float = 0.01):
+        """Comme acquire(), sans bloquer la boucle d'événements appelante."""
+        if self.try_acquire(stage, count):
+            return
+        started = time.monotonic()
+        while not self.try_acquire(stage, count):
+            await asyncio.sleep(poll)
+        self.note_blocked(stage, time.monotonic() - started)
+
+    def _record_block(self, stage: str, waited: float):
+        self.blocked[stage] = self.blocked.get(stage, 0) + 1
+        self.wait_seconds[stage] = self.wait_seconds.get(stage, 0.0) + waited
+
+    def note_blocked(self, stage: str, waited: float = 0.0):
+        """Compte une attente faite hors du gouverneur (boucles événementielles)."""
+        with self._cond:
+            self._record_block(stage, waited)
+
+    def release(self, stage: str, count: int = 1):
+        with self._cond:
+            count = min(count, self._stage_in_use.get(stage, 0))
+            if count <= 0:
+                return
+            self._in_use -= count
+            self._stage_in_use[stage] -= count
+            self._cond.notify_all()
+
+    @contextmanager
+    def permit(self, stage: str, count: int = 1):
+        count = min(count, self.stage_limit(stage), self.capacity)
+        self.acquire(stage, count)
+        try:
+            yield
+        finally:
+            self.release(stage, count)
+
+    def note_exhaustion(self, stage: str):
+        """Compte une erreur système de manque de sockets malgré les permis."""
+        with self._cond:
+            self.exhaustion_events[stage] = self.exhaustion_events.get(stage, 0) + 1
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "fd_limit": self.fd_limit,
+                "ephemeral_ports": self.ephemeral_ports,
+                "capacity": self.capacity,
+                "in_use": self._in_use,
+                "peak_in_use": self.peak_in_use,
+                "blocked": dict(self.blocked),
+                "wait_seconds": {k: round(v, 3) for k, v in self.wait_seconds.items()},
+                "exhaustion_events": dict(self.exhaustion_events),
+            }
+
+# Gouverneur partagé par tous les modules du processus (None = pas de limite)
+_GOVERNOR: Optional[ResourceGovernor] = None
+
+def install_governor(governor: Optional[ResourceGovernor]):
+    global _GOVERNOR
+    _GOVERNOR = governor
+
+def get_governor() -> Optional[ResourceGovernor]:
+    return _GOVERNOR
+
+@contextmanager
+def socket_permit(stage: str, count: int = 1):
+    """Permis du gouverneur installé ; sans gouverneur, ne fait rien."""
+    governor = _GOVERNOR
+    if governor is None:
+        yield
+        return
+    with governor.permit(stage, count):
+        yield
+
+if __name__ == "__main__":
+    # Test du module
+    governor = ResourceGovernor()
+    print(f"🧮 Limite fd: {governor.fd_limit}, ports éphémères: {governor.ephemeral_ports}")
+    print(f"   Capacité: {governor.capacity} sockets simultanés")
+    for stage, limit in governor.stage_limits.items():
+        print(f"   {stage}: {limit}")
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Risk Engine Module - Règles de risque et score de priorité déclaratifs
+Les règles (ports ouverts, seuils sur les données HTTP/TLS de l'hôte) et les
+poids du score sont des données ; les ports sont compilés en masques de bits.
+L'évaluation se fait en lot sur tout le jeu de résultats : les prédicats de
+ports une fois par combinaison distincte de ports ouverts, puis le comptage et
+le score en colonnes (NumPy si disponible, listes Python sinon). Le même moteur
+recalcule les scores de scans enregistrés sans rescanner.
+"""
+
+import copy
+import json
+import math
+import string
+import time
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+
+# Règles (toutes les conditions requises) :
+#   ports_any / ports_all / ports_none : au moins un / tous / aucun de ces ports ouverts
+#   min : {colonne: seuil} sur les colonnes de l'hôte (voir COLUMNS)
+#   per_port : {port: "Service - Vulnérabilité"}, un constat par port ouvert de la table
+# finding : constat ajouté à security_risks[severity] ; {ports} (ports ouverts de la règle)
+# et les colonnes de l'hôte sont substitués dans les textes.
+RISK_RULES = [
+    {"id": "critical_port", "severity": "critical", "per_port": {
+        21: "FTP - Credentials en clair",
+        22: "SSH - Brute force possible",
+        23: "Telnet - Non sécurisé",
+        25: "SMTP - Relais ouvert possible",
+        53: "DNS - Zone transfer possible",
+        139: "NetBIOS - Énumération Windows",
+        445: "SMB - EternalBlue, partages ouverts",
+        1433: "MSSQL - Injection SQL",
+        3306: "MySQL - Injection SQL",
+        3389: "RDP - Brute force",
+        5432: "PostgreSQL - Injection SQL",
+        5900: "VNC - Mots de passe faibles",
+        6379: "Redis - Non authentifié par défaut",
+        8080: "HTTP-Alt - Interfaces admin exposées",
+        9200: "Elasticsearch - Accès non authentifié",
+        27017: "MongoDB - NoSQL injection",
+    }},
+    {"id": "ftp_anonymous", "severity": "high", "ports_any": [21],
+     "finding": {"type": "FTP Anonymous", "description": "FTP pourrait autoriser l'accès anonyme"}},
+    {"id": "telnet", "severity": "critical", "ports_any": [23],
+     "finding": {"type": "Telnet", "description": "Protocole non chiffré - Credentials visibles"}},
+    {"id": "http_without_https", "severity": "medium", "ports_any": [80], "ports_none": [443],
+     "finding": {"type": "HTTP sans HTTPS", "description": "Pas de chiffrement - Données en clair"}},
+    {"id": "smb_exposed", "severity": "high", "ports_any": [445, 139],
+     "finding": {"type": "SMB exposé", "description": "Vulnérable à EternalBlue, énumération possible"}},
+    {"id": "rdp_exposed", "severity": "high", "ports_any": [3389],
+     "finding": {"type": "RDP exposé", "description": "Cible de brute force, vulnérable à BlueKeep"}},
+    {"id": "exposed_database", "severity": "critical", "ports_any": [1433, 3306, 5432, 27017, 6379, 9200],
+     "finding": {"type": "Base de données exposée", "description": "Ports DB ouverts: {ports} - Risque d'injection"}},
+    {"id": "admin_panels", "severity": "critical", "min": {"admin_panels": 1},
+     "finding": {"type": "Interfaces admin exposées",
+                 "description": "{admin_panels} interface(s) d'administration accessible(s) publiquement"}},
+]
+
+# Poids du score de priorité et niveaux de risque
+SCORING = {
+    "base": 1,
+    "per_open_port": 1,
+    "per_critical_service": 5,
+    "severity": {"critical": 10, "high": 5, "medium": 2, "low": 0, "info": 0},
+    "tls_expired": 8,
+    "tls_expiring": 3,
+    "tls_expiring_days": 30,
+    "http_server": 1,
+    # Premier niveau dont la sévérité a au moins un constat, sinon FAIBLE si des ports sont ouverts
+    "levels": [["critical", "CRITIQUE"], ["high", "ÉLEVÉ"], ["medium", "MOYEN"]],
+    "open_ports_level": "FAIBLE",
+    "default_level": "INFO",
+    # Certificat expiré : relève ces niveaux
+    "tls_expired_raise": {"FAIBLE": "MOYEN"},
+}
+
+# Colonnes de l'hôte utilisables dans "min" et dans les textes des constats
+COLUMNS = ("open_ports", "critical_services", "admin_panels", "http_server")
+
+class RiskRule:
+    __slots__ = ("index", "id", "severity", "any_mask", "all_mask", "none_mask", "per_port",
+                 "per_port_mask", "minimums", "finding", "port_order", "per_combo")
+
+    def __init__(self, index: int, spec: Dict, port_bits: Dict[int, int]):
+        self.index = index
+        self.id = spec.get("id", f"rule_{index}")
+        self.severity = spec.get("severity", "medium")
+        if self.severity not in SEVERITIES:
+            raise ValueError(f"Sévérité inconnue: {self.severity}")
+        self.any_mask = _mask(spec.get("ports_any", ()), port_bits)
+        self.all_mask = _mask(spec.get("ports_all", ()), port_bits)
+        self.none_mask = _mask(spec.get("ports_none", ()), port_bits)
+        self.per_port = {int(port): text for port, text in spec.get("per_port", {}).items()}
+        self.per_port_mask = _mask(self.per_port, port_bits)
+        self.minimums = tuple((column, spec["min"][column]) for column in spec.get("min", {}))
+        for column, _ in self.minimums:
+            if column not in COLUMNS:
+                raise ValueError(f"Colonne inconnue dans la règle {self.id}: {column}")
+        self.finding = spec.get("finding", {})
+        # Ports cités par {ports} : ceux de ports_any / ports_all
+        self.port_order = frozenset(int(port) for port in list(spec.get("ports_any", ())) + list(spec.get("ports_all", ())))
+        # Constats ne dépendant que des ports ouverts : construits une fois par combinaison
+        fields = {field for value in self.finding.values() if isinstance(value, str)
+                  for _, field, _, _ in string.Formatter().parse(value) if field}
+        self.per_combo = not self.minimums and not fields & set(COLUMNS)
+
+    def combo_count(self, mask: int) -> int:
+        """Constats de la règle pour un masque de ports ouverts (conditions de ports seules)."""
+        if self.any_mask and not mask & self.any_mask:
+            return 0
+        if self.all_mask and mask & self.all_mask != self.all_mask:
+            return 0
+        if mask & self.none_mask:
+            return 0
+        if self.per_port_mask:
+            return bin(mask & self.per_port_mask).count("1")
+        return 1
+
+    def findings(self, open_ports: List[int], row: Dict) -> List[Dict]:
+        if self.per_port:
+            out = []
+            for port in open_ports:
+                text = self.per_port.get(port)
+                if text is not None:
+                    out.append({
+                        "port": port,
+                        "service": text.split(" - ")[0],
+                        "vulnerability": text.split(" - ")[1] if " - " in text else "Service sensible exposé",
+                        "rule": self.id,
+                    })
+            return out
+        values = dict(row, ports=[port for port in open_ports if port in self.port_order])
+        finding = {key: value.format(**values) if isinstance(value, str) else value
+                   for key, value in self.finding.items()}
+        finding["rule"] = self.id
+        return [finding]
+
+def _mask(ports: Iterable[int], port_bits: Dict[int, int]) -> int:
+    mask = 0
+    for port in ports:
+        mask |= port_bits[int(port)]
+    return mask
+
+def _web_info(host: Dict) -> Dict:
+    # Même lecture que l'analyse historique : "http" puis "http_https"
+    return host.get("http") or host.get("http_https") or {}
+
+class RiskEngine:
+    def __init__(self, rules: List[Dict] = None, scoring: Dict = None):
+        """Compile les règles (RISK_RULES par défaut) et les poids (SCORING par défaut)."""
+        self.compile(RISK_RULES if rules is None else rules, SCORING if scoring is None else scoring)
+
+    def compile(self, rules: List[Dict], scoring: Dict):
+        ports = dict.fromkeys(int(port) for spec in rules
+                              for key in ("ports_any", "ports_all", "ports_none", "per_port")
+                              for port in spec.get(key, ()))
+        self.port_bits = {port: 1 << bit for bit, port in enumerate(ports)}
+        self.rules = [RiskRule(index, spec, self.port_bits) for index, spec in enumerate(rules)]
+        self.port_rules = [rule for rule in self.rules if rule.any_mask or rule.all_mask or rule.none_mask
+                           or rule.per_port_mask]
+        self.rule_ids = frozenset(rule.id for rule in self.rules)
+        # Constats historiques sans identifiant de règle : reconnus à leur type
+        self.rule_types = frozenset(rule.finding.get("type") for rule in self.rules if rule.finding.get("type"))
+        self.scoring = scoring
+        self.levels = [level for _, level in scoring["levels"]] + [scoring["open_ports_level"], scoring["default_level"]]
+        self.backend = "numpy" if NUMPY_AVAILABLE else "python"
+
+    def port_mask(self, open_ports: Iterable[int]) -> int:
+        bits = self.port_bits
+        mask = 0
+        for port in open_ports:
+            mask |= bits.get(port, 0)
+        return mask
+
+    def is_rule_finding(self, item: Dict) -> bool:
+        """Constat produit par une règle (à recalculer), par opposition aux CVE / fichiers sensibles."""
+        rule = item.get("rule")
+        if rule is not None:
+            return True
+        return "vulnerability" in item or item.get("type") in self.rule_types
+
+    # ---- évaluation en lot ----
+
+    def apply(self, hosts: List[Dict], findings: bool = True) -> Dict:
+        """
+        Évalue règles et score sur tout le lot ; écrit priority_score et risk_level.
+        findings=True : security_risks reconstruit (constats des règles, puis les autres
+        constats déjà présents : CVE, fichiers sensibles) ; False : seulement le score.
+        Retourne des statistiques (hôtes, combinaisons de ports, moteur, durée).
+        """
+        started = time.perf_counter()
+        alive = [host for host in hosts if host.get("alive")]
+        combos: Dict[Tuple[int, ...], int] = {}
+        combo_ids = []
+        extras = {severity: [0] * len(alive) for severity in SEVERITIES}
+        columns = {column: [] for column in COLUMNS}
+        tls_days = []
+        for index, host in enumerate(alive):
+            open_ports = host.get("open_ports") or []
+            key = tuple(open_ports)
+            combo = combos.get(key)
+            if combo is None:
+                combo = combos[key] = len(combos)
+            combo_ids.append(combo)
+            risks = host.get("security_risks")
+            if risks:
+                for severity, items in risks.items():
+                    if items and severity in extras:
+                        extras[severity][index] = sum(1 for item in items if not self.is_rule_finding(item))
+            web = _web_info(host)
+            columns["open_ports"].append(len(open_ports))
+            columns["critical_services"].append(len(host.get("critical_services") or ()))
+            columns["admin_panels"].append(len(web.get("admin_panels") or ()))
+            columns["http_server"].append(1 if web.get("server") else 0)
+            days = (host.get("tls") or {}).get("expires_in_days")
+            tls_days.append(math.nan if days is None else float(days))
+
+        # Prédicats de ports : une fois par combinaison distincte de ports ouverts
+        masks = [self.port_mask(key) for key in combos]
+        combo_counts = [[rule.combo_count(mask) for mask in masks] if rule in self.port_rules else None
+                        for rule in self.rules]
+
+        evaluate = self._evaluate_numpy if self.backend == "numpy" else self._evaluate_python
+        scores, levels, hits = evaluate(combo_ids, combo_counts, extras, columns, tls_days)
+
+        for index, host in enumerate(alive):
+            host["priority_score"] = scores[index]
+            host["risk_level"] = levels[index]
+        for host in hosts:
+            if not host.get("alive"):
+                host["priority_score"] = 0
+                host["risk_level"] = "INFO"
+
+        if findings:
+            self._write_findings(alive, combo_ids, hits, columns)
+        return {"hosts": len(alive), "combinations": len(combos), "backend": self.backend,
+                "seconds": round(time.perf_counter() - started, 4)}
+
+    def _evaluate_python(self, combo_ids, combo_counts, extras, columns, tls_days):
+        counts = {severity: list(values) for severity, values in extras.items()}
+        hits = []
+        for rule, per_combo in zip(self.rules, combo_counts):
+            rule_hits = [per_combo[combo] for combo in combo_ids] if per_combo is not None else [1] * len(combo_ids)
+            for column, minimum in rule.minimums:
+                rule_hits = [count if value >= minimum else 0 for count, value in zip(rule_hits, columns[column])]
+            total = counts[rule.severity]
+            counts[rule.severity] = [a + b for a, b in zip(total, rule_hits)]
+            hits.append(rule_hits)
+
+        weights = self.scoring
+        severity_weights = weights["severity"]
+        expiring_days = weights["tls_expiring_days"]
+        scores, levels = [], []
+        level_rules = weights["levels"]
+        raise_expired = weights["tls_expired_raise"]
+        for index in range(len(combo_ids)):
+            open_ports = columns["open_ports"][index]
+            score = (weights["base"] + weights["per_open_port"] * open_ports
+                     + weights["per_critical_service"] * columns["critical_services"][index]
+                     + sum(severity_weights.get(severity, 0) * counts[severity][index] for severity in SEVERITIES)
+                     + weights["http_server"] * columns["http_server"][index])
+            level = next((label for severity, label in level_rules if counts[severity][index] > 0), None)
+            if level is None:
+                level = weights["open_ports_level"] if open_ports > 0 else weights["default_level"]
+            days = tls_days[index]
+            if days < 0:
+                score += weights["tls_expired"]
+                level = raise_expired.get(level, level)
+            elif days < expiring_days:
+                score += weights["tls_expiring"]
+            scores.append(score)
+            levels.append(level)
+        return scores, levels, hits
+
+    def _evaluate_numpy(self, combo_ids, combo_counts, extras, columns, tls_days):
+        size = len(combo_ids)
+        combo = np.asarray(combo_ids, dtype=np.int64)
+        counts = {severity: np.asarray(values, dtype=np.int64) for severity, values in extras.items()}
+        cols = {column: np.asarray(values, dtype=np.int64) for column, values in columns.items()}
+        hits = []
+        for rule, per_combo in zip(self.rules, combo_counts):
+            rule_hits = (np.asarray(per_combo, dtype=np.int64)[combo] if per_combo is not None
+                         else np.ones(size, dtype=np.int64))
+            for column, minimum in rule.minimums:
+                rule_hits = rule_hits * (cols[column] >= minimum)
+            counts[rule.severity] = counts[rule.severity] + rule_hits
+            hits.append(rule_hits)
+
+        weights = self.scoring
+        score = (weights["base"] + weights["per_open_port"] * cols["open_ports"]
+                 + weights["per_critical_service"] * cols["critical_services"]
+                 + weights["http_server"] * cols["http_server"])
+        for severity in SEVERITIES:
+            score = score + weights["severity"].get(severity, 0) * counts[severity]
+        days = np.asarray(tls_days, dtype=np.float64)
+        # NaN (pas de certificat) : toutes les comparaisons sont fausses
+        expired = days < 0
+        expiring = (days >= 0) & (days < weights["tls_expiring_days"])
+        score = score + weights["tls_expired"] * expired + weights["tls_expiring"] * expiring
+
+        conditions = [counts[severity] > 0 for severity, _ in weights["levels"]] + [cols["open_ports"] > 0]
+        level_index = np.select(conditions, list(range(len(conditions))), default=len(conditions))
+        for source, target in weights["tls_expired_raise"].items():
+            if source in self.levels and target in self.levels:
+                level_index = np.where(expired & (level_index == self.levels.index(source)),
+                                       self.levels.index(target), level_index)
+        levels = [self.levels[index] for index in level_index.tolist()]
+        return score.tolist(), levels, [rule_hits.tolist() for rule_hits in hits]
+
+    def _write_findings(self, alive: List[Dict], combo_ids: List[int], hits: List[List[int]],
+                        columns: Dict[str, List[int]]):
+        cache: Dict[Tuple[int, int], List[Dict]] = {}
+        for index, host in enumerate(alive):
+            previous = host.get("security_risks")
+            risks = {severity: [] for severity in SEVERITIES}
+            for rule, rule_hits in zip(self.rules, hits):
+                if not rule_hits[index]:
+                    continue
+                if rule.per_combo:
+                    key = (rule.index, combo_ids[index])
+                    found = cache.get(key)
+                    if found is None:
+                        found = cache[key] = rule.findings(host.get("open_ports") or [], {})
+                    # Copies : chaque hôte garde ses propres constats
+                    risks[rule.severity].extend(dict(item) for item in found)
+                else:
+                    row = {column: columns[column][index] for column in COLUMNS}
+                    risks[rule.severity].extend(rule.findings(host.get("open_ports") or [], row))
+            if previous:
+                for severity, items in previous.items():
+                    if items and severity in risks:
+                        risks[severity].extend(item for item in items if not self.is_rule_finding(item))
+            host["security_risks"] = risks
+
+    def findings(self, host: Dict) -> Dict[str, List[Dict]]:
+        """Constats des règles pour un seul hôte (même forme que analyze_security_risks)."""
+        probe = dict(host, alive=True, security_risks={})
+        self.apply([probe])
+        return probe["security_risks"]
+
+def load_config(path: str) -> Tuple[List[Dict], Dict]:
+    """
+    Règles et poids d'un fichier JSON {"rules": [...], "scoring": {...}} fusionnés avec
+    la base intégrée : une règle de même id remplace l'intégrée ("disabled": true la retire),
+    les poids donnés remplacent ceux de SCORING.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError("Le fichier de règles de risque doit être un objet {rules, scoring}")
+    rules = {rule["id"]: rule for rule in RISK_RULES}
+    for rule in config.get("rules", []):
+        if "id" not in rule:
+            raise ValueError("Chaque règle de risque doit avoir un id")
+        if rule.get("disabled"):
+            rules.pop(rule["id"], None)
+        else:
+            rules[rule["id"]] = rule
+    scoring = copy.deepcopy(SCORING)
+    for key, value in config.get("scoring", {}).items():
+        if isinstance(value, dict) and isinstance(scoring.get(key), dict):
+            scoring[key].update(value)
+        else:
+            scoring[key] = value
+    return list(rules.values()), scoring
+
+if __name__ == "__main__":
+    # Test du module : recalcul des scores de scans enregistrés (historique par défaut)
+    import argparse
+    from collections import Counter
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Recalcule les risques et scores de scans enregistrés")
+    parser.add_argument("paths", nargs="*", help="Fichiers de scan JSON (défaut: ~/.pathfinder/history)")
+    parser.add_argument("--rules", help="Règles / poids JSON ajoutés à la base intégrée")
+    parser.add_argument("--write", action="store_true", help="Réécrire les fichiers avec les nouveaux scores")
+    args = parser.parse_args()
+
+    engine = RiskEngine(*load_config(args.rules)) if args.rules else RiskEngine()
+    paths = [Path(path) for path in args.paths] or sorted((Path.home() / ".pathfinder" / "history").glob("scan_*.json"))
+    total_hosts = 0
+    total_seconds = 0.0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        hosts = data.get("results", []) if isinstance(data, dict) else data
+        before = Counter(host.get("risk_level", "INFO") for host in hosts)
+        stats = engine.apply(hosts, findings=args.write)
+        after = Counter(host["risk_level"] for host in hosts)
+        total_hosts += len(hosts)
+        total_seconds += stats["seconds"]
+        changed = {level: after[level] - before[level] for level in set(before) | set(after) if after[level] != before[level]}
+        print(f"⚖️  {path.name}: {len(hosts)} hôte(s), {stats['combinations']} combinaison(s) de ports, "
+              f"{stats['seconds'] * 1000:.1f} ms{f', niveaux {changed}' if changed else ''}")
+        if args.write and isinstance(data, dict):
+            if "statistics" in data:
+                from scan_history import ScanHistory
+                data["statistics"] = ScanHistory(str(path.parent))._calculate_statistics(hosts)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            tmp.replace(path)
+    if total_hosts:
+        print(f"📊 {total_hosts} hôte(s) en {total_seconds:.2f}s ({engine.backend}, "
+              f"{total_hosts / max(total_seconds, 1e-9):.0f} hôtes/s)")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+RTT Estimator Module - Timeouts adaptatifs basés sur le RTT mesuré
+SRTT/RTTVAR à la manière de TCP (RFC 6298), par hôte et par /24, alimentés
+par les réponses ICMP et les connexions TCP abouties.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+# Gains de lissage RFC 6298
+ALPHA = 1 / 8
+BETA = 1 / 4
+K = 4
+# Granularité minimale de la variance (en secondes)
+CLOCK_GRANULARITY = 0.001
+
+class RttEstimator:
+    def __init__(self):
+        """Estimations (srtt, rttvar) par hôte et par sous-réseau /24."""
+        self._hosts: Dict[str, Tuple[float, float]] = {}
+        self._subnets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def subnet_key(ip: str) -> str:
+        return ip.rsplit(".", 1)[0]
+
+    @staticmethod
+    def _update(entry: Optional[Tuple[float, float]], rtt: float) -> Tuple[float, float]:
+        if entry is None:
+            return rtt, rtt / 2
+        srtt, rttvar = entry
+        rttvar = (1 - BETA) * rttvar + BETA * abs(srtt - rtt)
+        srtt = (1 - ALPHA) * srtt + ALPHA * rtt
+        return srtt, rttvar
+
+    def observe(self, ip: str, rtt: float):
+        """Enregistre un échantillon de RTT (en secondes) pour l'hôte."""
+        if rtt < 0:
+            return
+        subnet = self.subnet_key(ip)
+        with self._lock:
+            self._hosts[ip] = self._update(self._hosts.get(ip), rtt)
+            self._subnets[subnet] = self._update(self._subnets.get(subnet), rtt)
+
+    def estimate(self, ip: str) -> Optional[Tuple[float, float]]:
+        """(srtt, rttvar) de l'hôte, sinon de son /24, sinon None."""
+        with self._lock:
+            entry = self._hosts.get(ip)
+            if entry is None:
+                entry = self._subnets.get(self.subnet_key(ip))
+            return entry
+
+    def timeout(self, ip: str, default: float, floor: float, ceiling: float) -> float:
+        """
+        Timeout dérivé du RTT : SRTT + max(G, K*RTTVAR), borné par floor/ceiling.
+        Retourne `default` tant qu'aucune mesure n'existe pour l'hôte ni son /24.
+        """
+        entry = self.estimate(ip)
+        if entry is None:
+            return default
+        srtt, rttvar = entry
+        rto = srtt + max(CLOCK_GRANULARITY, K * rttvar)
+        return max(floor, min(ceiling, rto))
+
+if __name__ == "__main__":
+    # Test du module
+    estimator = RttEstimator()
+    for sample in (0.0004, 0.0003, 0.0005, 0.0003):
+        estimator.observe("192.168.1.10", sample)
+    estimator.observe("10.8.0.5", 0.080)
+
+    for ip in ("192.168.1.10", "192.168.1.20", "10.8.0.5", "172.16.0.1"):
+        print(f"⏱️  {ip}: timeout port = {estimator.timeout(ip, 0.8, 0.05, 0.8):.3f}s")
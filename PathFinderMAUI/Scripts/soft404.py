@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Soft-404 Module - Empreinte des réponses "page inexistante" d'un serveur web
+Beaucoup d'interfaces embarquées répondent 200 (ou redirigent vers la page de
+connexion) pour n'importe quel chemin. Quelques chemins aléatoires servent de
+référence par hôte ; les réponses qui leur ressemblent (statut, redirection,
+taille, simhash du début du corps) sont écartées avant toute analyse.
+"""
+
+import hashlib
+import re
+import secrets
+import urllib.parse
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Chemins aléatoires demandés pour établir la référence
+BASELINE_SUFFIXES = ("", ".php", "/")
+# Tranche de taille (octets) ; tranches voisines acceptées (chemin reflété dans la page)
+LENGTH_BUCKET = 128
+# Distance de Hamming maximale entre deux simhash 64 bits "identiques"
+SIMHASH_THRESHOLD = 6
+
+_TOKEN_RE = re.compile(rb"[a-z0-9_]+")
+
+def is_positive(status: int) -> bool:
+    """Statut qu'une sonde compterait comme "chemin existant"."""
+    return 200 <= status < 400 or status in (401, 403)
+
+def simhash(data: bytes) -> int:
+    """Simhash 64 bits des mots (résiste aux jetons, dates et compteurs variables)."""
+    weights = [0] * 64
+    for token in _TOKEN_RE.findall(data.lower()):
+        value = int.from_bytes(hashlib.blake2b(token, digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+def _strip_path(data: bytes, path: str) -> bytes:
+    """Retire le chemin demandé (souvent reflété dans la page d'erreur)."""
+    for variant in {path, urllib.parse.quote(path)}:
+        if variant:
+            data = re.sub(re.escape(variant.encode("utf-8", errors="ignore")), b"", data, flags=re.I)
+    return data
+
+class ResponseFingerprint:
+    __slots__ = ("status", "location", "length", "simhash")
+
+    def __init__(self, path: str, status: int, headers, body_prefix: bytes):
+        self.status = status
+        location = headers.get("Location", "") if headers else ""
+        self.location = _strip_path(location.encode("utf-8", errors="ignore"), path)
+        content_length = headers.get("Content-Length") if headers else None
+        length = int(content_length) if content_length and content_length.isdigit() else len(body_prefix)
+        self.length = max(0, length - len(path))
+        self.simhash = simhash(_strip_path(body_prefix, path))
+
+    def matches(self, other: "ResponseFingerprint") -> bool:
+        return (self.status == other.status
+                and self.location == other.location
+                and abs(self.length // LENGTH_BUCKET - other.length // LENGTH_BUCKET) <= 1
+                and bin(self.simhash ^ other.simhash).count("1") <= SIMHASH_THRESHOLD)
+
+class WildcardBaseline:
+    def __init__(self, base_url: str, fingerprints: List[ResponseFingerprint], probes: int):
+        """
+        Args:
+            base_url: scheme://hôte:port de référence
+            fingerprints: Empreintes des réponses "positives" aux chemins aléatoires
+            probes: Nombre de chemins aléatoires qui ont obtenu une réponse
+        """
+        self.base_url = base_url
+        self.fingerprints = fingerprints
+        self.probes = probes
+
+    @property
+    def wildcard(self) -> bool:
+        """Tous les chemins aléatoires "existent" : le serveur répond à tout."""
+        return self.probes > 0 and len(self.fingerprints) == self.probes
+
+    def needs_content(self, status: int) -> bool:
+        """Vrai si le début du corps est nécessaire pour juger cette réponse."""
+        return bool(self.fingerprints) and is_positive(status)
+
+    def is_soft404(self, path: str, status: int, headers, body_prefix: bytes) -> bool:
+        """Vrai si la réponse ressemble à celle d'un chemin inexistant."""
+        if not self.fingerprints or not is_positive(status):
+            return False
+        fingerprint = ResponseFingerprint(path, status, headers, body_prefix)
+        return any(fingerprint.matches(reference) for reference in self.fingerprints)
+
+def baseline_paths() -> List[str]:
+    """Chemins aléatoires (inexistants) à demander pour la référence."""
+    token = secrets.token_hex(8)
+    return [f"/{token}{suffix}" for suffix in BASELINE_SUFFIXES]
+
+def build_baseline(base_url: str, responses: List[Tuple[str, Optional[Tuple[int, Dict, bytes]]]]) -> WildcardBaseline:
+    """Référence à partir de [(chemin, (status, headers, début du corps) ou None)]."""
+    fingerprints = []
+    probes = 0
+    for path, response in responses:
+        if response is None:
+            continue
+        probes += 1
+        status, headers, body_prefix = response
+        if is_positive(status):
+            fingerprints.append(ResponseFingerprint(path, status, headers, body_prefix))
+    return WildcardBaseline(base_url, fingerprints, probes)
+
+def probe_baseline(base_url: str, fetch: Callable[[str], Tuple[int, Dict, bytes]]) -> WildcardBaseline:
+    """Demande les chemins aléatoires avec fetch(url) et construit la référence."""
+    responses = []
+    for path in baseline_paths():
+        try:
+            responses.append((path, fetch(base_url.rstrip("/") + path)))
+        except Exception:
+            responses.append((path, None))
+    return build_baseline(base_url, responses)
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    try:
+        from http_client import HttpClient
+    except ImportError:
+        print("http_client indisponible")
+        sys.exit(1)
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 soft404.py <url_de_base> [chemin,chemin,...]")
+        sys.exit(1)
+
+    base = sys.argv[1].rstrip("/")
+    with HttpClient() as client:
+        def fetch(url):
+            response = client.get(url, keep_body=False, body_prefix=512, follow_redirects=False)
+            return response.status, response.headers, response.body
+
+        baseline = probe_baseline(base, fetch)
+        print(f"🎭 {base}: {len(baseline.fingerprints)}/{baseline.probes} chemin(s) aléatoire(s) "
+              f"trouvé(s){' - wildcard' if baseline.wildcard else ''}")
+        for path in (sys.argv[2].split(",") if len(sys.argv) > 2 else []):
+            status, headers, body = fetch(base + path)
+            verdict = "soft-404" if baseline.is_soft404(path, status, headers, body) else "réel"
+            print(f"  {path:<20} {status} {verdict}")
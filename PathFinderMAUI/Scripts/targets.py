@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Targets Module - Ensemble de cibles IPv4 stocké en intervalles d'entiers
+Plusieurs CIDR/plages, exclusions et dédoublonnage par fusion d'intervalles ;
+les adresses sont produites à la demande, entrelacées entre les sous-réseaux.
+"""
+
+import ipaddress
+import itertools
+import re
+import socket
+import struct
+from typing import Iterable, Iterator, List, Tuple
+
+INVALID_RANGE_MESSAGE = "Plage IP invalide. Utilise CIDR (ex: 192.168.1.0/24) ou range (192.168.1.1-254)"
+
+def ip_to_int(ip: str) -> int:
+    return int(ipaddress.IPv4Address(ip))
+
+def int_to_ip(value: int) -> str:
+    return socket.inet_ntoa(struct.pack("!I", value))
+
+def parse_entry(entry: str, hosts_only: bool = True) -> Tuple[int, int]:
+    """
+    Convertit une entrée (CIDR, plage ou IP) en intervalle inclusif (début, fin).
+
+    Args:
+        hosts_only: Pour un CIDR, ignorer les adresses réseau et broadcast
+    """
+    try:
+        if "/" in entry:
+            net = ipaddress.ip_network(entry, strict=False)
+            if net.version != 4:
+                raise ValueError(INVALID_RANGE_MESSAGE)
+            first, last = int(net.network_address), int(net.broadcast_address)
+            # Même sémantique que net.hosts() : sans réseau ni broadcast
+            if hosts_only and net.prefixlen <= 30:
+                first, last = first + 1, last - 1
+            return first, last
+
+        if "-" in entry:
+            left, right = entry.split("-", 1)
+            start = ip_to_int(left)
+            if re.match(r"^\d+$", right):
+                # Forme courte 192.168.1.10-254 : dernier octet seulement
+                end = (start & 0xFFFFFF00) | int(right)
+                if int(right) > 255:
+                    raise ValueError(INVALID_RANGE_MESSAGE)
+            else:
+                end = ip_to_int(right)
+            if end < start:
+                raise ValueError(INVALID_RANGE_MESSAGE)
+            return start, end
+
+        value = ip_to_int(entry)
+        return value, value
+    except ValueError:
+        raise ValueError(INVALID_RANGE_MESSAGE)
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Trie et fusionne les intervalles qui se chevauchent ou se touchent."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def subtract_intervals(intervals: List[Tuple[int, int]],
+                       excluded: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Retire les intervalles exclus (les deux listes sont fusionnées et triées)."""
+    out: List[Tuple[int, int]] = []
+    i = 0
+    for start, end in intervals:
+        while i < len(excluded) and excluded[i][1] < start:
+            i += 1
+        j = i
+        cursor = start
+        while j < len(excluded) and excluded[j][0] <= end:
+            ex_start, ex_end = excluded[j]
+            if ex_start > cursor:
+                out.append((cursor, ex_start - 1))
+            cursor = max(cursor, ex_end + 1)
+            j += 1
+        if cursor <= end:
+            out.append((cursor, end))
+    return out
+
+class TargetSet:
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        """Ensemble d'adresses IPv4 représenté par des intervalles disjoints triés."""
+        self.intervals = merge_intervals(intervals)
+
+    @classmethod
+    def parse(cls, spec: str, exclude: str = None) -> "TargetSet":
+        """
+        Construit un ensemble depuis une spécification texte.
+
+        Args:
+            spec: Entrées séparées par des virgules/espaces
+                  (192.168.1.0/24, 10.0.0.1-254, 10.0.1.5-10.0.2.9, 172.16.0.1)
+            exclude: Entrées à retirer, même syntaxe
+        """
+        targets = cls(parse_entry(e) for e in re.split(r"[,\s]+", spec.strip()) if e)
+        if not targets.intervals:
+            raise ValueError(INVALID_RANGE_MESSAGE)
+        if exclude:
+            targets.exclude(exclude)
+        return targets
+
+    def exclude(self, spec: str):
+        entries = [e for e in re.split(r"[,\s]+", spec.strip()) if e]
+        excluded = merge_intervals(parse_entry(e, hosts_only=False) for e in entries)
+        self.intervals = subtract_intervals(self.intervals, excluded)
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in self.intervals)
+
+    def __contains__(self, ip: str) -> bool:
+        value = ip_to_int(ip)
+        for start, end in self.intervals:
+            if start <= value <= end:
+                return True
+            if start > value:
+                break
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Adresses produites à la demande, entrelacées entre les /24 :
+        .0 de chaque bloc, puis .1 de chaque bloc, etc.
+        """
+        for offset in range(256):
+            for start, end in self.intervals:
+                for block in range(start >> 8, (end >> 8) + 1):
+                    value = (block << 8) | offset
+                    if start <= value <= end:
+                        yield int_to_ip(value)
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 targets.py <cibles> [exclusions]")
+        sys.exit(1)
+
+    targets = TargetSet.parse(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"🎯 {len(targets)} adresse(s) en {len(targets.intervals)} intervalle(s)")
+    for ip in itertools.islice(targets, 10):
+        print(f"  {ip}")
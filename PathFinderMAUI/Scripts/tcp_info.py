@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+TCP Info Module - RTT et options TCP lus sur les connexions déjà établies
+Après un connect abouti, le noyau connaît le RTT mesuré pendant la poignée de
+main, sa variance, le MSS et les options annoncées par le SYN-ACK de l'hôte
+(timestamps, SACK, window scale). Un getsockopt avant la fermeture suffit :
+aucun paquet de plus. TCP_INFO sous Linux, TCP_CONNECTION_INFO sous macOS ;
+ailleurs (Windows), rien n'est lu et le chronomètre reste la seule mesure.
+Le TTL de la réponse n'est pas exposé sur une socket TCP (IP_RECVTTL ne
+concerne que UDP / raw) : seules les options servent d'indice d'OS.
+"""
+
+import socket
+import struct
+import sys
+import threading
+from typing import Dict, NamedTuple, Optional
+
+# Linux : struct tcp_info (8 octets, puis u32 : rto, ato, snd_mss, rcv_mss, ..., rtt, rttvar en µs)
+LINUX_TCP_INFO = getattr(socket, "TCP_INFO", 11 if sys.platform.startswith("linux") else None)
+LINUX_LAYOUT = struct.Struct("=8B21I")
+LINUX_ESTABLISHED = 1
+# macOS : struct tcp_connection_info (4 octets, puis u32 : options, ..., maxseg, ..., srtt, rttvar en ms)
+DARWIN_TCP_CONNECTION_INFO = 0x106
+DARWIN_LAYOUT = struct.Struct("=4B12I")
+DARWIN_ESTABLISHED = 4
+
+# Bits d'options (mêmes valeurs pour tcpi_options et tcpci_options)
+OPTION_BITS = {"timestamps": 0x1, "sack": 0x2, "wscale": 0x4, "ecn": 0x8}
+
+class TcpInfo(NamedTuple):
+    rtt: float
+    rttvar: float
+    mss: int
+    options: frozenset
+    wscale: Optional[int]
+
+def _options(bits: int) -> frozenset:
+    return frozenset(name for name, bit in OPTION_BITS.items() if bits & bit)
+
+def read_tcp_info(sock: socket.socket) -> Optional[TcpInfo]:
+    """TcpInfo d'une socket connectée, None si indisponible (OS, socket fermée ou refusée)."""
+    try:
+        if sys.platform.startswith("linux") and LINUX_TCP_INFO is not None:
+            raw = sock.getsockopt(socket.IPPROTO_TCP, LINUX_TCP_INFO, 104)
+            if len(raw) < LINUX_LAYOUT.size:
+                return None
+            fields = LINUX_LAYOUT.unpack_from(raw)
+            state, option_bits, wscales = fields[0], fields[5], fields[6]
+            snd_mss, rtt_us, rttvar_us = fields[10], fields[23], fields[24]
+            if state != LINUX_ESTABLISHED or not rtt_us:
+                return None
+            options = _options(option_bits)
+            # snd_wscale (4 bits bas) : facteur annoncé par l'hôte distant
+            return TcpInfo(rtt_us / 1e6, rttvar_us / 1e6, snd_mss, options,
+                           wscales & 0x0F if "wscale" in options else None)
+        if sys.platform == "darwin":
+            raw = sock.getsockopt(socket.IPPROTO_TCP, DARWIN_TCP_CONNECTION_INFO, DARWIN_LAYOUT.size)
+            if len(raw) < DARWIN_LAYOUT.size:
+                return None
+            fields = DARWIN_LAYOUT.unpack_from(raw)
+            state, snd_wscale, option_bits = fields[0], fields[1], fields[4]
+            maxseg, srtt_ms, rttvar_ms = fields[7], fields[14], fields[15]
+            if state != DARWIN_ESTABLISHED:
+                return None
+            options = _options(option_bits)
+            # Granularité d'une milliseconde : un RTT LAN lu 0 vaut « moins de 1 ms »
+            return TcpInfo(max(srtt_ms, 0.5) / 1000, rttvar_ms / 1000, maxseg, options,
+                           snd_wscale if "wscale" in options else None)
+    except (OSError, ValueError):
+        return None
+    return None
+
+class TcpInfoStore:
+    def __init__(self):
+        """Relevés TCP par hôte, alimentés par tous les étages qui se connectent."""
+        self._hosts: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {"captured": 0, "hosts": 0}
+
+    def observe(self, ip: str, sock: socket.socket) -> Optional[TcpInfo]:
+        """Lit la socket (avant sa fermeture) et mémorise le relevé ; None si illisible."""
+        info = read_tcp_info(sock)
+        if info is None:
+            return None
+        with self._lock:
+            entry = self._hosts.get(ip)
+            if entry is None:
+                # Options de la première connexion : même pile TCP pour tous les ports
+                self._hosts[ip] = {"info": info, "min_rtt": info.rtt, "samples": 1}
+                self.stats["hosts"] += 1
+            else:
+                entry["min_rtt"] = min(entry["min_rtt"], info.rtt)
+                entry["samples"] += 1
+            self.stats["captured"] += 1
+        return info
+
+    def summary(self, ip: str) -> Optional[Dict]:
+        """Relevé sérialisable de l'hôte (RTT minimal, options du SYN-ACK), ou None."""
+        with self._lock:
+            entry = self._hosts.get(ip)
+            if entry is None:
+                return None
+            info = entry["info"]
+            return {
+                "rtt_ms": round(entry["min_rtt"] * 1000, 3),
+                "rttvar_ms": round(info.rttvar * 1000, 3),
+                "mss": info.mss,
+                "options": sorted(info.options),
+                "wscale": info.wscale,
+                "samples": entry["samples"],
+            }
+
+if __name__ == "__main__":
+    # Test du module
+    import time
+
+    if len(sys.argv) < 3:
+        print("Usage: python3 tcp_info.py <ip> <port> [...]")
+        sys.exit(1)
+
+    store = TcpInfoStore()
+    ip = sys.argv[1]
+    for port in (int(p) for p in sys.argv[2:]):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(2.0)
+        started = time.monotonic()
+        if sock.connect_ex((ip, port)) == 0:
+            elapsed = time.monotonic() - started
+            info = store.observe(ip, sock)
+            print(f"  {ip}:{port} chronomètre {elapsed * 1000:.3f} ms | noyau {info}")
+        else:
+            print(f"  {ip}:{port} fermé")
+        sock.close()
+    print(f"📶 {store.summary(ip)}")
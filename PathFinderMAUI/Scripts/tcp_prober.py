@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+TCP Prober Module - Détection d'hôtes par connexions TCP non bloquantes
+Tous les ports de sonde de nombreux hôtes sont en vol en même temps dans une
+boucle selectors ; un hôte est terminé dès qu'un port répond.
+"""
+
+import errno
+import heapq
+import selectors
+import socket
+import time
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from resource_governor import RESOURCE_EXHAUSTION_ERRNOS
+except ImportError:
+    RESOURCE_EXHAUSTION_ERRNOS = {errno.EMFILE, errno.ENFILE, errno.EADDRNOTAVAIL, errno.ENOBUFS}
+
+# Ports utilisés pour détecter les appareils qui bloquent ICMP (mobiles, etc.)
+TCP_PROBE_PORTS = [80, 443, 8080, 5353, 62078]
+
+# Codes retournés par connect_ex pour une connexion non bloquante en cours
+CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY,
+                       getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+
+# 0 = port ouvert, ECONNREFUSED = RST reçu : dans les deux cas l'hôte répond
+ALIVE_CODES = {0, errno.ECONNREFUSED}
+
+# Manque de sockets côté scanner : l'hôte est relancé après une attente croissante (plafonnée)
+EXHAUSTION_BACKOFF = 0.05
+EXHAUSTION_BACKOFF_MAX = 1.0
+
+class TcpLivenessProber:
+    def __init__(self, ports: List[int] = None, timeout: float = 0.5,
+                 max_in_flight: int = 500, timeout_for=None, on_rtt=None, on_connect=None,
+                 governor=None):
+        """
+        Sonde de vie TCP événementielle.
+
+        Args:
+            ports: Ports sondés en parallèle sur chaque hôte
+            timeout: Délai laissé à chaque hôte pour répondre sur un port
+            max_in_flight: Nombre maximal de sockets ouverts simultanément
+            timeout_for: Rappel timeout_for(ip) -> délai propre à l'hôte (RTT)
+            on_rtt: Rappel on_rtt(ip, rtt) quand un hôte répond
+            on_connect: Rappel on_connect(ip, sock, rtt) pour une connexion aboutie,
+                        avant fermeture (relevé TCP_INFO) ; remplace on_rtt pour elle
+            governor: ResourceGovernor partagé (permis de l'étage "liveness")
+        """
+        self.ports = list(ports or TCP_PROBE_PORTS)
+        self.timeout = timeout
+        self.max_in_flight = max(max_in_flight, len(self.ports))
+        self.timeout_for = timeout_for
+        self.on_rtt = on_rtt
+        self.on_connect = on_connect
+        self.governor = governor
+        if governor is not None:
+            self.max_in_flight = max(len(self.ports), min(self.max_in_flight, governor.stage_limit("liveness")))
+
+    def probe(self, ips: Iterable[str]) -> Dict[str, bool]:
+        """Retourne {ip: alive} pour toutes les IPs."""
+        results: Dict[str, bool] = {}
+        pending = iter(ips)
+        exhausted = False
+        deferred = None
+        # Hôtes à relancer faute de sockets : (instant de relance, ip)
+        requeue = []
+        retries: Dict[str, int] = {}
+
+        self._selector = selectors.DefaultSelector()
+        self._open: Dict[str, List[socket.socket]] = {}
+        self._in_flight = 0
+        self._started: Dict[str, float] = {}
+        deadlines = []
+
+        try:
+            while True:
+                # Démarrer de nouveaux hôtes tant que le budget de sockets le permet
+                now = time.monotonic()
+                while self._in_flight + len(self.ports) <= self.max_in_flight:
+                    ip = deferred
+                    deferred = None
+                    if ip is None and requeue and requeue[0][0] <= now:
+                        ip = heapq.heappop(requeue)[1]
+                    if ip is None and not exhausted:
+                        ip = next(pending, None)
+                        exhausted = ip is None
+                    if ip is None:
+                        break
+                    if not self._acquire_permits():
+                        # Budget global épuisé : attendre la fin de nos propres sockets
+                        deferred = ip
+                        break
+                    alive = self._start_host(ip)
+                    if alive is None:
+                        # Pas de socket pour l'hôte : relancé plus tard, jamais déclaré éteint
+                        retries[ip] = retries.get(ip, 0) + 1
+                        delay = min(EXHAUSTION_BACKOFF * retries[ip], EXHAUSTION_BACKOFF_MAX)
+                        heapq.heappush(requeue, (now + delay, ip))
+                        break
+                    results[ip] = alive
+                    if ip in self._open:
+                        timeout = self.timeout_for(ip) if self.timeout_for else self.timeout
+                        heapq.heappush(deadlines, (self._started[ip] + timeout, ip))
+
+                if not self._open:
+                    if requeue:
+                        time.sleep(max(0.0, requeue[0][0] - time.monotonic()))
+                        continue
+                    if exhausted and deferred is None:
+                        break
+                    continue
+
+                # Expirer les hôtes sans réponse dans le délai
+                now = time.monotonic()
+                while deadlines and deadlines[0][0] <= now:
+                    _, ip = heapq.heappop(deadlines)
+                    self._close_host(ip)
+                if not deadlines:
+                    continue
+
+                wait = max(0.0, min(deadlines[0][0], requeue[0][0] if requeue else deadlines[0][0]) - now)
+                for key, _ in self._selector.select(timeout=wait):
+                    sock = key.fileobj
+                    ip = key.data
+                    if sock not in self._open.get(ip, ()):
+                        continue
+                    try:
+                        err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    except OSError:
+                        err = -1
+                    if err in ALIVE_CODES:
+                        results[ip] = True
+                        self._responded(ip, sock, err, time.monotonic() - self._started[ip])
+                        self._close_host(ip)
+                    else:
+                        self._close_socket(ip, sock)
+        finally:
+            for ip in list(self._open):
+                self._close_host(ip)
+            self._selector.close()
+
+        return results
+
+    def _responded(self, ip: str, sock: socket.socket, err: int, rtt: float):
+        if err == 0 and self.on_connect is not None:
+            self.on_connect(ip, sock, rtt)
+        elif self.on_rtt is not None:
+            self.on_rtt(ip, rtt)
+
+    def _acquire_permits(self) -> bool:
+        """Permis pour les sockets d'un hôte ; n'attend que si aucun n'est en vol."""
+        if self.governor is None:
+            return True
+        if self.governor.try_acquire("liveness", len(self.ports)):
+            return True
+        if self._in_flight == 0:
+            return self.governor.acquire("liveness", len(self.ports))
+        return False
+
+    def _release_permits(self, count: int):
+        if self.governor is not None and count > 0:
+            self.governor.release("liveness", count)
+
+    def _start_host(self, ip: str) -> Optional[bool]:
+        """Lance les connexions vers tous les ports. Retourne True si réponse immédiate,
+        None si le système manque de sockets (rien n'est laissé en vol pour l'hôte)."""
+        socks = []
+        self._started[ip] = time.monotonic()
+        for port in self.ports:
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            except OSError as e:
+                if e.errno in RESOURCE_EXHAUSTION_ERRNOS:
+                    return self._abandon_host(ip, socks)
+                continue
+            sock.setblocking(False)
+            try:
+                err = sock.connect_ex((ip, port))
+            except OSError:
+                err = -1
+            if err in RESOURCE_EXHAUSTION_ERRNOS:
+                sock.close()
+                return self._abandon_host(ip, socks)
+            if err in ALIVE_CODES:
+                # Réponse immédiate (loopback, hôte local)
+                self._responded(ip, sock, err, time.monotonic() - self._started[ip])
+                del self._started[ip]
+                sock.close()
+                for other in socks:
+                    self._selector.unregister(other)
+                    other.close()
+                self._in_flight -= len(socks)
+                self._release_permits(len(self.ports))
+                return True
+            if err not in CONNECT_IN_PROGRESS:
+                sock.close()
+                continue
+            self._selector.register(sock, selectors.EVENT_WRITE, ip)
+            socks.append(sock)
+            self._in_flight += 1
+
+        # Permis des ports qui n'ont pas de connexion en vol
+        self._release_permits(len(self.ports) - len(socks))
+        if socks:
+            self._open[ip] = socks
+        else:
+            del self._started[ip]
+        return False
+
+    def _abandon_host(self, ip: str, socks: List[socket.socket]) -> None:
+        """Ferme les connexions déjà lancées d'un hôte qui manque de sockets."""
+        if self.governor is not None:
+            self.governor.note_exhaustion("liveness")
+        for sock in socks:
+            self._selector.unregister(sock)
+            sock.close()
+        self._in_flight -= len(socks)
+        self._release_permits(len(self.ports))
+        del self._started[ip]
+        return None
+
+    def _close_socket(self, ip: str, sock: socket.socket):
+        socks = self._open.get(ip)
+        if socks is None:
+            return
+        socks.remove(sock)
+        self._selector.unregister(sock)
+        sock.close()
+        self._in_flight -= 1
+        self._release_permits(1)
+        if not socks:
+            del self._open[ip]
+
+    def _close_host(self, ip: str):
+        self._started.pop(ip, None)
+        socks = self._open.pop(ip, [])
+        for sock in socks:
+            self._selector.unregister(sock)
+            sock.close()
+        self._in_flight -= len(socks)
+        self._release_permits(len(socks))
+
+def probe_tcp_liveness(ips: Iterable[str], ports: List[int] = None,
+                       timeout: float = 0.5, max_in_flight: int = 500,
+                       timeout_for=None, on_rtt=None, on_connect=None, governor=None) -> Dict[str, bool]:
+    """Sonde TCP groupée : {ip: alive} (ouvert ou refusé = vivant)."""
+    prober = TcpLivenessProber(ports=ports, timeout=timeout, max_in_flight=max_in_flight,
+                               timeout_for=timeout_for, on_rtt=on_rtt, on_connect=on_connect,
+                               governor=governor)
+    return prober.probe(ips)
+
+if __name__ == "__main__":
+    # Test du module
+    import ipaddress
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 tcp_prober.py <cidr>")
+        sys.exit(1)
+
+    hosts = [str(ip) for ip in ipaddress.ip_network(sys.argv[1], strict=False).hosts()]
+    started = time.monotonic()
+    results = probe_tcp_liveness(hosts)
+    elapsed = time.monotonic() - started
+
+    alive = [ip for ip, up in results.items() if up]
+    print(f"🔌 {len(alive)}/{len(hosts)} hôtes répondent en TCP ({elapsed:.2f}s)")
+    for ip in alive:
+        print(f"  {ip}")
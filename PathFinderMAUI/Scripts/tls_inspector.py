@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+TLS Inspector Module - Certificats pairs lus en DER, sans vérification
+Le certificat est pris (forme binaire) pendant la poignée de main déjà faite
+par les sondes HTTPS, puis décodé par un petit lecteur DER : notAfter,
+sujet, émetteur, SAN. Les certificats sont mis en cache par empreinte
+(beaucoup d'équipements d'un même réseau partagent le même certificat).
+"""
+
+import datetime
+import hashlib
+import ipaddress
+import socket
+import ssl
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from resource_governor import socket_permit
+except ImportError:
+    @contextmanager
+    def socket_permit(stage: str, count: int = 1):
+        yield
+
+# Tags DER utilisés
+TAG_BOOLEAN = 0x01
+TAG_INTEGER = 0x02
+TAG_OCTET_STRING = 0x04
+TAG_OID = 0x06
+TAG_SEQUENCE = 0x30
+TAG_SET = 0x31
+TAG_UTC_TIME = 0x17
+TAG_GENERALIZED_TIME = 0x18
+TAG_VERSION = 0xA0
+TAG_EXTENSIONS = 0xA3
+TAG_SAN_DNS = 0x82
+TAG_SAN_IP = 0x87
+
+OID_SUBJECT_ALT_NAME = "2.5.29.17"
+NAME_ATTRIBUTES = {
+    "2.5.4.3": "CN",
+    "2.5.4.6": "C",
+    "2.5.4.7": "L",
+    "2.5.4.8": "ST",
+    "2.5.4.10": "O",
+    "2.5.4.11": "OU",
+}
+
+def read_tlv(data: bytes, offset: int) -> Tuple[int, int, int]:
+    """Lit un élément DER ; retourne (tag, début du contenu, fin du contenu)."""
+    if offset + 2 > len(data):
+        raise ValueError("DER tronqué")
+    tag = data[offset]
+    length = data[offset + 1]
+    start = offset + 2
+    if length & 0x80:
+        size = length & 0x7F
+        if size == 0 or size > 4 or start + size > len(data):
+            raise ValueError("Longueur DER invalide")
+        length = int.from_bytes(data[start:start + size], "big")
+        start += size
+    end = start + length
+    if end > len(data):
+        raise ValueError("DER tronqué")
+    return tag, start, end
+
+def read_children(data: bytes, start: int, end: int) -> List[Tuple[int, int, int]]:
+    """Éléments contenus dans [start, end) (SEQUENCE, SET, champ explicite)."""
+    children = []
+    offset = start
+    while offset < end:
+        tag, child_start, child_end = read_tlv(data, offset)
+        children.append((tag, child_start, child_end))
+        offset = child_end
+    return children
+
+def decode_oid(value: bytes) -> str:
+    if not value:
+        raise ValueError("OID vide")
+    parts = [value[0] // 40, value[0] % 40]
+    current = 0
+    for byte in value[1:]:
+        current = (current << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            parts.append(current)
+            current = 0
+    return ".".join(str(part) for part in parts)
+
+def decode_time(tag: int, value: bytes) -> datetime.datetime:
+    """UTCTime (AAMMJJhhmmssZ) ou GeneralizedTime (AAAAMMJJhhmmssZ), en UTC."""
+    text = value.decode("ascii").rstrip("Z")
+    if tag == TAG_UTC_TIME:
+        year = int(text[:2])
+        text = f"{2000 + year if year < 50 else 1900 + year}{text[2:]}"
+    elif tag != TAG_GENERALIZED_TIME:
+        raise ValueError("Date DER inattendue")
+    return datetime.datetime.strptime(text[:14], "%Y%m%d%H%M%S")
+
+def decode_name(data: bytes, start: int, end: int) -> Dict[str, str]:
+    """Name X.501 -> {"CN": ..., "O": ...} (attributs connus seulement)."""
+    name = {}
+    for _, set_start, set_end in read_children(data, start, end):
+        for _, attr_start, attr_end in read_children(data, set_start, set_end):
+            (_, oid_start, oid_end), (_, value_start, value_end) = read_children(data, attr_start, attr_end)[:2]
+            key = NAME_ATTRIBUTES.get(decode_oid(data[oid_start:oid_end]))
+            if key and key not in name:
+                name[key] = data[value_start:value_end].decode("utf-8", errors="replace")
+    return name
+
+def decode_san(value: bytes) -> List[str]:
+    """Extension subjectAltName : noms DNS et adresses IP."""
+    _, start, end = read_tlv(value, 0)
+    names = []
+    for tag, name_start, name_end in read_children(value, start, end):
+        if tag == TAG_SAN_DNS:
+            names.append(value[name_start:name_end].decode("ascii", errors="replace"))
+        elif tag == TAG_SAN_IP and name_end - name_start in (4, 16):
+            names.append(str(ipaddress.ip_address(value[name_start:name_end])))
+    return names
+
+def parse_certificate(der: bytes) -> Dict:
+    """Décode un certificat X.509 DER : sujet, émetteur, validité, SAN.
+    Lève ValueError si le certificat est mal formé."""
+    try:
+        _, cert_start, cert_end = read_tlv(der, 0)
+        _, tbs_start, tbs_end = read_children(der, cert_start, cert_end)[0]
+        fields = read_children(der, tbs_start, tbs_end)
+        if fields[0][0] == TAG_VERSION:
+            fields = fields[1:]
+        # serial, signature, issuer, validity, subject, subjectPublicKeyInfo, [extensions]
+        issuer = decode_name(der, fields[2][1], fields[2][2])
+        not_before, not_after = [decode_time(tag, der[start:end])
+                                 for tag, start, end in read_children(der, fields[3][1], fields[3][2])[:2]]
+        subject = decode_name(der, fields[4][1], fields[4][2])
+        san = []
+        for tag, start, end in fields[6:]:
+            if tag != TAG_EXTENSIONS:
+                continue
+            _, ext_start, ext_end = read_tlv(der, start)
+            for _, item_start, item_end in read_children(der, ext_start, ext_end):
+                parts = read_children(der, item_start, item_end)
+                if decode_oid(der[parts[0][1]:parts[0][2]]) == OID_SUBJECT_ALT_NAME:
+                    san = decode_san(der[parts[-1][1]:parts[-1][2]])
+    except (IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Certificat mal formé: {e}")
+    return {
+        "subject": subject,
+        "issuer": issuer,
+        "not_before": not_before,
+        "not_after": not_after,
+        "san": san,
+        "self_signed": subject == issuer,
+    }
+
+def fingerprint(der: bytes) -> str:
+    return hashlib.sha256(der).hexdigest()
+
+class CertificateCache:
+    def __init__(self):
+        """Certificats décodés, par empreinte SHA-256 (partagé entre hôtes)."""
+        self._lock = threading.Lock()
+        self._certs: Dict[str, Dict] = {}
+        self.stats = {"parsed": 0, "hits": 0, "errors": 0}
+
+    def inspect(self, der: bytes) -> Optional[Dict]:
+        """Certificat décodé (avec son empreinte) ; None si illisible."""
+        digest = fingerprint(der)
+        with self._lock:
+            cert = self._certs.get(digest)
+            if cert is not None:
+                self.stats["hits"] += 1
+                return cert
+        try:
+            cert = parse_certificate(der)
+        except ValueError:
+            with self._lock:
+                self.stats["errors"] += 1
+            return None
+        cert["fingerprint"] = digest
+        with self._lock:
+            self._certs[digest] = cert
+            self.stats["parsed"] += 1
+        return cert
+
+CERT_CACHE = CertificateCache()
+
+def insecure_tls_context() -> ssl.SSLContext:
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+def fetch_peer_certificate(ip: str, port: int = 443, timeout: float = 3.0,
+                           ctx: ssl.SSLContext = None) -> Optional[bytes]:
+    """Poignée de main sans vérification ; certificat pair en DER (ou None)."""
+    ctx = ctx or insecure_tls_context()
+    try:
+        with socket_permit("tls"), socket.create_connection((ip, port), timeout=timeout) as sock:
+            with ctx.wrap_socket(sock, server_hostname=ip) as ssock:
+                return ssock.getpeercert(binary_form=True)
+    except (OSError, ssl.SSLError):
+        return None
+
+def certificate_report(der: Optional[bytes], cache: CertificateCache = None,
+                       now: datetime.datetime = None, trusted: Optional[bool] = None) -> Dict:
+    """Résumé d'expiration (mêmes clés que tls_cert_expiry) + sujet / émetteur / SAN.
+    "valid" garde son sens historique (chaîne de confiance vérifiée et dates valides) :
+    False si auto-signé ou hors dates, None si la chaîne n'a pas été vérifiée (trusted
+    None, certificat lu sans vérification). Le contrôle des dates seul est dans
+    "within_dates"."""
+    out = {"valid": None, "within_dates": None, "expires_in_days": None, "notAfter": None}
+    if not der:
+        return out
+    cert = (cache or CERT_CACHE).inspect(der)
+    if cert is None:
+        return out
+    now = now or datetime.datetime.utcnow()
+    delta = cert["not_after"] - now
+    within_dates = delta.days >= 0 and cert["not_before"] <= now
+    if cert["self_signed"] or not within_dates:
+        valid = False
+    else:
+        valid = trusted
+    out.update({
+        "notAfter": cert["not_after"].isoformat(),
+        "expires_in_days": delta.days,
+        "valid": valid,
+        "within_dates": within_dates,
+        "subject": cert["subject"].get("CN", ""),
+        "issuer": cert["issuer"].get("CN", "") or cert["issuer"].get("O", ""),
+        "san": cert["san"],
+        "self_signed": cert["self_signed"],
+        "fingerprint": cert["fingerprint"],
+    })
+    return out
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 tls_inspector.py <ip> [port]")
+        sys.exit(1)
+
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 443
+    report = certificate_report(fetch_peer_certificate(sys.argv[1], port))
+    if report["notAfter"] is None:
+        print("🔒 Aucun certificat lisible")
+        sys.exit(1)
+    print(f"🔒 {report['subject']} (émis par {report['issuer']})")
+    print(f"   expire le {report['notAfter']} ({report['expires_in_days']} jours)")
+    if report["san"]:
+        print(f"   SAN: {', '.join(report['san'])}")
+    print(f"   SHA-256: {report['fingerprint']}")
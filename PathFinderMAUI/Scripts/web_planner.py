@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Web Planner Module - Plan de sondes web dédoublonné par hôte
+Les modules web (http_checks, panneaux d'admin, directory buster) déclarent les
+URLs qu'ils veulent ; chaque URL n'est demandée qu'une fois et la réponse
+(statut, en-têtes, début du corps, marqueurs trouvés) est servie à chacun.
+"""
+
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from soft404 import baseline_paths, build_baseline
+    SOFT404_AVAILABLE = True
+except ImportError:
+    SOFT404_AVAILABLE = False
+
+# Octets de début de corps conservés pour les consommateurs
+DEFAULT_BODY_PREFIX = 512
+
+def normalize_url(url: str) -> str:
+    """Clé de cache : http://ip/x et http://ip:80/x désignent la même ressource."""
+    parts = urllib.parse.urlsplit(url)
+    default_port = 443 if parts.scheme == "https" else 80
+    port = parts.port or default_port
+    netloc = parts.hostname if port == default_port else f"{parts.hostname}:{port}"
+    path = "/" + parts.path.lstrip("/")
+    return urllib.parse.urlunsplit((parts.scheme, netloc, path, parts.query, ""))
+
+def split_key(key: str) -> Tuple[str, str]:
+    """Clé normalisée -> (scheme://hôte[:port], chemin)."""
+    parts = urllib.parse.urlsplit(key)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return f"{parts.scheme}://{parts.netloc}", path
+
+class PlannedResponse:
+    __slots__ = ("url", "status", "headers", "body_prefix", "matches", "error", "soft404")
+
+    def __init__(self, url: str, status: int = 0, headers=None, body_prefix: bytes = b"",
+                 matches: Optional[Set[str]] = None, error: bool = False, soft404: bool = False):
+        self.url = url
+        self.status = status
+        self.headers = headers if headers is not None else {}
+        self.body_prefix = body_prefix
+        self.matches = matches or set()
+        self.error = error
+        # Réponse identique à celle d'un chemin inexistant (serveur "wildcard")
+        self.soft404 = soft404
+
+    def matched(self, markers: Iterable[str]) -> bool:
+        """Vrai si un des marqueurs (insensibles à la casse) a été vu dans le corps."""
+        return any(marker.lower() in self.matches for marker in markers)
+
+class WebProbePlanner:
+    def __init__(self, fetch: Callable, timeout: float = 3.0, budget=None, max_workers: int = 8,
+                 slots: threading.Semaphore = None, head_first: bool = True):
+        """
+        Args:
+            fetch: fetch(url, timeout, markers, marker_groups, head) ->
+                   (status, headers, début du corps, marqueurs trouvés) ; lève si injoignable.
+                   head=True : statut et en-têtes suffisent (HEAD, pas de corps)
+            timeout: Délai par requête
+            budget: Budget de l'hôte (remaining() / record(success)) ou None
+            max_workers: Requêtes simultanées pour cet hôte
+            slots: Sémaphore global partagé entre hôtes (plafond de requêtes)
+            head_first: URLs sans marqueurs demandées en HEAD ; le corps n'est lu
+                        que si la référence soft-404 en a besoin
+        """
+        self.fetch = fetch
+        self.timeout = timeout
+        self.budget = budget
+        self.max_workers = max_workers
+        self.slots = slots
+        self.head_first = head_first
+        self._lock = threading.Lock()
+        self._planned: Dict[str, List[Tuple[str, ...]]] = {}
+        self._cache: Dict[str, PlannedResponse] = {}
+        self._fetched_groups: Dict[str, List[Tuple[str, ...]]] = {}
+        self._baselines = {}
+        # URLs dont le début du corps est nécessaire (jamais en HEAD)
+        self._content: Set[str] = set()
+        # requested : réponses servies aux consommateurs ; fetched : requêtes envoyées
+        self.stats = {"requested": 0, "fetched": 0, "skipped": 0, "soft404": 0}
+
+    def add(self, url: str, markers: Iterable[str] = (), content: bool = False):
+        """Déclare une URL (et les marqueurs qu'un consommateur y cherche) ;
+        elle partira au prochain run() si elle n'est pas déjà prévue ou en cache.
+        content=True : le début du corps est nécessaire même sans marqueurs."""
+        key = normalize_url(url)
+        group = tuple(markers)
+        with self._lock:
+            if content:
+                self._content.add(key)
+            groups = self._planned.get(key)
+            if groups is not None:
+                if group and group not in groups:
+                    groups.append(group)
+            elif key not in self._cache or (group and group not in self._fetched_groups.get(key, ())):
+                # Jamais demandée, ou lue sans ces marqueurs : (re)demander
+                previous = self._fetched_groups.get(key, [])
+                self._planned[key] = previous + [group] if group else previous
+
+    def establish_baseline(self, base_url: str):
+        """Demande quelques chemins aléatoires de base_url (scheme://hôte:port) ;
+        les réponses suivantes qui leur ressemblent sont marquées soft404."""
+        if not SOFT404_AVAILABLE:
+            return None
+        base = split_key(normalize_url(base_url))[0]
+        with self._lock:
+            if base in self._baselines:
+                return self._baselines[base]
+        paths = baseline_paths()
+        for path in paths:
+            self.add(base + path, content=True)
+        responses = self.get_many([(base + path, ()) for path in paths])
+        baseline = build_baseline(base, [
+            (path, None if response.error else (response.status, response.headers, response.body_prefix))
+            for path, response in zip(paths, responses)])
+        with self._lock:
+            self._baselines[base] = baseline
+        return baseline
+
+    def is_wildcard(self, base_url: str) -> bool:
+        """Vrai si base_url répond "présent" à n'importe quel chemin."""
+        base = split_key(normalize_url(base_url))[0]
+        with self._lock:
+            baseline = self._baselines.get(base)
+        return baseline is not None and baseline.wildcard
+
+    def run(self):
+        """Exécute toutes les URLs déclarées et pas encore demandées, en parallèle."""
+        with self._lock:
+            planned, self._planned = self._planned, {}
+        if not planned:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = [executor.submit(self._fetch_one, key, groups) for key, groups in planned.items()]
+        try:
+            pending = set(futures)
+            if self.budget is None:
+                wait(pending)
+            while pending and self.budget is not None:
+                remaining = self.budget.remaining()
+                if remaining <= 0:
+                    break
+                _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        finally:
+            # cancel_futures (Python 3.9+) n'existe pas en 3.7 : annulation explicite
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        # URLs non exécutées (budget épuisé) : réponse vide, comme un hôte muet
+        with self._lock:
+            for key in planned:
+                if key not in self._cache:
+                    self._cache[key] = PlannedResponse(key, error=True)
+                    self.stats["skipped"] += 1
+
+    def get(self, url: str, markers: Iterable[str] = ()) -> PlannedResponse:
+        """Réponse en cache ; l'URL est demandée maintenant si elle n'était pas prévue."""
+        return self.get_many([(url, markers)])[0]
+
+    def get_many(self, requests: Iterable[Tuple[str, Iterable[str]]]) -> List[PlannedResponse]:
+        """Réponses pour [(url, marqueurs)] dans le même ordre (URLs manquantes en parallèle)."""
+        requests = [(normalize_url(url), tuple(markers)) for url, markers in requests]
+        for key, markers in requests:
+            self.add(key, markers)
+        self.run()
+        with self._lock:
+            self.stats["requested"] += len(requests)
+            return [self._cache[key] for key, _ in requests]
+
+    def _remaining(self) -> float:
+        if self.budget is None:
+            return self.timeout
+        return self.budget.remaining()
+
+    def _call(self, key: str, remaining: float, markers: List[str], groups, head: bool):
+        timeout = min(self.timeout, remaining)
+        if self.slots is None:
+            return self.fetch(key, timeout, markers, groups, head)
+        with self.slots:
+            return self.fetch(key, timeout, markers, groups, head)
+
+    def _needs_content(self, key: str, status: int) -> bool:
+        base, path = split_key(key)
+        with self._lock:
+            baseline = self._baselines.get(base)
+        return baseline is not None and path != "/" and baseline.needs_content(status)
+
+    def _is_soft404(self, key: str, status: int, headers, prefix: bytes) -> bool:
+        base, path = split_key(key)
+        with self._lock:
+            baseline = self._baselines.get(base)
+        # La page d'accueil existe toujours, même quand elle sert aussi de "404"
+        if baseline is None or path == "/" or not baseline.is_soft404(path, status, headers, prefix):
+            return False
+        with self._lock:
+            self.stats["soft404"] += 1
+        return True
+
+    def _fetch_one(self, key: str, groups: List[Tuple[str, ...]]):
+        remaining = self._remaining()
+        if remaining <= 0:
+            return
+        markers = sorted({marker for group in groups for marker in group})
+        with self._lock:
+            head = self.head_first and not markers and key not in self._content
+        try:
+            status, headers, prefix, matches = self._call(key, remaining, markers, groups, head)
+            if head and self._needs_content(key, status):
+                # Réponse "présente" à comparer à la référence soft-404 : lire le début du corps
+                status, headers, prefix, matches = self._call(key, self._remaining(), markers, groups, False)
+            response = PlannedResponse(key, status, headers, prefix, matches,
+                                       soft404=self._is_soft404(key, status, headers, prefix))
+            success = True
+        except Exception:
+            response = PlannedResponse(key, error=True)
+            success = False
+        if self.budget is not None:
+            self.budget.record(success)
+        with self._lock:
+            self._cache[key] = response
+            self._fetched_groups[key] = list(groups)
+            self.stats["fetched"] += 1
+
+if __name__ == "__main__":
+    # Test du module
+    import sys
+
+    try:
+        from http_client import HttpClient
+    except ImportError:
+        print("http_client indisponible")
+        sys.exit(1)
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 web_planner.py <url_de_base> [chemin,chemin,...]")
+        sys.exit(1)
+
+    base = sys.argv[1].rstrip("/")
+    paths = sys.argv[2].split(",") if len(sys.argv) > 2 else ["/", "/robots.txt", "/admin", "/"]
+    with HttpClient() as client:
+        def fetch(url, timeout, markers, groups, head):
+            if not markers:
+                response = client.probe(url, DEFAULT_BODY_PREFIX, head=head, timeout=timeout)
+            else:
+                response = client.get(url, timeout=timeout, keep_body=False, markers=markers,
+                                      marker_groups=groups, body_prefix=DEFAULT_BODY_PREFIX)
+            return response.status, response.headers, response.body, response.matches or set()
+
+        planner = WebProbePlanner(fetch)
+        for path in paths:
+            planner.add(base + path)
+        planner.run()
+        for path in paths:
+            response = planner.get(base + path)
+            print(f"  {path:<20} {response.status or 'erreur'}")
+        print(f"🧭 {planner.stats}")